@@ -1,26 +1,36 @@
 from manim import *
 import numpy as np
+from depth_sort import BatchedThreeDScene
+from mesh_lod import LODSphere, LODDot3D, LODLine3D, LODArrow3D
 
-class ConvexBallIllustration(ThreeDScene):
+# Axes and camera shared by the 3-D scenes (also ols_projection.py)
+CAMERA_ORIENTATION = {"phi": 75 * DEGREES, "theta": 30 * DEGREES, "distance": 10}
+
+def make_3d_axes(extent=3):
+    # One unit per unit, so c2p is the identity around the origin
+    return ThreeDAxes(
+        x_range=[-extent, extent, 1],
+        y_range=[-extent, extent, 1],
+        z_range=[-extent, extent, 1],
+        x_length=2 * extent,
+        y_length=2 * extent,
+        z_length=2 * extent,
+    )
+
+class ConvexBallIllustration(BatchedThreeDScene):
     def construct(self):
         # Set up 3D axes for context
-        axes = ThreeDAxes(
-            x_range=[-3, 3, 1],
-            y_range=[-3, 3, 1],
-            z_range=[-3, 3, 1],
-            x_length=6,
-            y_length=6,
-            z_length=6,
-        )
+        axes = make_3d_axes()
         axes_labels = axes.get_axis_labels()
 
         # Set a fixed camera orientation for the static image
-        self.set_camera_orientation(phi=75 * DEGREES, theta=30 * DEGREES, distance=10)
+        self.set_camera_orientation(**CAMERA_ORIENTATION)
 
         # Define the ball (Sphere) - Unit ball
         center = ORIGIN
         radius = 1.0 # Changed to unit radius
-        ball = Sphere(
+        # Tessellation follows the on-screen size and output quality (24x24 at most)
+        ball = LODSphere(
             center=center,
             radius=radius,
             resolution=(24, 24),
@@ -39,28 +49,28 @@ class ConvexBallIllustration(ThreeDScene):
         self.add_fixed_in_frame_mobjects(ball_label)
 
         # Center point and label
-        center_dot = Dot3D(center, color=RED, radius=0.08)
+        center_dot = LODDot3D(center, color=RED, radius=0.08)
         center_label = MathTex("\mathbf{0}").scale(0.8).next_to(center_dot, OUT * 0.5 + RIGHT * 0.5)
 
         # Pick two points inside the unit ball
         point_x_coords = np.array([0.3, 0.5, 0.4]) # New vector x inside unit ball
         point_y_coords = np.array([-0.6, -0.2, 0.3]) # New vector y inside unit ball
 
-        point_x = Dot3D(point_x_coords, color=YELLOW, radius=0.08)
-        point_y = Dot3D(point_y_coords, color=GREEN, radius=0.08)
+        point_x = LODDot3D(point_x_coords, color=YELLOW, radius=0.08)
+        point_y = LODDot3D(point_y_coords, color=GREEN, radius=0.08)
         label_x = MathTex("\mathbf{x}").scale(0.8).next_to(point_x, OUT * 0.5)
         label_y = MathTex("\mathbf{y}").scale(0.8).next_to(point_y, OUT * 0.5)
 
         # Vectors from origin to x and y
-        vector_x = Arrow3D(
+        vector_x = LODArrow3D(
             start=ORIGIN, end=point_x_coords, color=YELLOW, thickness=0.01, base_radius=0.03, height=0.15
         )
-        vector_y = Arrow3D(
+        vector_y = LODArrow3D(
             start=ORIGIN, end=point_y_coords, color=GREEN, thickness=0.01, base_radius=0.03, height=0.15
         )
 
         # Line segment between x and y
-        line_segment = Line3D(
+        line_segment = LODLine3D(
             point_x_coords,
             point_y_coords,
             color=WHITE,
@@ -0,0 +1,195 @@
+from manim import *
+import ast
+import inspect
+import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from parallel_updaters import serialize_same_tex
+
+# Compiles the tex and text of upcoming clips while the current one renders.
+#
+# Without it FullRegressionDemo only starts on Clip4's formulas and table once
+# Clip2 has finished, and the render sits idle waiting for LaTeX in between.
+# The prefetcher queues work for every clip up front, in clip order, on a
+# couple of background threads. Work comes from two places:
+#
+#   * static: MathTex/Tex/Text/CachedText calls in the clip's module whose
+#     arguments are constants (create_static_assets, titles, labels);
+#   * recorded: every LaTeX expression and Text string a clip compiled on its
+#     previous render, kept in a manifest under tex_dir. This covers strings
+#     built from the data at run time (Clip4's steps, the table cells).
+#
+# Tex goes into manim's tex_dir and text into text_dir, so the main thread
+# later finds finished SVGs. Text, like Tex, is built under a lock per string:
+# manim's Text uses an SVG as soon as the file exists, which must not be while
+# a worker is still writing it. Prefetching is best effort; any failure
+# just leaves the work to the main thread.
+
+PREFETCH_FACTORIES = ("MathTex", "Tex", "Text", "CachedText")
+
+# Node types allowed in a "static" argument: constants, names, attribute
+# access and simple arithmetic, nothing that calls code
+_STATIC_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Attribute, ast.List, ast.Tuple,
+    ast.Dict, ast.UnaryOp, ast.USub, ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div,
+)
+
+
+def _static_value(node, namespace):
+    if not all(isinstance(child, _STATIC_NODES) for child in ast.walk(ast.Expression(node))):
+        raise ValueError("not static")
+    return eval(compile(ast.Expression(node), "<prefetch>", "eval"), namespace)
+
+
+# (factory name, args, kwargs) for every constant-argument asset call in a module
+def static_asset_calls(module):
+    calls = []
+    namespace = vars(module)
+    tree = ast.parse(inspect.getsource(module))
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+            continue
+        if node.func.id not in PREFETCH_FACTORIES or node.func.id not in namespace:
+            continue
+        if any(kw.arg is None for kw in node.keywords):
+            continue  # **kwargs
+        try:
+            args = [_static_value(arg, namespace) for arg in node.args]
+            kwargs = {kw.arg: _static_value(kw.value, namespace) for kw in node.keywords}
+        except Exception:
+            continue
+        calls.append((node.func.id, args, kwargs))
+    return calls
+
+
+_TEXT_LOCKS = defaultdict(threading.RLock)
+_TEXT_LOCKS_GUARD = threading.Lock()
+
+
+def _is_default_template(tex_template):
+    return tex_template is None or tex_template.body == config.tex_template.body
+
+
+class AssetPrefetcher:
+    def __init__(self, scene_classes, workers=2, manifest_path=None):
+        self.scene_classes = list(scene_classes)
+        self.workers = workers
+        self._manifest_path = Path(manifest_path) if manifest_path else None
+        self.current = None
+        self.recorded = {}  # clip name -> {"tex": set, "text": set}
+        self.submitted = 0
+        self.failed = 0
+
+    @property
+    def manifest_path(self):
+        if self._manifest_path is None:
+            self._manifest_path = Path(config.get_dir("tex_dir")) / "prefetch_manifest.json"
+        return self._manifest_path
+
+    def load_manifest(self):
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self):
+        manifest = self.load_manifest()
+        for name, assets in self.recorded.items():
+            manifest[name] = {kind: sorted(entries, key=repr) for kind, entries in assets.items()}
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=1))
+        tmp.replace(self.manifest_path)
+
+    def start(self):
+        serialize_same_tex()
+        self._install_recorders()
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+        manifest = self.load_manifest()
+        # FIFO queue: the next clip's assets are compiled first
+        for scene_class in self.scene_classes:
+            for job in self._jobs(scene_class, manifest.get(scene_class.__name__, {})):
+                self.pool.submit(self._run, job)
+                self.submitted += 1
+        return self
+
+    def enter(self, scene_class):
+        self.current = scene_class.__name__
+        self.recorded.setdefault(self.current, {"tex": set(), "text": set()})
+
+    # Drops what has not started and waits for what has, so no thread is still
+    # writing caches once the scene is done
+    def finish(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self._restore()
+        self.save_manifest()
+        logger.info("prefetch: %d jobs queued, %d failed", self.submitted, self.failed)
+
+    def _jobs(self, scene_class, recorded):
+        from manim.mobject.text import tex_mobject
+
+        module = inspect.getmodule(scene_class)
+        try:
+            calls = static_asset_calls(module)
+        except (OSError, SyntaxError):
+            calls = []
+        namespace = vars(module)
+        for name, args, kwargs in calls:
+            yield lambda factory=namespace[name], args=args, kwargs=kwargs: factory(*args, **kwargs)
+        for expression, environment in recorded.get("tex", []):
+            # Looked up at call time to go through the same-expression lock
+            yield lambda e=expression, env=environment: tex_mobject.tex_to_svg_file(e, environment=env)
+        for text, kwargs in recorded.get("text", []):
+            yield lambda t=text, kw=json.loads(kwargs): Text(t, **kw)
+
+    def _run(self, job):
+        try:
+            job()
+        except Exception as error:
+            self.failed += 1
+            logger.debug("prefetch failed: %s", error)
+
+    def _record(self, kind, entry):
+        if self.current is not None and threading.current_thread() is threading.main_thread():
+            self.recorded[self.current][kind].add(entry)
+
+    def _install_recorders(self):
+        from manim.mobject.text import tex_mobject
+
+        prefetcher = self
+        compile_tex = tex_mobject.tex_to_svg_file
+
+        def tex_to_svg_file(expression, environment=None, tex_template=None):
+            if _is_default_template(tex_template):
+                prefetcher._record("tex", (expression, environment))
+            return compile_tex(expression, environment=environment, tex_template=tex_template)
+
+        tex_to_svg_file._keyed = getattr(compile_tex, "_keyed", False)
+        tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+        text_init = Text.__init__
+        text_signature = inspect.signature(text_init)
+
+        def __init__(self, text, *args, **kwargs):
+            if args:
+                # Positional settings (fill_opacity, stroke_width) are recorded by name
+                named = text_signature.bind_partial(self, text, *args).arguments
+                kwargs = {**{k: v for k, v in named.items() if k not in ("self", "text")}, **kwargs}
+            try:
+                settings = json.dumps(kwargs, sort_keys=True)
+                prefetcher._record("text", (text, settings))
+            except TypeError:
+                settings = None  # not JSON-serializable, cannot be replayed
+            with _TEXT_LOCKS_GUARD:
+                lock = _TEXT_LOCKS[text, settings]
+            with lock:
+                text_init(self, text, **kwargs)
+
+        Text.__init__ = __init__
+        self._restore = lambda: (
+            setattr(tex_mobject, "tex_to_svg_file", compile_tex),
+            setattr(Text, "__init__", text_init),
+        )
@@ -0,0 +1,145 @@
+# Batch rendering of Clip4RealLifeExample, one video per dataset.
+#
+# Every course section has its own study-days/grade data. Datasets live in a
+# directory as .csv (header row, then x,y rows) or .json ({"data": [[x, y], ...],
+# optionally "title" and "headers"). Each dataset becomes a subclass of the clip
+# with its own `data` and is rendered in a process pool. Rows must be numeric
+# and x must vary; the clip takes its axes, R^2 and prediction from the data.
+#
+# The static parts (title, headers, axes, closed form formulas) are built once in
+# the parent before the pool starts, which fills the shared tex/text caches on
+# disk; each worker then builds them once more from those caches and hands out
+# copies for every variant it renders. Only data-dependent tex is compiled per
+# variant.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+from manim import tempconfig
+
+from clip4_real_life_example import Clip4RealLifeExample, axes_ranges, create_static_assets
+
+
+def load_dataset(path):
+    path = Path(path)
+    dataset = {"name": path.stem}
+    if path.suffix == ".json":
+        spec = json.loads(path.read_text())
+        dataset.update({key: spec[key] for key in ("title", "headers") if key in spec})
+        rows = spec["data"]
+    elif path.suffix == ".csv":
+        with open(path, newline="") as handle:
+            reader = csv.reader(handle)
+            dataset["headers"] = next(reader)
+            rows = [row for row in reader if row]
+    else:
+        raise ValueError(f"Unsupported dataset format: {path}")
+    # Table cells are strings; keep what the user wrote ("2" stays "2")
+    dataset["data"] = [[str(x).strip(), str(y).strip()] for x, y in rows]
+    if len(dataset["data"]) < 2:
+        raise ValueError(f"{path} needs at least two rows")
+    values = []
+    for number, (x, y) in enumerate(dataset["data"], 1):
+        try:
+            values.append((float(x), float(y)))
+        except ValueError:
+            raise ValueError(f"{path}: row {number} is not numeric: {x!r}, {y!r}") from None
+    if not np.all(np.isfinite(values)):
+        raise ValueError(f"{path}: values must be finite numbers")
+    if len({x for x, _ in values}) < 2:
+        raise ValueError(f"{path}: every row has the same x, so there is no slope to fit")
+    return dataset
+
+
+def dataset_ranges(dataset):
+    values = np.array([[float(x), float(y)] for x, y in dataset["data"]])
+    return axes_ranges(values[:, 0], values[:, 1])
+
+
+def load_datasets(directory):
+    paths = sorted(p for p in Path(directory).iterdir() if p.suffix in (".csv", ".json"))
+    return [load_dataset(p) for p in paths]
+
+
+def make_variant(dataset):
+    attributes = {"data": dataset["data"]}
+    for key in ("title", "headers"):
+        if key in dataset:
+            attributes[key] = dataset[key]
+    return type(f"Clip4RealLifeExample_{dataset['name']}", (Clip4RealLifeExample,), attributes)
+
+
+def render_variant(dataset, quality, media_dir):
+    scene_class = make_variant(dataset)
+    start = time.perf_counter()
+    with tempconfig({
+        "quality": quality,
+        "media_dir": media_dir,
+        "output_file": f"Clip4RealLifeExample_{dataset['name']}",
+        "progress_bar": "none",
+        "preview": False,
+    }):
+        scene = scene_class()
+        scene.render()
+        output = scene.renderer.file_writer.movie_file_path
+    return dataset["name"], str(output), time.perf_counter() - start
+
+
+def warm_static_assets(datasets):
+    keys = {
+        (d.get("title", Clip4RealLifeExample.title), tuple(d.get("headers", Clip4RealLifeExample.headers)), *dataset_ranges(d))
+        for d in datasets
+    }
+    for title, headers, x_range, y_range in keys:
+        create_static_assets(title, headers, x_range, y_range)
+
+
+def render_all(directory, quality="high_quality", media_dir="media", workers=None):
+    datasets = load_datasets(directory)
+    if not datasets:
+        raise SystemExit(f"No .csv/.json datasets found in {directory}")
+    with tempconfig({"media_dir": media_dir}):
+        warm_static_assets(datasets)
+
+    workers = workers or os.cpu_count() or 1
+    results, failures = [], []
+    with ProcessPoolExecutor(max_workers=min(workers, len(datasets))) as pool:
+        futures = {pool.submit(render_variant, d, quality, media_dir): d["name"] for d in datasets}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as error:
+                failures.append((futures[future], error))
+    return results, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render Clip4RealLifeExample once per dataset")
+    parser.add_argument("datasets", help="directory with .csv/.json datasets")
+    parser.add_argument("--quality", default="high_quality",
+                        choices=["low_quality", "medium_quality", "high_quality", "production_quality", "fourk_quality"])
+    parser.add_argument("--media_dir", default="media")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    results, failures = render_all(args.datasets, args.quality, args.media_dir, args.workers)
+    for name, output, seconds in sorted(results):
+        print(f"{name}: {output} ({seconds:.1f}s)")
+    for name, error in failures:
+        print(f"FAILED {name}: {error}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
+
+# To render every dataset in sections/ at 1080p60:
+#   python demo/batch_variants.py sections/ --quality high_quality
@@ -1,7 +1,9 @@
 # clip1_linear_review.py
 from manim import *
+from parallel_updaters import ParallelUpdatersMixin, parallel_safe
+from numeric_readout import NumericReadout, ReadoutSlot
 
-class Clip1LinearReview(Scene):
+class Clip1LinearReview(ParallelUpdatersMixin, Scene):
     def construct(self):
         # 1. Transition Text
         title = Text("Linear Regression").scale(1.5)
@@ -70,13 +72,13 @@ class Clip1LinearReview(Scene):
         b = ValueTracker(b_initial)
 
         # Redraw the linear graph based on trackers - crucial for animation
-        linear_graph_dynamic = always_redraw(
+        linear_graph_dynamic = parallel_safe(always_redraw(
             lambda: axes.plot(
                 lambda x: m.get_value() * x + b.get_value(),
                 color=YELLOW,
                 stroke_width=6 # Keep highlighted width
             )
-        )
+        ))
         # Remove the static graph and add the dynamic one
         self.remove(linear_graph_static)
         self.add(linear_graph_dynamic)
@@ -90,7 +92,7 @@ class Clip1LinearReview(Scene):
         dx_run = 1.0 # Define run value
         
         # Create slope triangle components - these need to update if m changes during explanation
-        slope_triangle = always_redraw(lambda: axes.get_secant_slope_group(
+        slope_triangle = parallel_safe(always_redraw(lambda: axes.get_secant_slope_group(
             x=x_start,
             graph=linear_graph_dynamic, # Use dynamic graph
             dx=dx_run, # Use defined run value
@@ -100,14 +102,14 @@ class Clip1LinearReview(Scene):
             dy_label=f"rise = {m.get_value() * dx_run:.2f}", # Show calculated rise
             secant_line_color=None, # Don't draw the secant line itself
             secant_line_length=0,
-        ).set_z_index(0)) # Behind the line
+        ).set_z_index(0))) # Behind the line
 
         # Updated m_label showing calculation
-        m_label = always_redraw(lambda:
+        m_label = parallel_safe(always_redraw(lambda:
             MathTex(f"m = \\frac{{\\text{{rise}}}}{{\\text{{run}}}} = \\frac{{{m.get_value() * dx_run:.2f}}}{{{dx_run:.1f}}} = {m.get_value():.2f}")
             .scale(0.7)
             .next_to(slope_triangle, UP, buff=0.2)
-        )
+        ))
 
         self.play(Create(slope_triangle), Write(m_label))
         self.wait(3) # Increased wait time to read the label
@@ -115,28 +117,32 @@ class Clip1LinearReview(Scene):
         # --- Animate m into equation ---
         # Create the target equation label with the numerical value of m
         # This needs to be dynamic for the next step and final animations
-        eq_label_with_m = always_redraw(lambda:
-            MathTex(f"y = {m.get_value():.2f}x + b", color=YELLOW)
+        # Readouts compile their TeX once; only the digits change per frame
+        eq_label_with_m = (
+            NumericReadout("y = ", ReadoutSlot("{:.2f}"), "x + b", color=YELLOW)
+            .set_values(m.get_value())
             .scale(0.8)
             .to_corner(UL).shift(RIGHT*0.5 + DOWN*0.5) # Same position as original
             .set_z_index(1)
         )
+        parallel_safe(eq_label_with_m).add_updater(lambda label: label.set_values(m.get_value()))
 
         # Animate the transformation from "y=mx+b" to "y = {m_val}x + b"
         self.play(ReplacementTransform(static_eq_label, eq_label_with_m))
         self.wait(1.5)
 
         # 6. Explain Intercept (b)
-        intercept_dot = always_redraw(lambda:
+        intercept_dot = parallel_safe(always_redraw(lambda:
             Dot(axes.c2p(0, b.get_value()), color=PINK, radius=0.1)
             .set_z_index(2) # Make sure dot is visible on top
-        )
+        ))
         # b_label already shows the dynamic value
-        b_label = always_redraw(lambda:
-             MathTex(f"b = \\text{{y-intercept}} = {b.get_value():.1f}")
-            .scale(0.7)
+        b_label = NumericReadout(r"b = \text{y-intercept} = ", ReadoutSlot("{:.1f}")).scale(0.7)
+        parallel_safe(b_label).add_updater(lambda label:
+            label.set_values(b.get_value())
             .next_to(intercept_dot, RIGHT if b.get_value() >= 0 else LEFT, buff=0.2) # Adjusted condition slightly
         )
+        b_label.update()
 
         self.play(FadeIn(intercept_dot, scale=0.5), Write(b_label))
         self.wait(3) # Increased wait time
@@ -144,12 +150,14 @@ class Clip1LinearReview(Scene):
         # --- Animate b into equation ---
         # Create the final target equation with numerical values for m and b
         # This needs to be dynamic for the final animations
-        final_eq_label = always_redraw(lambda:
-            MathTex(f"y = {m.get_value():.2f}x + {b.get_value():.1f}", color=YELLOW)
+        final_eq_label = (
+            NumericReadout("y = ", ReadoutSlot("{:.2f}"), "x + ", ReadoutSlot("{:.1f}"), color=YELLOW)
+            .set_values(m.get_value(), b.get_value())
             .scale(0.8)
-            .to_corner(UL).shift(RIGHT*0.5 + DOWN*0.5) # Same position
+            .to_corner(UL).shift(RIGHT*0.5 + DOWN*0.5) # Same position; numbers grow to the right
             .set_z_index(1)
         )
+        parallel_safe(final_eq_label).add_updater(lambda label: label.set_values(m.get_value(), b.get_value()))
 
         # Animate the transformation from "y = {m_val}x + b" to "y = {m_val}x + {b_val}"
         # We transform the *currently displayed* label (eq_label_with_m)
@@ -1,59 +1,127 @@
 from manim import *
+from glyph_cache import CachedText
+from homogeneous_group import HomogeneousGroup
+from numeric_readout import NumericReadout, ReadoutSlot
+from segment_cache import SegmentCacheMixin
+from scene_inputs import SceneInputs, StableStatistics
 import numpy as np
 
-# Helper function to create residuals for a given line/dots
-def create_residuals(axes_obj, dots_collection, m_val, b_val, line_color=GRAY, stroke_width=2):
-    residuals_group = VGroup()
-    for dot in dots_collection:
-        x_val = axes_obj.p2c(dot.get_center())[0]
-        y_actual = axes_obj.p2c(dot.get_center())[1]
-        y_predicted = m_val * x_val + b_val
-        start_point = axes_obj.c2p(x_val, y_predicted)
-        end_point = dot.get_center()
-        res_line = DashedLine(start_point, end_point, color=line_color, stroke_width=stroke_width)
-        residuals_group.add(res_line)
-    return residuals_group
-
-# Dynamic squares function moved to the top level for reuse
-def create_dynamic_squares(axes_obj, dot_collection, m_val, b_val):
-    sq_group = VGroup()
-    for dot in dot_collection:
-        x_c = axes_obj.p2c(dot.get_center())[0]
-        y_c = axes_obj.p2c(dot.get_center())[1]
-        y_pred = m_val * x_c + b_val
-        side = max(0.01, abs(y_c - y_pred))
-        sq = Square(side_length=side, color=BLUE, fill_opacity=0.5)
-        sq.move_to(axes_obj.c2p(x_c, (y_c + y_pred) / 2))
-        sq_group.add(sq)
-    return sq_group
-
-class Clip2OLSIntuition(Scene):
+# Straight bezier points for many polylines at once, cubic by default
+# (quadratic, points_per_curve=3, for OpenGL VMobjects).
+# corners: (..., k, 3) -> points: (..., points_per_curve * (k - 1), 3)
+def corners_to_bezier_points(corners, points_per_curve=4):
+    starts, ends = corners[..., :-1, None, :], corners[..., 1:, None, :]
+    alphas = np.linspace(0, 1, points_per_curve)[:, None]
+    points = starts + alphas * (ends - starts)
+    return points.reshape(*corners.shape[:-2], -1, 3)
+
+# Preallocated residual lines and squares for a fixed set of dots.
+# Instead of building new DashedLine/Square objects for every dot on every
+# frame, the pool hands out groups sized for the dataset and only rewrites their
+# points. Groups go back to the pool with release() once they are faded out.
+# Squares all have the same shape, so their groups are HomogeneousGroups and
+# an update is a single write into one point array; dashed residuals have a
+# different number of dashes per dot and stay one VMobject each.
+class ResidualPool:
+    def __init__(self, axes_obj, dots_collection, dash_length=DEFAULT_DASH_LENGTH, dashed_ratio=0.5):
+        if isinstance(dots_collection, HomogeneousGroup):
+            self.dot_points = dots_collection.get_element_centers()
+        else:
+            self.dot_points = np.array([dot.get_center() for dot in dots_collection])
+        data_coords = np.array([axes_obj.p2c(point) for point in self.dot_points])
+        self.x_vals, self.y_vals = data_coords[:, 0], data_coords[:, 1]
+        # The axes are linear, so c2p is origin + x * x_unit + y * y_unit
+        self.origin = np.array(axes_obj.c2p(0, 0))
+        self.x_unit = np.array(axes_obj.c2p(1, 0)) - self.origin
+        self.y_unit = np.array(axes_obj.c2p(0, 1)) - self.origin
+        self.dash_length = dash_length
+        self.dashed_ratio = dashed_ratio
+        self.free = {"residuals": [], "squares": []}
+
+    def c2p(self, x_vals, y_vals):
+        return self.origin + x_vals[:, None] * self.x_unit + y_vals[:, None] * self.y_unit
+
+    def _acquire(self, kind):
+        if self.free[kind]:
+            return self.free[kind].pop()
+        if kind == "squares":
+            group = HomogeneousGroup(Square(side_length=1), self.dot_points)
+        else:
+            group = VGroup(*[VMobject() for _ in self.dot_points])
+        group.pool_kind = kind
+        return group
+
+    def release(self, *groups):
+        for group in groups:
+            group.clear_updaters()
+            self.free[group.pool_kind].append(group)
+
+    # Dashed vertical lines from the line (m, b) to each dot
+    def residuals(self, m_val, b_val, line_color=GRAY, stroke_width=2):
+        group = self._acquire("residuals")
+        group.set_fill(opacity=0)
+        group.set_stroke(line_color, width=stroke_width, opacity=1)
+        return self.update_residuals(group, m_val, b_val)
+
+    def update_residuals(self, group, m_val, b_val):
+        starts = self.c2p(self.x_vals, m_val * self.x_vals + b_val)
+        ends = self.dot_points
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        for res_line, start, end, length in zip(group, starts, ends, lengths):
+            # Same dash spacing as DashedLine: dashes at both ends, evenly spread
+            num_dashes = max(1, int(np.ceil(length * self.dashed_ratio / self.dash_length)))
+            period = 1 / (num_dashes - 1 + self.dashed_ratio)
+            alphas = np.arange(num_dashes)[:, None] * period + np.array([0, self.dashed_ratio * period])
+            dash_corners = start + alphas[..., None] * (end - start)  # (num_dashes, 2, 3)
+            res_line.points = corners_to_bezier_points(dash_corners).reshape(-1, 3)
+        return group
+
+    # Squares with side |residual|, centered halfway between the line and each dot
+    def squares(self, m_val, b_val, color=BLUE, fill_opacity=0.5):
+        group = self._acquire("squares")
+        group.set_fill(color, opacity=fill_opacity)
+        group.set_stroke(color, width=DEFAULT_STROKE_WIDTH, opacity=1)
+        return self.update_squares(group, m_val, b_val)
+
+    def update_squares(self, group, m_val, b_val):
+        y_pred = m_val * self.x_vals + b_val
+        half_sides = np.maximum(0.01, np.abs(self.y_vals - y_pred)) / 2
+        centers = self.c2p(self.x_vals, (self.y_vals + y_pred) / 2)
+        # UR, UL, DL, DR, UR - the corner order of Square
+        offsets = np.array([[1, 1, 0], [-1, 1, 0], [-1, -1, 0], [1, -1, 0], [1, 1, 0]])
+        corners = centers[:, None, :] + half_sides[:, None, None] * offsets
+        return group.set_element_points(corners_to_bezier_points(corners))
+
+class Clip2OLSIntuition(SegmentCacheMixin, Scene):
     def construct(self):
         # 1. Title
-        title = Text("Fitting a Line: How to Choose?").scale(1.1)
+        title = CachedText("Fitting a Line: How to Choose?").scale(1.1)
         self.play(Write(title))
         self.wait(1.5)
         self.play(FadeOut(title))
         self.wait(0.5)
 
         # 2. Setup Generic Scatter Plot
-        np.random.seed(0)
-        x_coords = np.array([1, 1.5, 2.5, 3, 4, 4.5, 5.5, 6])
-        y_coords = 0.7 * x_coords + 1.5 + np.random.normal(0, 0.8, size=x_coords.size)
+        # Seeded, named noise stream: the same points on every run and machine
+        self.scene_inputs = inputs = SceneInputs("clip2")
+        x_coords = inputs.add("x", np.array([1, 1.5, 2.5, 3, 4, 4.5, 5.5, 6]))
+        noise = inputs.rng("noise").normal(0, 0.8, size=x_coords.size)
+        y_coords = inputs.add("y", 0.7 * x_coords + 1.5 + noise)
 
         axes = Axes(
             x_range=[0, 7, 1], y_range=[0, 7, 1], x_length=7, y_length=5.5,
             axis_config={"include_tip": False, "stroke_opacity": 0.5},
         ).shift(DOWN*1.0)
         axes_labels = axes.get_axis_labels(x_label="X", y_label="Y")
-        dots = VGroup(*[Dot(axes.c2p(x, y), color=YELLOW) for x, y in zip(x_coords, y_coords)])
+        dots = HomogeneousGroup(Dot(color=YELLOW), [axes.c2p(x, y) for x, y in zip(x_coords, y_coords)])
         plot_elements = VGroup(axes, axes_labels, dots)
+        residual_pool = ResidualPool(axes, dots)
 
         self.play(Create(plot_elements))
         self.wait(1)
 
         # NEW: Line exploration animation before the "intuitive fit" section
-        search_text = Text("We choose parameters to fit this data...").scale(0.6).to_edge(UP)
+        search_text = CachedText("We choose parameters to fit this data...").scale(0.6).to_edge(UP)
         self.play(Write(search_text))
         self.wait(0.5)
 
@@ -114,23 +182,23 @@ class Clip2OLSIntuition(Scene):
         self.wait(1)  # Add a pause here to let the poor fit line be visible for a moment
 
         # Continue with the existing code
-        intro_text = Text("Visually, it is easy to determine if a line is a good fit for a set of points.").scale(0.6).to_edge(UP)
+        intro_text = CachedText("Visually, it is easy to determine if a line is a good fit for a set of points.").scale(0.6).to_edge(UP)
         self.play(Write(intro_text))
         self.wait(1.5)
 
-        beta1_ols, beta0_ols = np.polyfit(x_coords, y_coords, 1)
+        beta1_ols, beta0_ols = inputs.add("ols", StableStatistics(x_coords, y_coords).ols())
 
         # ADD LABELS to the poor fit line (it's already on screen)
         label_a = MathTex(f"y = {m_a:.1f}x + {b_a:.1f}", color=RED).scale(0.7).next_to(line_a, UP, buff=0.1)
-        fit_label_a = Text("Good Fit?", color=RED).scale(0.6).next_to(label_a, RIGHT)
+        fit_label_a = CachedText("Good Fit?", color=RED).scale(0.6).next_to(label_a, RIGHT)
 
         # Show residuals for line A 
-        residuals_a = create_residuals(axes, dots, m_a, b_a)
+        residuals_a = residual_pool.residuals(m_a, b_a)
         self.play(Write(label_a), Write(fit_label_a), Create(residuals_a), run_time=1.5)
         self.wait(1)  # Add a pause to appreciate the residuals
 
         # NEW: Add mathematical definition for residuals when first shown
-        residual_def_text = Text("These vertical lines are 'residuals'").scale(0.6).to_edge(UP, buff=1.0)
+        residual_def_text = CachedText("These vertical lines are 'residuals'").scale(0.6).to_edge(UP, buff=1.0)
         residual_formula = MathTex(r"e_i = y_i - (mx_i + b) = \text{actual} - \text{predicted}").scale(0.7)
         residual_formula.next_to(residual_def_text, DOWN, buff=0.2)
         self.play(FadeOut(intro_text), Write(residual_def_text), Write(residual_formula))
@@ -143,16 +211,17 @@ class Clip2OLSIntuition(Scene):
         # We can keep the residuals visible a bit longer before fading them
         self.wait(1)
         self.play(FadeOut(residuals_a), FadeOut(residual_def_text), FadeOut(residual_formula), FadeOut(fit_label_a), FadeOut(label_a), FadeOut(line_a))
+        residual_pool.release(residuals_a)
         
         self.wait(0.5)  # Add a small pause before transitioning to the good fit
         '''
         # Good Fit Line (Example B - using OLS params directly or close to them)
         line_b = axes.plot(lambda x: beta1_ols * x + beta0_ols, color=GREEN)
         label_b = MathTex(f"y = {beta1_ols:.1f}x + {beta0_ols:.1f}", color=GREEN).scale(0.7).next_to(line_b, DOWN, buff=0.1)
-        fit_label_b = Text("Good Fit?", color=GREEN).scale(0.6).next_to(label_b, RIGHT)
+        fit_label_b = CachedText("Good Fit?", color=GREEN).scale(0.6).next_to(label_b, RIGHT)
 
         # Show residuals for line B
-        residuals_b = create_residuals(axes, dots, beta1_ols, beta0_ols)
+        residuals_b = residual_pool.residuals(beta1_ols, beta0_ols)
         self.play(
             ReplacementTransform(line_a, line_b),
             ReplacementTransform(label_a, label_b),
@@ -161,7 +230,7 @@ class Clip2OLSIntuition(Scene):
         )
         
         # NEW: Remind viewers about residuals for good fit
-        residual_good_text = Text("Smaller residuals").scale(0.6).to_edge(UP, buff=1.0)
+        residual_good_text = CachedText("Smaller residuals").scale(0.6).to_edge(UP, buff=1.0)
         self.play(Write(residual_good_text))
         self.wait(1)
         
@@ -173,13 +242,13 @@ class Clip2OLSIntuition(Scene):
         self.wait(0.5)
         '''
         # 4. Bridge to Mathematical Definition
-        math_intro_text = Text("How do we mathematically define and find the 'best' line?").scale(0.6).to_edge(UP)
+        math_intro_text = CachedText("How do we mathematically define and find the 'best' line?").scale(0.6).to_edge(UP)
         self.play(Write(math_intro_text))
         self.wait(2)
 
         # 5. Introduce OLS and SSR Directly - Using Dynamic Elements from the Start
         self.play(FadeOut(math_intro_text))
-        ols_intro_text = Text("One common method: Ordinary Least Squares (OLS)").scale(0.6).to_edge(UP)
+        ols_intro_text = CachedText("One common method: Ordinary Least Squares (OLS)").scale(0.6).to_edge(UP)
         self.play(Write(ols_intro_text))
 
         # Create trackers for parameters (start with NON-optimal values)
@@ -202,8 +271,8 @@ class Clip2OLSIntuition(Scene):
         self.wait(0.5)
 
         # Show Residuals for the dynamic line (let's still use residuals for clear visualization)
-        residuals_ols = create_residuals(axes, dots, initial_poor_m, initial_poor_b)
-        res_label = Text("Recall: residuals are the vertical distances").scale(0.6).next_to(ols_intro_text, DOWN)
+        residuals_ols = residual_pool.residuals(initial_poor_m, initial_poor_b)
+        res_label = CachedText("Recall: residuals are the vertical distances").scale(0.6).next_to(ols_intro_text, DOWN)
         res_formula = MathTex(r"e_i = y_i - (mx_i + b)").scale(0.6).next_to(res_label, DOWN)
         
         self.play(Write(res_label), Write(res_formula))
@@ -212,7 +281,7 @@ class Clip2OLSIntuition(Scene):
 
         # Show Squaring and SSR - Using Dynamic Squares from the Start
         self.play(FadeOut(res_label), FadeOut(res_formula))
-        ssr_text = Text("OLS minimizes the Sum of the Squared Residuals (SSR)").scale(0.6).next_to(ols_intro_text, DOWN)
+        ssr_text = CachedText("OLS minimizes the Sum of the Squared Residuals (SSR)").scale(0.6).next_to(ols_intro_text, DOWN)
         ssr_formula = MathTex(
             r"SSR &= \sum e_i^2\\", 
             r"&= \sum (y_i - (mx_i + b))^2"
@@ -220,23 +289,23 @@ class Clip2OLSIntuition(Scene):
         self.play(Write(ssr_text), Write(ssr_formula))
 
         # Create dynamic squares immediately
-        squares_dynamic = always_redraw(lambda:
-            create_dynamic_squares(axes, dots, m_tracker.get_value(), b_tracker.get_value())
+        squares_dynamic = residual_pool.squares(initial_poor_m, initial_poor_b).add_updater(lambda group:
+            residual_pool.update_squares(group, m_tracker.get_value(), b_tracker.get_value())
         )
         
         # Animate squares appearing through transformation from residuals
         anims = []
-        temp_squares = create_dynamic_squares(axes, dots, initial_poor_m, initial_poor_b)  # Create static version matching current line
+        temp_squares = residual_pool.squares(initial_poor_m, initial_poor_b)  # Create static version matching current line
         transformed_squares = VGroup()  # Group to track the transformed objects
-        for i, res_line in enumerate(residuals_ols):
-            if i < len(temp_squares):
-                copied_line = res_line.copy()
-                anims.append(Transform(copied_line, temp_squares[i]))
-                transformed_squares.add(copied_line)  # Add to tracking group
+        for res_line, square in zip(residuals_ols, temp_squares.elements()):
+            copied_line = res_line.copy()
+            anims.append(Transform(copied_line, square.to_mobject()))
+            transformed_squares.add(copied_line)  # Add to tracking group
         
         self.play(AnimationGroup(*anims, lag_ratio=0.1))
-        self.add(squares_dynamic)  # Add the always_redraw version
+        self.add(squares_dynamic)  # Add the updating version
         self.play(FadeOut(residuals_ols), FadeOut(transformed_squares))  # Fade out both original residuals AND transformed squares
+        residual_pool.release(residuals_ols, temp_squares)
         self.wait(3)
         
         # Fade out the explanation text
@@ -251,20 +320,25 @@ class Clip2OLSIntuition(Scene):
         # Create tracker to control symbolic vs numeric display
         display_mode = ValueTracker(0)  # 0=symbolic, 1=numeric
 
-        # Create a single formula that changes only the variable parts
-        ssr_formula = always_redraw(lambda:
-            MathTex(
-                r"\text{Minimize: } SSR = \sum_{i=1}^{n} (y_i - (",
-                # This part changes from "m" to the actual value
-                r"m" if display_mode.get_value() < 0.5 else f"{m_tracker.get_value():.2f}",
-                r"x_i + ",
-                # This part changes from "b" to the actual value
-                r"b" if display_mode.get_value() < 0.5 else f"{b_tracker.get_value():.2f}",
-                r"))^2",
-                # The SSR value only appears after switching to numeric mode
-                "" if display_mode.get_value() < 0.5 else r" = " + f"{calculate_ssr(m_tracker.get_value(), b_tracker.get_value()):.2f}"
-            ).scale(0.7).to_corner(UP)
-        )
+        # Create a single formula that changes only the variable parts: the
+        # symbolic version, and a readout whose digits follow the trackers
+        ssr_lhs = r"\text{Minimize: } SSR = \sum_{i=1}^{n} (y_i - ("
+        ssr_symbolic = MathTex(ssr_lhs, r"m", r"x_i + ", r"b", r"))^2").scale(0.7).to_corner(UP)
+        ssr_numeric = NumericReadout(
+            ssr_lhs, ReadoutSlot(), r"x_i + ", ReadoutSlot(), r"))^2 = ", ReadoutSlot(max_chars=10),
+        ).scale(0.7)
+
+        def show_ssr_formula(group):
+            if display_mode.get_value() < 0.5:
+                shown = ssr_symbolic
+            else:
+                m_val, b_val = m_tracker.get_value(), b_tracker.get_value()
+                shown = ssr_numeric.set_values(m_val, b_val, calculate_ssr(m_val, b_val)).to_corner(UP)
+            if group.submobjects[0] is not shown:
+                group.remove(group.submobjects[0])
+                group.add(shown)
+
+        ssr_formula = VGroup(ssr_symbolic).add_updater(show_ssr_formula)
 
         # Show the formula (initially with symbolic m, b)
         self.play(Write(ssr_formula))
@@ -296,7 +370,7 @@ class Clip2OLSIntuition(Scene):
         self.play(line_color_tracker.animate.set_value(0), run_time=0.7)
         
         # Final OLS line label
-        ols_label = Text("OLS Best-Fit Line").scale(0.6).next_to(ols_line_dynamic, RIGHT, buff=0.1).set_color(GREEN)
+        ols_label = CachedText("OLS Best-Fit Line").scale(0.6).next_to(ols_line_dynamic, RIGHT, buff=0.1).set_color(GREEN)
         self.play(Write(ols_label))
         self.wait(2)
 
@@ -324,13 +398,14 @@ class Clip2OLSIntuition(Scene):
             FadeOut(explanation_group),
             FadeOut(min_process)
         )
+        residual_pool.release(squares_dynamic)
         self.wait(0.5)
         
-        calc_text = Text("Solving the equations gives us:", t2c={"equations": YELLOW}).scale(0.6)
+        calc_text = CachedText("Solving the equations gives us:", t2c={"equations": YELLOW}).scale(0.6)
         m_hat_formula = MathTex(r"\hat{m} = \frac{\sum (x_i - \bar{x})(y_i - \bar{y})}{\sum (x_i - \bar{x})^2}").scale(0.6)
         b_hat_formula = MathTex(r"\hat{b} = \bar{y} - \hat{m} \bar{x}").scale(0.6)
         formula_explanation_grp = VGroup(calc_text, m_hat_formula, b_hat_formula).arrange(DOWN, buff=0.4).center()
-        preview_text = Text("We use these to compute the line for real data.").scale(0.6).next_to(formula_explanation_grp, DOWN, buff=0.5)
+        preview_text = CachedText("We use these to compute the line for real data.").scale(0.6).next_to(formula_explanation_grp, DOWN, buff=0.5)
         
         self.play(Write(formula_explanation_grp))
         self.wait(3)
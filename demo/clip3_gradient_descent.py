@@ -0,0 +1,182 @@
+from manim import *
+from glyph_cache import CachedText
+from homogeneous_group import HomogeneousGroup
+from numeric_readout import NumericReadout, ReadoutSlot
+from interactive_explorer import SSRStatistics, explorer_data
+from clip2_OLS import corners_to_bezier_points
+from scene_inputs import SceneInputs, StableStatistics, exact_sum, stream
+import math
+import os
+import time
+import numpy as np
+
+# Gradient descent, SGD and mini-batch SGD racing to the closed-form fit.
+#
+# Every iterate of every optimizer is computed before the first frame. For
+# squared error the gradient at (m, b) is affine in (m, b):
+#
+#   grad = A_t @ (m, b) - c_t,  A_t = 2 [[mean x^2, mean x], [mean x, 1]],
+#                               c_t = 2 [mean xy, mean y]
+#
+# with the means over the step's batch. So the batch means for all steps come
+# out of one gather over the data, and the recurrence only does 2x2 algebra
+# per step; full-batch gradient descent uses the data's sufficient statistics
+# and never touches the points again. Frames only look up iterate int(step).
+#
+#   manim -pqh demo/clip3_gradient_descent.py Clip3GradientDescent
+#   CLIP3_POINTS=10000 manim -pql demo/clip3_gradient_descent.py Clip3GradientDescent
+
+
+def _batch_means(x, y, batch_size, n_iterations, rng):
+    if batch_size is None:
+        stats = SSRStatistics(x, y)
+        means = np.array([stats.sxx, stats.sx, stats.sxy, stats.sy]) / stats.n
+        return np.broadcast_to(means, (n_iterations, 4))
+    idx = rng.integers(0, len(x), size=(n_iterations, batch_size))
+    xb, yb = x[idx], y[idx]
+    # fsum per batch instead of .mean(1), whose rounding depends on the SIMD path
+    columns = [xb * xb, xb, xb * yb, yb]
+    return np.array([[exact_sum(column[t]) for column in columns] for t in range(n_iterations)]) / batch_size
+
+
+# (n_iterations + 1, 2) array of (m, b) iterates of the mean squared error.
+# batch_size=None is full-batch gradient descent; learning_rate / (1 + decay * t)
+# is the step size of step t.
+def descent_trajectory(x, y, start, n_iterations, learning_rate, batch_size=None, decay=0.0, stream_name="clip3.batches"):
+    sxx, sx, sxy, sy = _batch_means(x, y, batch_size, n_iterations, stream(stream_name)).T
+    rates = learning_rate / (1 + decay * np.arange(n_iterations))
+    # (m, b) <- (m, b) - rate * (A_t (m, b) - c_t), written out per entry
+    mm, mb = 1 - 2 * rates * sxx, -2 * rates * sx
+    bm, bb = -2 * rates * sx, 1 - 2 * rates
+    cm, cb = 2 * rates * sxy, 2 * rates * sy
+    trajectory = np.empty((n_iterations + 1, 2))
+    m, b = trajectory[0] = start
+    for t in range(n_iterations):
+        m, b = mm[t] * m + mb[t] * b + cm[t], bm[t] * m + bb[t] * b + cb[t]
+        trajectory[t + 1] = m, b
+    return trajectory
+
+
+class Clip3GradientDescent(Scene):
+    n_points = int(os.environ.get("CLIP3_POINTS", 1_000_000))
+    n_iterations = 3000
+    shown_points = 300  # dots drawn from the dataset
+    start = (0.2, 3.5)  # Clip 2's poor fit
+
+    def compute_trajectories(self, x, y):
+        stats = SSRStatistics(x, y)
+        # Full-batch Hessian of the MSE: 2 / n [[sxx, sx], [sx, n]]
+        # and its largest eigenvalue in closed form rather than through LAPACK
+        a, c, d = 2 * stats.sxx / stats.n, 2 * stats.sx / stats.n, 2.0
+        safe_rate = 1 / ((a + d) / 2 + math.hypot((a - d) / 2, c))
+        # One sample's Hessian can be much larger; SGD starts smaller and decays
+        sample_rate = 1 / (2 * (x.max() ** 2 + 1))
+        optimizers = [
+            ("Gradient descent", BLUE, {"learning_rate": safe_rate}),
+            ("SGD", ORANGE, {"learning_rate": sample_rate, "batch_size": 1, "decay": 0.01}),
+            ("Mini-batch SGD", PURPLE, {"learning_rate": 0.5 * safe_rate, "batch_size": 256, "decay": 0.002}),
+        ]
+        trajectories = {}
+        for name, color, kwargs in optimizers:
+            trajectory = descent_trajectory(x, y, self.start, self.n_iterations, stream_name=f"clip3.{name}", **kwargs)
+            mse = stats.ssr(trajectory[:, 0], trajectory[:, 1]) / stats.n
+            trajectories[name] = (color, trajectory, mse)
+        return trajectories
+
+    def construct(self):
+        # 1. Title
+        title = CachedText("Solving it step by step: Gradient Descent").scale(0.9)
+        update_rule = MathTex(r"(m, b) \leftarrow (m, b) - \eta \, \nabla \, \text{MSE}(m, b)").scale(0.8)
+        VGroup(title, update_rule).arrange(DOWN, buff=0.5)
+        self.play(Write(title))
+        self.play(Write(update_rule))
+        self.wait(1.5)
+        self.play(FadeOut(title), FadeOut(update_rule))
+
+        # 2. Precompute the data, the closed form and all iterates
+        started = time.perf_counter()
+        self.scene_inputs = inputs = SceneInputs("clip3")
+        x, y = explorer_data(self.n_points)
+        inputs.add("x", x)
+        inputs.add("y", y)
+        m_fit, b_fit = inputs.add("ols", StableStatistics(x, y).ols())
+        trajectories = self.compute_trajectories(x, y)
+        logger.info(
+            "clip3: %d points, %d iterations x %d optimizers precomputed in %.2f s",
+            self.n_points, self.n_iterations, len(trajectories), time.perf_counter() - started,
+        )
+
+        # 3. Data and lines on Clip 2's axes, parameter space on the right
+        axes = Axes(
+            x_range=[0, 7, 1], y_range=[0, 7, 1], x_length=7, y_length=5.5,
+            axis_config={"include_tip": False, "stroke_opacity": 0.5},
+        ).scale(0.75).to_edge(LEFT, buff=0.5).shift(DOWN * 0.4)
+        axes_labels = axes.get_axis_labels(x_label="X", y_label="Y")
+        shown = stream("clip3.shown").choice(self.n_points, min(self.shown_points, self.n_points), replace=False)
+        dots = HomogeneousGroup(Dot(radius=0.03, color=YELLOW, fill_opacity=0.6),
+                                [axes.c2p(xi, yi) for xi, yi in zip(x[shown], y[shown])])
+        fit_line = DashedLine(axes.c2p(0, b_fit), axes.c2p(7, 7 * m_fit + b_fit), color=GREEN)
+
+        param_axes = Axes(
+            x_range=[0, 1.4, 0.2], y_range=[0, 4, 1], x_length=5, y_length=4,
+            axis_config={"include_tip": False, "stroke_opacity": 0.5},
+        ).to_edge(RIGHT, buff=0.6).shift(DOWN * 0.6)
+        param_labels = param_axes.get_axis_labels(x_label="m", y_label="b")
+        target = Star(outer_radius=0.12, color=GREEN, fill_opacity=1).move_to(param_axes.c2p(m_fit, b_fit))
+        closed_form = MathTex(
+            r"\text{closed form: } m = " + f"{m_fit:.2f}" + r",\ b = " + f"{b_fit:.2f}", color=GREEN,
+        ).scale(0.55).next_to(param_axes, UP, buff=0.2)
+
+        self.play(Create(axes), Write(axes_labels), FadeIn(dots))
+        self.play(Create(fit_line), Create(param_axes), Write(param_labels), FadeIn(target), Write(closed_form))
+
+        # 4. Everything is drawn from the step tracker: each line, path and
+        # readout looks up the iterate itself, in its own updater
+        step = ValueTracker(0)
+        # Linear axes: c2p is origin + m * m_unit + b * b_unit
+        param_origin = np.array(param_axes.c2p(0, 0))
+        m_unit = np.array(param_axes.c2p(1, 0)) - param_origin
+        b_unit = np.array(param_axes.c2p(0, 1)) - param_origin
+        lines, paths, legend = VGroup(), VGroup(), VGroup()
+        for name, (color, trajectory, mse) in trajectories.items():
+            def iterate(trajectory=trajectory):
+                return trajectory[int(step.get_value())]
+
+            lines.add(always_redraw(lambda iterate=iterate, color=color:
+                axes.plot(lambda t, m_b=iterate(): m_b[0] * t + m_b[1], x_range=[0, 7], color=color)
+            ))
+            # The whole path as bezier points up front; a frame shows a prefix
+            m_b = np.clip(trajectory[::5], [0, 0], [1.4, 4])
+            path_points = corners_to_bezier_points(param_origin + m_b[:, :1] * m_unit + m_b[:, 1:] * b_unit)
+            path = VMobject(stroke_color=color, stroke_width=2)
+            path.add_updater(lambda path, path_points=path_points:
+                path.set_points(path_points[: 4 * (int(step.get_value()) // 5)]))
+            paths.add(path.update())
+            readout = NumericReadout(r"\text{" + name + r"}: \ \text{MSE} = ", ReadoutSlot("{:.4f}"), color=color).scale(0.5)
+            readout.add_updater(lambda readout, mse=mse: readout.set_values(mse[int(step.get_value())]))
+            legend.add(readout.update())
+
+        iteration = NumericReadout(r"\text{iteration } ", ReadoutSlot("{:.0f}"), color=GRAY).scale(0.5)
+        legend.add(iteration).arrange(DOWN, aligned_edge=LEFT, buff=0.15).to_corner(UL, buff=0.4)
+        iteration.add_updater(lambda label: label.set_values(step.get_value()))
+
+        self.play(*[Create(line) for line in lines], FadeIn(legend))
+        self.add(paths)
+        self.wait(0.5)
+
+        # 5. Play the precomputed iterates; early steps move the most, so
+        # the playback starts slow and speeds up
+        self.play(step.animate.set_value(self.n_iterations), run_time=8, rate_func=rate_functions.ease_in_cubic)
+        self.wait(1)
+
+        summary = CachedText("Iterations approach the closed-form solution").scale(0.6).to_edge(DOWN, buff=0.3)
+        self.play(Write(summary))
+        self.wait(2)
+
+        for mob in [*lines, *paths, *legend]:
+            mob.clear_updaters()
+        self.play(*[FadeOut(mob) for mob in [
+            axes, axes_labels, dots, fit_line, param_axes, param_labels, target, closed_form,
+            lines, paths, legend, summary,
+        ]])
+        self.wait(0.5)
@@ -0,0 +1,127 @@
+from manim import *
+import os
+
+from glyph_cache import CachedText
+from step_layout import StepStack
+from density_scatter import ChangeResolution, DensityScatter
+from scene_inputs import SceneInputs, StableStatistics
+from memory_report import MemoryReportMixin
+from vfr_holds import VFRHoldsMixin
+from clip4_real_life_example import create_static_assets
+
+# Clip 4's study-days example at a scale where a table of rows and sums over
+# every x_i no longer fit on screen. The data never becomes mobjects: it is
+# read in chunks for the sufficient statistics (n, means, centered sums) and
+# binned into a DensityScatter, so a memmapped .npy of any size renders in
+# the time of the 10^6-point default. The table shows the summary, and the
+# steps fill the formulas from it.
+#
+#   manim -pql demo/clip4_density_example.py Clip4DensityExample
+#   CLIP4_DENSITY_DATA=grades.npy manim -pqh demo/clip4_density_example.py Clip4DensityExample  # (n, 2) floats
+#   CLIP4_DENSITY_POINTS=10000000 manim -pql demo/clip4_density_example.py Clip4DensityExample
+
+
+class Clip4DensityExample(MemoryReportMixin, VFRHoldsMixin, Scene):
+    title = "Example: Study Days vs. Exam Grade"
+    headers = ["Days (X)", "Grade (Y)"]
+    data_path = os.environ.get("CLIP4_DENSITY_DATA")
+    points = int(os.environ.get("CLIP4_DENSITY_POINTS", 10**6))  # synthetic data when there is no data_path
+    density_bins = (56, 40)
+
+    def density(self, axes):
+        if self.data_path:
+            return DensityScatter.from_npy(axes, self.data_path, bins=self.density_bins)
+        rng = self.scene_inputs.rng("points")
+        x = rng.uniform(0.5, 7.5, self.points)
+        y = 58 + 4 * x + rng.normal(0, 6, self.points)
+        return DensityScatter(axes, x, y, bins=self.density_bins)
+
+    def construct(self):
+        static = create_static_assets(self.title, self.headers)
+        self.scene_inputs = SceneInputs("clip4_density")
+
+        # 1. Scenario Title
+        scenario_title = static["scenario_title"]
+        scenario_title.to_edge(UP)
+        self.play(Write(scenario_title))
+        self.wait(1)
+
+        # 2. Summary of the data, from one chunked pass for the means and one
+        # for the centered sums
+        axes = static["axes"]
+        axes_labels = axes.get_axis_labels(
+            x_label=static["axes_label_texts"][0],
+            y_label=static["axes_label_texts"][1]
+        )
+        axes_group = VGroup(axes, axes_labels)
+        axes_group.to_edge(RIGHT, buff=0.5)
+        axes_group.shift(DOWN*0.3)
+
+        density = self.density(axes)
+        stats = StableStatistics.from_chunks(density.source.chunks)
+        self.scene_inputs.add("stats", stats.as_dict())
+        m_value, b_value = stats.ols()
+
+        summary_table = Table(
+            [
+                ["Rows", f"{stats.n:,}"],
+                ["Mean days", f"{stats.x_mean:.2f}"],
+                ["Mean grade", f"{stats.y_mean:.2f}"],
+            ],
+            col_labels=[CachedText("Summary"), CachedText("Value")],
+            include_outer_lines=True,
+            h_buff=0.7,
+            v_buff=0.4,
+            line_config={"stroke_width": 2, "color": WHITE}
+        ).scale(0.5)
+        summary_table.next_to(scenario_title, DOWN, buff=0.5).to_edge(LEFT, buff=0.5)
+        self.play(Create(summary_table), run_time=2)
+        self.wait(1)
+
+        # 3. Density of the points, coarse cells first, then the full resolution
+        self.play(Create(axes), Write(axes_labels), run_time=2)
+        density.set_bins([max(1, n // 4) for n in self.density_bins])
+        self.play(FadeIn(density), run_time=1)
+        self.play(ChangeResolution(density, self.density_bins), run_time=1.5)
+        self.wait(2)
+
+        # 4. Closed form, filled in from the summary
+        closed_form_group = static["closed_form_group"]
+        closed_form_group.next_to(summary_table, DOWN, buff=0.5).align_to(summary_table, LEFT)
+        self.play(Write(closed_form_group), run_time=1.5)
+        self.wait(1)
+
+        steps = StepStack(closed_form_group)
+        step_text = steps.push(CachedText("From the summary:").scale(0.5))
+        numerator_line = steps.add_line(MathTex(
+            r"\sum (x_i - \bar{x})(y_i - \bar{y}) = " + f"{stats.sxy_centered:,.2f}"
+        ).scale(0.45))
+        denominator_line = steps.add_line(MathTex(
+            r"\sum (x_i - \bar{x})^2 = " + f"{stats.sxx_centered:,.2f}"
+        ).scale(0.45), buff=0.1)
+        result_line = steps.add_line(MathTex(
+            r"\hat{m} = " + f"{m_value:.2f}" + r", \quad \hat{b} = " + f"{b_value:.2f}"
+        ).scale(0.5))
+
+        self.play(Write(step_text), run_time=1)
+        self.play(Write(numerator_line), run_time=1.5)
+        self.play(Write(denominator_line), run_time=1.5)
+        self.wait(0.5)
+        self.play(Write(result_line), run_time=1.5)
+        self.wait(1.5)
+
+        # 5. The line over the density, then where it runs above or below the
+        # data, per cell
+        regression_line = axes.plot(lambda x: m_value * x + b_value, color=GREEN)
+        line_label = CachedText("Best-Fit Line (OLS)", color=GREEN).scale(0.5)
+        line_label.next_to(regression_line.point_from_proportion(0.8), UP, buff=0.2)
+        self.play(Create(regression_line), Write(line_label), run_time=2)
+        self.wait(1.5)
+
+        residual_overlay = density.residual_overlay(m_value, b_value)
+        self.play(FadeIn(residual_overlay), run_time=1.5)
+        self.wait(1.5)
+        self.play(FadeOut(residual_overlay), run_time=1)
+        self.wait(1)
+
+        self.play(FadeOut(Group(*self.mobjects)), run_time=1.5)
@@ -1,37 +1,126 @@
 from manim import *
+from glyph_cache import CachedText
+from step_layout import StepStack
+from homogeneous_group import HomogeneousGroup
+from scene_inputs import exact_sum
+from memory_report import MemoryReportMixin
+from vfr_holds import VFRHoldsMixin
+import math
 import numpy as np
 
-class Clip4RealLifeExample(Scene):
+# Axes of the sample dataset; other datasets get ranges from their own values
+DEFAULT_X_RANGE = (0, 8, 1)
+DEFAULT_Y_RANGE = (50, 100, 10)
+
+
+# [low, high, step] covering the values, with about `ticks` round steps
+def nice_range(values, ticks=7):
+    low, high = math.floor(min(values)), math.ceil(max(values))
+    raw = max(high - low, 1) / ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = min((s * magnitude for s in (1, 2, 5, 10) if s * magnitude >= raw), default=raw)
+    return [math.floor(low / step) * step, math.ceil(high / step) * step, step]
+
+
+# The sample's axes while the data fits in them, so its picture stays the same
+def axes_ranges(x_values, y_values):
+    def fits(values, axis_range):
+        return axis_range[0] <= min(values) and max(values) <= axis_range[1]
+
+    x_range = DEFAULT_X_RANGE if fits(x_values, DEFAULT_X_RANGE) else tuple(nice_range(x_values))
+    y_range = DEFAULT_Y_RANGE if fits(y_values, DEFAULT_Y_RANGE) else tuple(nice_range(y_values))
+    return x_range, y_range
+
+
+# Part of [x_range] where the line y = m x + b stays inside y_range
+def line_x_range(m, b, x_range, y_range):
+    low, high = x_range[:2]
+    if m != 0:
+        ends = sorted(((y_range[0] - b) / m, (y_range[1] - b) / m))
+        low, high = max(low, ends[0]), min(high, ends[1])
+    return [low, high]
+
+
+# Parts of the clip that do not depend on the data (title, headers, axes, the
+# closed form formulas). They are built once per process and handed out as
+# copies, so rendering another dataset only rebuilds the data-dependent tex.
+_STATIC_ASSETS = {}
+
+def create_static_assets(title, headers, x_range=DEFAULT_X_RANGE, y_range=DEFAULT_Y_RANGE):
+    key = (title, tuple(headers), tuple(x_range), tuple(y_range))
+    if key not in _STATIC_ASSETS:
+        def make_axes(x_length):
+            x_low, x_high, x_step = x_range
+            y_low, y_high, y_step = y_range
+            return Axes(
+                x_range=list(x_range),
+                y_range=list(y_range),
+                x_length=x_length,
+                y_length=4,
+                axis_config={"include_numbers": True, "include_tip": False},
+                x_axis_config={"numbers_to_include": np.arange(x_low + x_step, x_high, x_step)},
+                y_axis_config={"numbers_to_include": np.arange(y_low, y_high + y_step / 2, y_step)},
+            )
+
+        closed_form_title = CachedText("OLS Formulas:").scale(0.6)
+        closed_form_m = MathTex(r"\hat{m} = \frac{\sum (x_i - \bar{x})(y_i - \bar{y})}{\sum (x_i - \bar{x})^2}").scale(0.55)
+        closed_form_b = MathTex(r"\hat{b} = \bar{y} - \hat{m} \cdot \bar{x}").scale(0.55)
+
+        _STATIC_ASSETS[key] = {
+            "scenario_title": CachedText(title).scale(0.9),
+            "col_labels": VGroup(*[CachedText(h) for h in headers]),
+            "axes": make_axes(5.5),
+            "axes_label_texts": VGroup(Tex("Days Studying (X)").scale(0.7), Tex("Exam Grade (Y)").scale(0.7)),
+            "left_axes": make_axes(4.5),  # Even smaller
+            "left_axes_label_texts": VGroup(Tex("Days Studying (X)").scale(0.6), Tex("Exam Grade (Y)").scale(0.6)),
+            "closed_form_group": VGroup(closed_form_title, closed_form_m, closed_form_b).arrange(DOWN, buff=0.2, aligned_edge=LEFT),
+            "ols_text": CachedText("Ordinary Least Squares (OLS)").scale(0.6),
+            "calc_title": CachedText("Step-by-step OLS Calculation:").scale(0.7),
+        }
+    return {name: mob.copy() for name, mob in _STATIC_ASSETS[key].items()}
+
+# Trim trailing zeros for inline arithmetic, e.g. 4.00 -> "4", 74.2857 -> "74.29"
+def format_inline(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+class Clip4RealLifeExample(MemoryReportMixin, VFRHoldsMixin, Scene):
+    # The dataset; batch_variants.py renders the clip with other values
+    title = "Example: Study Days vs. Exam Grade"
+    headers = ["Days (X)", "Grade (Y)"]
+    data = [
+        ["2", "60"],
+        ["5", "85"],
+        ["1", "60"],
+        ["7", "88"],
+        ["3", "75"],
+        ["4", "72"],
+        ["6", "80"]
+    ]
+    prediction_x = 4.5  # days of studying in the prediction example, if inside the data
+
     def construct(self):
+        data = self.data
+
+        # Extract numerical data for later use
+        data_points_num = np.array([[float(x), float(y)] for x, y in data])
+        x_values = data_points_num[:, 0]
+        y_values = data_points_num[:, 1]
+        x_range, y_range = axes_ranges(x_values, y_values)
+
+        static = create_static_assets(self.title, self.headers, x_range, y_range)
+
         # 1. Scenario Title
-        scenario_title = Text("Example: Study Days vs. Exam Grade").scale(0.9)
+        scenario_title = static["scenario_title"]
         scenario_title.to_edge(UP)
         self.play(Write(scenario_title))
         self.wait(1)
 
         # 2. Data Table
-        # Define the data
-        data = [
-            ["2", "60"],
-            ["5", "85"],
-            ["1", "60"],
-            ["7", "88"],
-            ["3", "75"],
-            ["4", "72"],
-            ["6", "80"]
-        ]
-        # Define headers separately for col_labels
-        headers = ["Days (X)", "Grade (Y)"]
-
-        # Extract numerical data for later use
-        data_points_num = np.array([[float(x), float(y)] for x, y in data])
-        x_values = data_points_num[:, 0]
-        y_values = data_points_num[:, 1]
 
         # Create the table
         data_table = Table(
             data,
-            col_labels=[Text(h) for h in headers],
+            col_labels=list(static["col_labels"]),
             include_outer_lines=True,
             h_buff=0.7,
             v_buff=0.4,
@@ -46,19 +135,11 @@ class Clip4RealLifeExample(Scene):
         self.wait(2)
 
         # 3. Initial Graph on Right Side (will be removed for calculations)
-        axes = Axes(
-            x_range=[0, 8, 1],
-            y_range=[50, 100, 10],
-            x_length=5.5,
-            y_length=4,
-            axis_config={"include_numbers": True, "include_tip": False},
-            x_axis_config={"numbers_to_include": np.arange(1, 8, 1)},
-            y_axis_config={"numbers_to_include": np.arange(50, 101, 10)},
-        )
+        axes = static["axes"]
 
         axes_labels = axes.get_axis_labels(
-            x_label=Tex("Days Studying (X)").scale(0.7),
-            y_label=Tex("Exam Grade (Y)").scale(0.7)
+            x_label=static["axes_label_texts"][0],
+            y_label=static["axes_label_texts"][1]
         )
         
         # Group axes and labels
@@ -86,7 +167,7 @@ class Clip4RealLifeExample(Scene):
         self.wait(2)
 
         # 5. OLS Introduction
-        ols_text = Text("Ordinary Least Squares (OLS)").scale(0.6)
+        ols_text = static["ols_text"]
         ols_text.next_to(scenario_title, DOWN, buff=0.2).align_to(scenario_title, RIGHT)
         
         self.play(Write(ols_text), run_time=1)
@@ -103,50 +184,43 @@ class Clip4RealLifeExample(Scene):
         )
         
         # Add the closed form formulas below the table
-        closed_form_title = Text("OLS Formulas:").scale(0.6)
-        closed_form_m = MathTex(r"\hat{m} = \frac{\sum (x_i - \bar{x})(y_i - \bar{y})}{\sum (x_i - \bar{x})^2}").scale(0.55)
-        closed_form_b = MathTex(r"\hat{b} = \bar{y} - \hat{m} \cdot \bar{x}").scale(0.55)
-
-        closed_form_group = VGroup(closed_form_title, closed_form_m, closed_form_b).arrange(DOWN, buff=0.2, aligned_edge=LEFT)
+        closed_form_group = static["closed_form_group"]
         closed_form_group.next_to(data_table, DOWN, buff=0.5).align_to(data_table, LEFT).shift(RIGHT*0.5)
 
         self.play(Write(closed_form_group), run_time=1.5)
         self.wait(1)
 
         # 7. Setup Calculation Area - moved more to the LEFT
-        calc_title = Text("Step-by-step OLS Calculation:").scale(0.7)
+        calc_title = static["calc_title"]
         calc_title.to_corner(UR, buff=0.8).shift(DOWN*1.25 + LEFT*1.5)  # Added LEFT shift to move it more left
 
+        # Steps stack up below the title; popping the oldest one moves the rest up
+        steps = StepStack(calc_title)
+
         # Calculate means
-        x_mean = np.mean(x_values)
-        y_mean = np.mean(y_values)
+        x_mean = exact_sum(x_values) / len(x_values)
+        y_mean = exact_sum(y_values) / len(y_values)
         
         # Then adjust all the subsequent calculation steps to follow from this new position
-        step1_text = Text("Step 1: Calculate means").scale(0.55)
-        step1_text.next_to(calc_title, DOWN, buff=0.3).align_to(calc_title, LEFT)
+        step1_text = steps.push(CachedText("Step 1: Calculate means").scale(0.55))
        
         # Simplified means calculation - just 2 lines
+        n = len(data)
         step1_calc_x = MathTex(
-            r"\bar{x} = \frac{1}{7}(2 + 5 + 1 + 7 + 3 + 4 + 6) = 4.00"
+            r"\bar{x} = \frac{1}{" + f"{n}" + "}(" + " + ".join(x for x, _ in data) + f") = {x_mean:.2f}"
         ).scale(0.5)
-        
-        
 
         step1_calc_y = MathTex(
-            r"\bar{y} = \frac{1}{7}(60 + 85 + 60 + 88 + 75 + 72 + 80) = 74.29"
+            r"\bar{y} = \frac{1}{" + f"{n}" + "}(" + " + ".join(y for _, y in data) + f") = {y_mean:.2f}"
         ).scale(0.5)
         
-        
-        step1_calcs = VGroup(step1_calc_x, step1_calc_y).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
-        step1_calcs.next_to(step1_text, DOWN, buff=0.2).align_to(step1_text, LEFT)
-        
         self.play(Write(calc_title), run_time=1)
         self.play(Write(step1_text), run_time=1.5)
         self.wait(0.5)
 
         # Position each calculation line independently
-        step1_calc_x.next_to(step1_text, DOWN, buff=0.2).align_to(step1_text, LEFT)
-        step1_calc_y.next_to(step1_calc_x, DOWN, buff=0.2).align_to(step1_calc_x, LEFT)
+        steps.add_line(step1_calc_x)
+        steps.add_line(step1_calc_y)
 
         # Now show each calculation line one at a time
         self.play(Write(step1_calc_x), run_time=1.5)
@@ -154,13 +228,9 @@ class Clip4RealLifeExample(Scene):
         self.play(Write(step1_calc_y), run_time=1.5)
         self.wait(1.5)  # Pause to understand ȳ
 
-        # Group them now for later reference/movement
-        step1_calcs = VGroup(step1_calc_x, step1_calc_y)
-
         # Step 2 with smaller text
-        step2_text = Text("Step 2: Calculate numerator and denominator").scale(0.55)
-        step2_text_pos = step2_text.copy().next_to(step1_calcs, DOWN, buff=0.4).align_to(step1_text, LEFT)
-        self.play(Write(step2_text_pos), run_time=1)
+        step2_text = steps.push(CachedText("Step 2: Calculate numerator and denominator").scale(0.55))
+        self.play(Write(step2_text), run_time=1)
         self.wait(0.5)  # Pause after title
 
         # Calculate values
@@ -169,30 +239,28 @@ class Clip4RealLifeExample(Scene):
         products = x_minus_mean * y_minus_mean
         x_minus_mean_squared = x_minus_mean ** 2
 
-        numerator = sum(products)
-        denominator = sum(x_minus_mean_squared)
+        numerator = exact_sum(products)
+        denominator = exact_sum(x_minus_mean_squared)
 
         # Split the numerator calculation into parts
-        step2_calc_num_formula = MathTex(
+        step2_calc_num_formula = steps.add_line(MathTex(
             r"\text{Numerator} = \sum (x_i - \bar{x})(y_i - \bar{y})"
-        ).scale(0.48)
-        step2_calc_num_formula.next_to(step2_text_pos, DOWN, buff=0.2).align_to(step2_text_pos, LEFT)
+        ).scale(0.48))
 
-        step2_calc_num_values = MathTex(
-            r"= (2 - 4)(60 - 74.29) + (5 - 4)(85 - 74.29) + \ldots = " + f"{numerator:.2f}"
-        ).scale(0.48)
-        step2_calc_num_values.next_to(step2_calc_num_formula, DOWN, buff=0.1).align_to(step2_calc_num_formula, LEFT)
+        step2_calc_num_values = steps.add_line(MathTex(
+            r"= " + " + ".join(
+                f"({x} - {format_inline(x_mean)})({y} - {format_inline(y_mean)})" for x, y in data[:2]
+            ) + r" + \ldots = " + f"{numerator:.2f}"
+        ).scale(0.48), buff=0.1)
 
         # Split the denominator calculation into parts
-        step2_calc_den_formula = MathTex(
+        step2_calc_den_formula = steps.add_line(MathTex(
             r"\text{Denominator} = \sum (x_i - \bar{x})^2"
-        ).scale(0.48)
-        step2_calc_den_formula.next_to(step2_calc_num_values, DOWN, buff=0.2).align_to(step2_calc_num_formula, LEFT)
+        ).scale(0.48))
 
-        step2_calc_den_values = MathTex(
-            r"= (2 - 4)^2 + (5 - 4)^2 + \ldots = " + f"{denominator:.2f}"
-        ).scale(0.48)
-        step2_calc_den_values.next_to(step2_calc_den_formula, DOWN, buff=0.1).align_to(step2_calc_den_formula, LEFT)
+        step2_calc_den_values = steps.add_line(MathTex(
+            r"= " + " + ".join(f"({x} - {format_inline(x_mean)})^2" for x, _ in data[:2]) + r" + \ldots = " + f"{denominator:.2f}"
+        ).scale(0.48), buff=0.1)
 
         # Play each line one at a time
         self.play(Write(step2_calc_num_formula), run_time=1.5)
@@ -205,65 +273,35 @@ class Clip4RealLifeExample(Scene):
         self.play(Write(step2_calc_den_values), run_time=1.5)
         self.wait(1.5)  # Longer pause to understand denominator
 
-        # Group for transitions
-        step2_calcs_pos = VGroup(step2_calc_num_formula, step2_calc_num_values, step2_calc_den_formula, step2_calc_den_values)
-
         # Now REMOVE Step 1 and move Step 2 up to Step 1's position
-        step2_text.next_to(calc_title, DOWN, buff=0.3).align_to(calc_title, LEFT)
-
-        # Need to recreate these in their proper positions for the transition
-        step2_calc_num = VGroup(
-            MathTex(r"\text{Numerator} = \sum (x_i - \bar{x})(y_i - \bar{y})").scale(0.48),
-            MathTex(r"= (2 - 4)(60 - 74.29) + (5 - 4)(85 - 74.29) + \ldots = " + f"{numerator:.2f}").scale(0.48)
-        ).arrange(DOWN, aligned_edge=LEFT, buff=0.1)
-
-        step2_calc_den = VGroup(
-            MathTex(r"\text{Denominator} = \sum (x_i - \bar{x})^2").scale(0.48),
-            MathTex(r"= (2 - 4)^2 + (5 - 4)^2 + \ldots = " + f"{denominator:.2f}").scale(0.48)
-        ).arrange(DOWN, aligned_edge=LEFT, buff=0.1)
-
-        step2_calcs = VGroup(step2_calc_num, step2_calc_den).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
-        step2_calcs.next_to(step2_text, DOWN, buff=0.2).align_to(step2_text, LEFT)
-
-        self.play(
-            FadeOut(step1_text), 
-            FadeOut(step1_calcs),
-            ReplacementTransform(step2_text_pos, step2_text),
-            ReplacementTransform(step2_calcs_pos, step2_calcs),
-            run_time=1.5
-        )
+        self.play(*steps.pop(), run_time=1.5)
         self.wait(1)
 
         # Step 3: Calculate slope and intercept - line by line
         m_value = numerator / denominator
         b_value = y_mean - m_value * x_mean
 
-        step3_text = Text("Step 3: Calculate slope and intercept").scale(0.55)
-        step3_text_pos = step3_text.copy().next_to(step2_calcs, DOWN, buff=0.4).align_to(step2_text, LEFT)
-        self.play(Write(step3_text_pos), run_time=1)
+        step3_text = steps.push(CachedText("Step 3: Calculate slope and intercept").scale(0.55))
+        self.play(Write(step3_text), run_time=1)
         self.wait(0.5)  # Pause after title
 
         # Slope calculation line by line
-        step3_calc_m_formula = MathTex(
+        step3_calc_m_formula = steps.add_line(MathTex(
             r"\hat{m} = \frac{\text{Numerator}}{\text{Denominator}}"
-        ).scale(0.5)
-        step3_calc_m_formula.next_to(step3_text_pos, DOWN, buff=0.2).align_to(step3_text_pos, LEFT)
+        ).scale(0.5))
 
-        step3_calc_m_values = MathTex(
+        step3_calc_m_values = steps.add_line(MathTex(
             r"= \frac{" + f"{numerator:.2f}" + "}{" + f"{denominator:.2f}" + "} = " + f"{m_value:.2f}"
-        ).scale(0.5)
-        step3_calc_m_values.next_to(step3_calc_m_formula, DOWN, buff=0.1).align_to(step3_calc_m_formula, LEFT)
+        ).scale(0.5), buff=0.1)
 
         # Intercept calculation line by line
-        step3_calc_b_formula = MathTex(
+        step3_calc_b_formula = steps.add_line(MathTex(
             r"\hat{b} = \bar{y} - \hat{m} \cdot \bar{x}"
-        ).scale(0.5)
-        step3_calc_b_formula.next_to(step3_calc_m_values, DOWN, buff=0.2).align_to(step3_calc_m_formula, LEFT)
+        ).scale(0.5))
 
-        step3_calc_b_values = MathTex(
+        step3_calc_b_values = steps.add_line(MathTex(
             r"= " + f"{y_mean:.2f} - {m_value:.2f} \cdot {x_mean:.2f} = " + f"{b_value:.2f}"
-        ).scale(0.5)
-        step3_calc_b_values.next_to(step3_calc_b_formula, DOWN, buff=0.1).align_to(step3_calc_b_formula, LEFT)
+        ).scale(0.5), buff=0.1)
 
         # Play each line one at a time
         self.play(Write(step3_calc_m_formula), run_time=1.5)
@@ -276,47 +314,18 @@ class Clip4RealLifeExample(Scene):
         self.play(Write(step3_calc_b_values), run_time=1.5)
         self.wait(1.5)  # Longer pause for intercept
 
-        # Group for transitions
-        step3_calcs_pos = VGroup(step3_calc_m_formula, step3_calc_m_values, step3_calc_b_formula, step3_calc_b_values)
-
         # Now REMOVE Step 2 and move Step 3 up to Step 2's position
-        step3_text.next_to(calc_title, DOWN, buff=0.3).align_to(calc_title, LEFT)
-
-        # Need to recreate these in their proper positions for the transition
-        step3_calc_m = VGroup(
-            MathTex(r"\hat{m} = \frac{\text{Numerator}}{\text{Denominator}}").scale(0.5),
-            MathTex(r"= \frac{" + f"{numerator:.2f}" + "}{" + f"{denominator:.2f}" + "} = " + f"{m_value:.2f}").scale(0.5)
-        ).arrange(DOWN, aligned_edge=LEFT, buff=0.1)
-
-        step3_calc_b = VGroup(
-            MathTex(r"\hat{b} = \bar{y} - \hat{m} \cdot \bar{x}").scale(0.5),
-            MathTex(r"= " + f"{y_mean:.2f} - {m_value:.2f} \cdot {x_mean:.2f} = " + f"{b_value:.2f}").scale(0.5)
-        ).arrange(DOWN, aligned_edge=LEFT, buff=0.1)
-
-        step3_calcs = VGroup(step3_calc_m, step3_calc_b).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
-        step3_calcs.next_to(step3_text, DOWN, buff=0.2).align_to(step3_text, LEFT)
-
-        self.play(
-            FadeOut(step2_text), 
-            FadeOut(step2_calcs),
-            ReplacementTransform(step3_text_pos, step3_text),
-            ReplacementTransform(step3_calcs_pos, step3_calcs),
-            run_time=1.5
-        )
+        self.play(*steps.pop(), run_time=1.5)
         self.wait(1)
 
         # Step 4: Final equation
-        step4_text = Text("Step 4: Write the regression equation").scale(0.55)
-        step4_text_pos = step4_text.copy().next_to(step3_calcs, DOWN, buff=0.4).align_to(step3_text, LEFT)
-        self.play(Write(step4_text_pos), run_time=1)
+        step4_text = steps.push(CachedText("Step 4: Write the regression equation").scale(0.55))
+        self.play(Write(step4_text), run_time=1)
         self.wait(0.5)  # Pause after title
 
         # Show equation step by step
-        step4_equation_formula = MathTex(r"\hat{y} = \hat{m}x + \hat{b}").scale(0.6)
-        step4_equation_formula.next_to(step4_text_pos, DOWN, buff=0.2)
-
-        step4_equation_values = MathTex(r"= " + f"{m_value:.2f}x + {b_value:.2f}").scale(0.6)
-        step4_equation_values.next_to(step4_equation_formula, DOWN, buff=0.1).align_to(step4_equation_formula, LEFT)
+        step4_equation_formula = steps.add_line(MathTex(r"\hat{y} = \hat{m}x + \hat{b}").scale(0.6), aligned=False)
+        step4_equation_values = steps.add_line(MathTex(r"= " + f"{m_value:.2f}x + {b_value:.2f}").scale(0.6), buff=0.1)
 
         # Play each line
         self.play(Write(step4_equation_formula), run_time=1.5)
@@ -324,40 +333,19 @@ class Clip4RealLifeExample(Scene):
         self.play(Write(step4_equation_values), run_time=1.5)
         self.wait(1.5)  # Longer pause for final equation
 
-        # Group for transitions
-        step4_equation_pos = VGroup(step4_equation_formula, step4_equation_values)
-
-        # Now REMOVE Step 3 and move Step 4 up to Step 3's position
-        step4_text.next_to(calc_title, DOWN, buff=0.3).align_to(calc_title, LEFT)
-
-        # Create the combined equation for the transition
-        step4_equation = MathTex(r"\hat{y} = \hat{m}x + \hat{b} = " + f"{m_value:.2f}x + {b_value:.2f}").scale(0.6)
-        step4_equation.next_to(step4_text, DOWN, buff=0.2)
-
-        self.play(
-            FadeOut(step3_text), 
-            FadeOut(step3_calcs),
-            ReplacementTransform(step4_text_pos, step4_text),
-            ReplacementTransform(step4_equation_pos, step4_equation),
-            run_time=1.5
-        )
+        # Now REMOVE Step 3 and move Step 4 up to Step 3's position,
+        # joining the two equation lines into one as it moves
+        steps.join_lines(step4_equation_formula, step4_equation_values)
+        self.play(*steps.pop(), run_time=1.5)
         self.wait(2)
         
         # 8. TRANSITION: Remove table, add graph on left
         # Prepare the graph for the left side - MAKE SMALLER AND MORE LEFT
-        left_axes = Axes(
-            x_range=[0, 8, 1],
-            y_range=[50, 100, 10],
-            x_length=4.5,  # Even smaller
-            y_length=4,
-            axis_config={"include_numbers": True, "include_tip": False},
-            x_axis_config={"numbers_to_include": np.arange(1, 8, 1)},
-            y_axis_config={"numbers_to_include": np.arange(50, 101, 10)},
-        )
+        left_axes = static["left_axes"]
 
         left_axes_labels = left_axes.get_axis_labels(
-            x_label=Tex("Days Studying (X)").scale(0.6),
-            y_label=Tex("Exam Grade (Y)").scale(0.6)
+            x_label=static["left_axes_label_texts"][0],
+            y_label=static["left_axes_label_texts"][1]
         )
         
         left_axes_group = VGroup(left_axes, left_axes_labels)
@@ -365,10 +353,7 @@ class Clip4RealLifeExample(Scene):
         left_axes_group.center().shift(DOWN*0.3 + LEFT*3.0)  # Changed from LEFT*4.0 to LEFT*3.0
         
         # Create dots for the left graph
-        left_dots = VGroup()
-        for x_val, y_val in data_points_num:
-            dot = Dot(point=left_axes.c2p(x_val, y_val), color=YELLOW)
-            left_dots.add(dot)
+        left_dots = HomogeneousGroup(Dot(color=YELLOW), [left_axes.c2p(x_val, y_val) for x_val, y_val in data_points_num])
         
         # Place the final equation near the x-axis label with color
         final_equation = MathTex(r"\hat{y} = " + f"{m_value:.2f}x + {b_value:.2f}").scale(0.6).set_color(GREEN)
@@ -378,7 +363,7 @@ class Clip4RealLifeExample(Scene):
         self.play(
             FadeOut(data_table),
             FadeOut(closed_form_group),
-            FadeOut(VGroup(calc_title, step4_text, step4_equation)),
+            FadeOut(VGroup(calc_title, steps.get_group())),
             FadeIn(left_axes_group),
             FadeIn(left_dots),
             Write(final_equation),  # Now just the equation, no title
@@ -387,8 +372,10 @@ class Clip4RealLifeExample(Scene):
         self.wait(1)
 
         # 9. Draw Regression Line on Left Graph
-        regression_line = left_axes.plot(lambda x: m_value * x + b_value, color=GREEN)
-        line_label = Text("Best-Fit Line (OLS)", color=GREEN).scale(0.5)
+        regression_line = left_axes.plot(
+            lambda x: m_value * x + b_value, x_range=line_x_range(m_value, b_value, x_range, y_range), color=GREEN
+        )
+        line_label = CachedText("Best-Fit Line (OLS)", color=GREEN).scale(0.5)
         line_label.next_to(regression_line.point_from_proportion(0.8), UP, buff=0.2)
         
         self.play(
@@ -399,14 +386,16 @@ class Clip4RealLifeExample(Scene):
         self.wait(1.5)
         
         # 10. Interpretation Section on Right Side - POSITION MORE TO LEFT
-        interpret_title = Text("Interpreting the Results:").scale(0.6)
+        interpret_title = CachedText("Interpreting the Results:").scale(0.6)
         interpret_title.to_corner(UR, buff=0.5).shift(LEFT*1.0 + DOWN*1.0)  # Changed from LEFT*0.5 to LEFT*1.0
         
         # Interpretation of slope and intercept - MAKE SHORTER
         slope_meaning = MathTex(r"\hat{m} = " + f"{m_value:.2f}" + r"\text{: Each day } \rightarrow " + f"{m_value:.2f}" + r" \text{ points}").scale(0.45)
         intercept_meaning = MathTex(r"\hat{b} = " + f"{b_value:.2f}" + r"\text{: 0 days } \rightarrow " + f"{b_value:.2f}" + r" \text{ points}").scale(0.45)
-        r_squared = 0.85  # Example value - calculate actual R² if needed
-        r_squared_meaning = MathTex(r"R^2 = " + f"{r_squared:.2f}" + r"\text{: Model explains } " + f"{int(r_squared*100)}\%" + r" \text{ variance}").scale(0.45)
+        # R^2 = 1 - SSR / SST, which for a line fitted by OLS is Sxy^2 / (Sxx Syy)
+        total = exact_sum(y_minus_mean ** 2)
+        r_squared = numerator ** 2 / (denominator * total) if total > 0 else 1.0
+        r_squared_meaning = MathTex(r"R^2 = " + f"{r_squared:.2f}" + r"\text{: Model explains } " + f"{r_squared*100:.0f}\%" + r" \text{ variance}").scale(0.45)
 
         # Position each element individually
         slope_meaning.next_to(interpret_title, DOWN, buff=0.2).align_to(interpret_title, LEFT)
@@ -430,10 +419,12 @@ class Clip4RealLifeExample(Scene):
         self.wait(2)  # Longer pause to understand R² interpretation
 
         # 11. REPLACE with Prediction Example on Right Side - KEEP equation visible
-        prediction_x = 4.5  # Example: 4.5 days of studying
+        prediction_x = self.prediction_x
+        if not x_values.min() <= prediction_x <= x_values.max():
+            prediction_x = round((x_values.min() + x_values.max()) / 2, 1)
         prediction_y = m_value * prediction_x + b_value
         
-        predict_title = Text("Making a Prediction:").scale(0.6)
+        predict_title = CachedText("Making a Prediction:").scale(0.6)
         predict_title.to_corner(UR, buff=0.5).shift(LEFT*1.0 + DOWN*1.0)  # Changed from LEFT*0.5 to LEFT*2.0
         
         # Position each element individually
@@ -449,7 +440,7 @@ class Clip4RealLifeExample(Scene):
         predict_equation_line3 = MathTex(r"= " + f"{prediction_y:.1f}").scale(0.45)
         predict_equation_line3.next_to(predict_equation_line2, DOWN, buff=0.1).align_to(predict_equation_line2, LEFT)
 
-        predict_conclusion = Text(f"Expected Grade: {prediction_y:.1f}", color=RED).scale(0.5)
+        predict_conclusion = CachedText(f"Expected Grade: {prediction_y:.1f}", color=RED).scale(0.5)
         predict_conclusion.next_to(predict_equation_line3, DOWN, buff=0.2).align_to(predict_question, LEFT)
 
         # Group for later reference
@@ -482,12 +473,12 @@ class Clip4RealLifeExample(Scene):
         # Visualize the prediction on the graph
         prediction_dot = Dot(point=left_axes.c2p(prediction_x, prediction_y), color=RED)
         prediction_line_h = DashedLine(
-            left_axes.c2p(0, prediction_y),
+            left_axes.c2p(x_range[0], prediction_y),
             left_axes.c2p(prediction_x, prediction_y),
             color=RED_A
         )
         prediction_line_v = DashedLine(
-            left_axes.c2p(prediction_x, 50),
+            left_axes.c2p(prediction_x, y_range[0]),
             left_axes.c2p(prediction_x, prediction_y),
             color=RED_A
         )
@@ -507,7 +498,7 @@ class Clip4RealLifeExample(Scene):
         # self.wait(1)
         
         # 12. Conclusion
-        conclusion_text = Text("In summary, OLS regression helps us quantify relationships and make predictions.", color=YELLOW).scale(0.6)
+        conclusion_text = CachedText("In summary, OLS regression helps us quantify relationships and make predictions.", color=YELLOW).scale(0.6)
         conclusion_text.to_edge(DOWN, buff=0.5)
         
         # self.play(Write(conclusion_text), run_time=1.5)
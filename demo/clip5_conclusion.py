@@ -1,22 +1,24 @@
 from manim import *
+from glyph_cache import CachedText
+from vfr_holds import VFRHoldsMixin
 
-class Clip5Conclusion(Scene):
+class Clip5Conclusion(VFRHoldsMixin, Scene):
     def construct(self):
         # Title
-        title = Text("Linear Regression: Key Takeaways").scale(1.0)
+        title = CachedText("Linear Regression: Key Takeaways").scale(1.0)
         title.to_edge(UP, buff=0.5)
         
         self.play(Write(title))
         self.wait(1)
         
         # Points to appear one by one
-        point1 = Text("1. Linear regression models the relationship between variables.",
+        point1 = CachedText("1. Linear regression models the relationship between variables.",
                     t2c={"Linear regression": YELLOW}).scale(0.7)
         
-        point2 = Text("2. Best fit line minimizes the sum of squared errors (SSR).",
+        point2 = CachedText("2. Best fit line minimizes the sum of squared errors (SSR).",
                     t2c={"minimizes": YELLOW, "sum of squared errors": YELLOW}).scale(0.7)
         
-        point3 = Text("3. OLS provides closed form solutions for slope and intercept.",
+        point3 = CachedText("3. OLS provides closed form solutions for slope and intercept.",
                     t2c={"closed form solutions": YELLOW}).scale(0.7)
         
         # Arrange points vertically with some space in between
@@ -49,7 +51,7 @@ class Clip5Conclusion(Scene):
         self.wait(3)
         
         # Final thank you message
-        thank_you = Text("Thank you!", color=BLUE).scale(1.2)
+        thank_you = CachedText("Thank you!", color=BLUE).scale(1.2)
         
         self.play(
             FadeOut(points_group),
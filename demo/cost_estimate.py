@@ -0,0 +1,390 @@
+# Predicts how long a render will take before launching it.
+#
+# `estimate` runs a scene's construct with a renderer that neither rasterizes
+# nor encodes. LaTeX that is not in tex_dir yet is counted, not compiled: the
+# scene gets a placeholder SVG of similar width. For every play()/wait() it
+# counts
+#
+#   rasterized frames and the points on screen in them, encoded frames,
+#   updater evaluations (always_redraw and friends), uncached LaTeX compiles
+#   and uncached Text layouts,
+#
+# and multiplies them with per-operation costs from a cost model. The model is
+# fitted by `calibrate`, which renders a scene for real with the same counters
+# plus timers, and is kept per resolution in media_dir/cost_model.json.
+#
+#   python demo/cost_estimate.py calibrate demo/clip5_conclusion.py Clip5Conclusion -q l
+#   python demo/cost_estimate.py estimate demo/full_regression_demo.py FullRegressionDemo -q h
+import argparse
+import importlib.util
+import inspect
+import json
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+from manim import Mobject, config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from memory_report import current_rss
+
+QUALITIES = {"l": "low_quality", "m": "medium_quality", "h": "high_quality", "p": "production_quality", "k": "fourk_quality"}
+
+# Used until `calibrate` has been run at some resolution. Rough 1080p60 figures.
+DEFAULT_MODEL = {
+    "pixels": 1920 * 1080,
+    "raster_frame": 0.004,
+    "raster_kpoint": 0.0004,
+    "encode_frame": 0.003,
+    "tex_compile": 0.6,
+    "text_compile": 0.05,
+    "updater_eval": 0.0005,
+    "play_overhead": 0.02,
+    "rss_base": 250 * 1024**2,
+    "rss_per_kpoint": 2 * 1024,
+}
+
+# Costs that grow with the number of pixels
+PIXEL_BOUND = ("raster_frame", "raster_kpoint", "encode_frame")
+
+
+def _family_kpoints(mobjects):
+    return sum(len(m.points) for mob in mobjects for m in mob.get_family()) / 1000
+
+
+def play_location():
+    frame = inspect.currentframe()
+    while frame is not None:
+        if frame.f_code.co_name == "construct":
+            return f"{Path(frame.f_code.co_filename).stem}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+class OpCounter:
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.counts = Counter()
+        self.seconds = Counter()
+        self.peak_kpoints = 0
+        self._local = threading.local()  # updaters may run on ParallelUpdatersMixin's threads
+        self._placeholders = {}
+        self._placeholder_dir = Path(tempfile.mkdtemp(prefix="cost_estimate_"))
+
+    def snapshot(self):
+        return Counter(self.counts), Counter(self.seconds)
+
+    def since(self, snapshot):
+        counts, seconds = snapshot
+        return dict(self.counts - counts), dict(self.seconds - seconds)
+
+    def install(self):
+        import manimpango
+        from manim.mobject.text import tex_mobject
+        from manim.utils.tex_file_writing import generate_tex_file
+
+        counter = self
+        compile_tex, text2svg, update = tex_mobject.tex_to_svg_file, manimpango.text2svg, Mobject.update
+
+        def tex_to_svg_file(expression, environment=None, tex_template=None):
+            svg_file = Path(generate_tex_file(expression, environment, tex_template or config.tex_template)).with_suffix(".svg")
+            if svg_file.exists():
+                return svg_file
+            if counter.dry_run:
+                return counter._placeholder(expression, environment)
+            with counter.timed("tex_compile"):
+                return compile_tex(expression, environment=environment, tex_template=tex_template)
+
+        def text_to_svg(*args, **kwargs):
+            # Only reached when Text finds no SVG in text_dir
+            with counter.timed("text_compile"):
+                return text2svg(*args, **kwargs)
+
+        def update_mobject(mob, dt=0, recursive=True):
+            if getattr(counter._local, "inside", False) or mob.updating_suspended or not mob.get_family_updaters():
+                return update(mob, dt, recursive)
+            counter.counts["updater_eval"] += len(mob.get_family_updaters())
+            counter._local.inside = True
+            nested = counter.seconds["tex_compile"] + counter.seconds["text_compile"]
+            start = time.perf_counter()
+            try:
+                return update(mob, dt, recursive)
+            finally:
+                counter._local.inside = False
+                nested = counter.seconds["tex_compile"] + counter.seconds["text_compile"] - nested
+                counter.seconds["updater_eval"] += time.perf_counter() - start - nested
+
+        tex_mobject.tex_to_svg_file, manimpango.text2svg, Mobject.update = tex_to_svg_file, text_to_svg, update_mobject
+        self._restore = lambda: (
+            setattr(tex_mobject, "tex_to_svg_file", compile_tex),
+            setattr(manimpango, "text2svg", text2svg),
+            setattr(Mobject, "update", update),
+        )
+
+    def uninstall(self):
+        self._restore()
+
+    def timed(self, name):
+        counter = self
+
+        class _Timer:
+            def __enter__(self):
+                counter.counts[name] += 1
+                self.start = time.perf_counter()
+
+            def __exit__(self, *exc):
+                counter.seconds[name] += time.perf_counter() - self.start
+
+        return _Timer()
+
+    # A box about as wide as the formula, so layout code keeps working
+    def _placeholder(self, expression, environment):
+        key = (expression, environment)
+        if key not in self._placeholders:
+            self.counts["tex_compile"] += 1
+            width = max(4, 5 * len(expression.split()) + len(expression))
+            path = self._placeholder_dir / f"{len(self._placeholders)}.svg"
+            path.write_text(
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}pt" height="10pt" viewBox="0 0 {width} 10">'
+                f'<path d="M0 0 H{width} V10 H0 Z"/></svg>'
+            )
+            self._placeholders[key] = path
+        return self._placeholders[key]
+
+    def add_frame_load(self, kpoints):
+        self.counts["raster_frame"] += 1
+        self.counts["raster_kpoint"] += kpoints
+        self.peak_kpoints = max(self.peak_kpoints, kpoints)
+
+
+class _PlayRecorderMixin:
+    def __init__(self, counter, **kwargs):
+        self.counter = counter
+        self.play_records = []
+        super().__init__(**kwargs)
+
+    def play(self, scene, *args, **kwargs):
+        snapshot, start = self.counter.snapshot(), time.perf_counter()
+        super().play(scene, *args, **kwargs)
+        counts, seconds = self.counter.since(snapshot)
+        self.play_records.append({
+            "location": play_location(),
+            "counts": counts,
+            "seconds": seconds,
+            "wall": time.perf_counter() - start,
+        })
+
+    def _moving(self, scene, mobjects):
+        return scene.mobjects if mobjects is None else mobjects
+
+
+class DryRunRenderer(_PlayRecorderMixin, CairoRenderer):
+    def update_frame(self, scene, mobjects=None, *args, **kwargs):
+        self.counter.add_frame_load(_family_kpoints(self._moving(scene, mobjects)))
+
+    def get_frame(self):
+        return None
+
+    def add_frame(self, frame, num_frames=1):
+        if self.skip_animations:
+            return
+        self.time += num_frames / self.camera.frame_rate
+        self.counter.counts["encode_frame"] += num_frames
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+
+
+class TimedRenderer(_PlayRecorderMixin, CairoRenderer):
+    def update_frame(self, scene, mobjects=None, *args, **kwargs):
+        start = time.perf_counter()
+        super().update_frame(scene, mobjects, *args, **kwargs)
+        self.counter.seconds["raster_frame"] += time.perf_counter() - start
+        self.counter.add_frame_load(_family_kpoints(self._moving(scene, mobjects)))
+
+    def add_frame(self, frame, num_frames=1):
+        start = time.perf_counter()
+        super().add_frame(frame, num_frames)
+        if not self.skip_animations:
+            self.counter.seconds["encode_frame"] += time.perf_counter() - start
+            self.counter.counts["encode_frame"] += num_frames
+
+
+def load_scene_class(path, name):
+    path = Path(path).resolve()
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+def run_scene(scene_class, renderer_class, quality, overrides=None):
+    counter = OpCounter(dry_run=renderer_class is DryRunRenderer)
+    settings = {"quality": quality, "progress_bar": "none", "preview": False, **(overrides or {})}
+    with tempconfig(settings):
+        counter.install()
+        rss_before, start = current_rss(), time.perf_counter()
+        try:
+            renderer = renderer_class(counter)
+            scene = scene_class(renderer=renderer)
+            scene.render()
+        finally:
+            counter.uninstall()
+        run = {
+            "key": model_key(),
+            "pixels": config.pixel_width * config.pixel_height,
+            "frame_bytes": config.pixel_width * config.pixel_height * 4,
+            "wall": time.perf_counter() - start,
+            "rss_before": rss_before,
+            "rss_after": current_rss(),
+            "peak_kpoints": counter.peak_kpoints,
+            "plays": renderer.play_records,
+        }
+    return run
+
+
+def dry_run(scene_class, quality):
+    return run_scene(scene_class, DryRunRenderer, quality, {
+        "disable_caching": True, "write_to_movie": False, "save_last_frame": False,
+    })
+
+
+def model_key():
+    return f"{config.pixel_width}x{config.pixel_height}@{config.frame_rate:g}"
+
+
+def model_path():
+    return Path(config.media_dir) / "cost_model.json"
+
+
+def load_models():
+    try:
+        return json.loads(model_path().read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+# Per-operation costs from a real, timed run
+def fit_model(run):
+    plays = run["plays"]
+    totals, seconds = Counter(), Counter()
+    for play in plays:
+        totals.update(play["counts"])
+        seconds.update(play["seconds"])
+    model = dict(DEFAULT_MODEL, pixels=run["pixels"])
+    for name in ("encode_frame", "tex_compile", "text_compile", "updater_eval"):
+        if totals[name]:
+            model[name] = seconds[name] / totals[name]
+    # Raster time per play ~ frames * raster_frame + kpoints * raster_kpoint
+    rows = [(p["counts"].get("raster_frame", 0), p["counts"].get("raster_kpoint", 0), p["seconds"].get("raster_frame", 0)) for p in plays]
+    rows = np.array([r for r in rows if r[0]], dtype=float)
+    if len(rows) >= 2:
+        (per_frame, per_kpoint), *_ = np.linalg.lstsq(rows[:, :2], rows[:, 2], rcond=None)
+        model["raster_frame"], model["raster_kpoint"] = max(per_frame, 0.0), max(per_kpoint, 0.0)
+    elif len(rows):
+        model["raster_frame"], model["raster_kpoint"] = rows[0, 2] / rows[0, 0], 0.0
+    measured = sum(seconds.values())
+    model["play_overhead"] = max(0.0, (sum(p["wall"] for p in plays) - measured) / max(1, len(plays)))
+    model["rss_base"] = run["rss_before"]
+    if run["peak_kpoints"]:
+        model["rss_per_kpoint"] = max(0, run["rss_after"] - run["rss_before"] - 3 * run["frame_bytes"]) / run["peak_kpoints"]
+    return model
+
+
+def pick_model(models, key, pixels):
+    if key in models:
+        return models[key]
+    # Nearest calibrated resolution, pixel-bound costs scaled to this one
+    base = min(models.values(), key=lambda m: abs(m["pixels"] - pixels), default=DEFAULT_MODEL)
+    model = dict(base, pixels=pixels)
+    for name in PIXEL_BOUND:
+        model[name] = base[name] * pixels / base["pixels"]
+    return model
+
+
+def predict_play(play, model):
+    counts = play["counts"]
+    costs = {name: counts.get(name, 0) * model[name] for name in (
+        "raster_frame", "raster_kpoint", "encode_frame", "tex_compile", "text_compile", "updater_eval")}
+    costs["play_overhead"] = model["play_overhead"]
+    return costs
+
+
+def estimate(scene_class, quality, top=10):
+    run = dry_run(scene_class, quality)
+    model = pick_model(load_models(), run["key"], run["pixels"])
+    by_location, by_clip = defaultdict(float), defaultdict(float)
+    predictions = []
+    for play in run["plays"]:
+        costs = predict_play(play, model)
+        seconds = sum(costs.values())
+        predictions.append((seconds, play, costs))
+        by_location[play["location"]] += seconds
+        by_clip[play["location"].split(":")[0]] += seconds
+    peak_rss = model["rss_base"] + model["rss_per_kpoint"] * run["peak_kpoints"] + 3 * run["frame_bytes"]
+    return {
+        "run": run,
+        "total_seconds": sum(p[0] for p in predictions),
+        "peak_rss": peak_rss,
+        "by_clip": dict(by_clip),
+        "hotspots": sorted(by_location.items(), key=lambda item: -item[1])[:top],
+        "predictions": predictions,
+    }
+
+
+def calibrate(scene_class, quality):
+    run = run_scene(scene_class, TimedRenderer, quality, {"disable_caching": True})
+    models = load_models()
+    models[run["key"]] = fit_model(run)
+    model_path().parent.mkdir(parents=True, exist_ok=True)
+    model_path().write_text(json.dumps(models, indent=1))
+    return run["key"], models[run["key"]], run["wall"]
+
+
+def print_report(report):
+    run = report["run"]
+    frames = sum(p["counts"].get("encode_frame", 0) for p in run["plays"])
+    totals = Counter()
+    for play in run["plays"]:
+        totals.update(play["counts"])
+    print(f"dry run: {run['wall']:.1f}s, {len(run['plays'])} plays, {frames} frames at {run['key']}")
+    print(f"  updater evaluations {totals['updater_eval']}, uncached tex {totals['tex_compile']}, "
+          f"uncached text {totals['text_compile']}")
+    print(f"predicted wall time {report['total_seconds'] / 60:.1f} min, peak memory {report['peak_rss'] / 1024**2:.0f} MiB")
+    print("by clip:")
+    for clip, seconds in sorted(report["by_clip"].items(), key=lambda item: -item[1]):
+        print(f"  {clip:<32} {seconds:8.1f}s")
+    print("most expensive plays:")
+    for location, seconds in report["hotspots"]:
+        print(f"  {location:<32} {seconds:8.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict render wall time and peak memory from a dry run")
+    parser.add_argument("command", choices=["estimate", "calibrate"])
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", default="h", choices=sorted(QUALITIES))
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    scene_class = load_scene_class(args.file, args.scene)
+    if args.command == "calibrate":
+        key, model, wall = calibrate(scene_class, QUALITIES[args.quality])
+        print(f"calibrated {key} from a {wall:.1f}s render:")
+        for name, value in model.items():
+            print(f"  {name:<16} {value:.6g}")
+    else:
+        print_report(estimate(scene_class, QUALITIES[args.quality], args.top))
+
+
+if __name__ == "__main__":
+    main()
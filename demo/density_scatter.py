@@ -0,0 +1,165 @@
+from manim import *
+import math
+
+import numpy as np
+
+# Scatter plots of millions of points as one density image.
+#
+# One Dot per observation makes every frame cost O(n) mobjects. Here the
+# points are counted into a bins[0] x bins[1] grid over the axes' ranges in a
+# single bincount pass (chunk by chunk for .npy files opened as memmaps), and
+# the grid becomes the pixel array of one ImageMobject stretched over the
+# axes, so drawing it costs the same for 10 points or 10^8. Grids are cached
+# per resolution: switching bins, or animating between them with
+# ChangeResolution, bins the data once per resolution and never per frame.
+#
+#   density = DensityScatter(axes, x, y, bins=(64, 48))
+#   density = DensityScatter.from_npy(axes, "points.npy")  # (n, 2) float array
+#   self.play(ChangeResolution(density, (16, 12)))
+#   self.play(FadeIn(density.residual_overlay(m, b)))
+
+CHUNK_ROWS = 1 << 20  # rows binned at a time from a memmap
+MAX_BLEND_PIXELS = 1 << 22  # common grid size for resolution blends
+
+
+# Counts per cell, rows from the bottom of the y range, plus the per-cell sums
+# of the residuals y - (m x + b) when line=(m, b) is given
+def bin_points(x, y, bins, x_range, y_range, line=None):
+    cols, rows = bins
+    ix = np.floor((x - x_range[0]) * (cols / (x_range[1] - x_range[0]))).astype(np.intp)
+    iy = np.floor((y - y_range[0]) * (rows / (y_range[1] - y_range[0]))).astype(np.intp)
+    inside = (ix >= 0) & (ix < cols) & (iy >= 0) & (iy < rows)
+    cells = iy[inside] * cols + ix[inside]
+    counts = np.bincount(cells, minlength=rows * cols).reshape(rows, cols)
+    if line is None:
+        return counts, None
+    residuals = y[inside] - (line[0] * x[inside] + line[1])
+    sums = np.bincount(cells, weights=residuals, minlength=rows * cols).reshape(rows, cols)
+    return counts, sums
+
+
+class DensitySource:
+    def __init__(self, x=None, y=None, path=None, chunk_rows=CHUNK_ROWS):
+        self.x, self.y = x, y
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._grids = {}
+
+    def chunks(self):
+        if self.path is None:
+            yield np.asarray(self.x, dtype=float), np.asarray(self.y, dtype=float)
+            return
+        points = np.load(self.path, mmap_mode="r")
+        for start in range(0, len(points), self.chunk_rows):
+            chunk = np.asarray(points[start : start + self.chunk_rows], dtype=float)
+            yield chunk[:, 0], chunk[:, 1]
+
+    def grid(self, bins, x_range, y_range, line=None):
+        key = (tuple(bins), tuple(x_range), tuple(y_range), line)
+        if key not in self._grids:
+            counts, sums = 0, None
+            for x, y in self.chunks():
+                chunk_counts, chunk_sums = bin_points(x, y, bins, x_range, y_range, line)
+                counts = counts + chunk_counts
+                if chunk_sums is not None:
+                    sums = chunk_sums if sums is None else sums + chunk_sums
+            self._grids[key] = counts, sums
+        return self._grids[key]
+
+    # Mobject copies (FadeIn, Transform, ...) share the data and its grids
+    def __deepcopy__(self, memo):
+        return self
+
+
+def density_rgba(counts, color=YELLOW):
+    rgba = np.zeros((*counts.shape, 4), dtype=np.uint8)
+    rgba[..., :3] = np.array(color_to_rgb(color)) * 255
+    peak = counts.max()
+    if peak > 0:
+        # Log scale, so a few dense cells do not wash out the rest
+        rgba[..., 3] = np.log1p(counts) / np.log1p(peak) * 255
+    return rgba[::-1]  # image rows run from the top
+
+
+# Mean residual per cell: red above the line, blue below
+def residual_rgba(counts, sums, positive=RED, negative=BLUE):
+    means = np.divide(sums, counts, out=np.zeros(counts.shape), where=counts > 0)
+    scale = np.abs(means).max() or 1.0
+    rgba = np.zeros((*counts.shape, 4), dtype=np.uint8)
+    colors = np.where(means[..., None] >= 0, color_to_rgb(positive), color_to_rgb(negative))
+    rgba[..., :3] = colors * 255
+    rgba[..., 3] = np.abs(means) / scale * 220
+    return rgba[::-1]
+
+
+class DensityScatter(ImageMobject):
+    def __init__(self, axes, x=None, y=None, bins=(64, 48), x_range=None, y_range=None, color=YELLOW,
+                 source=None, line=None, **kwargs):
+        self.source = source if source is not None else DensitySource(x, y)
+        self.x_range = tuple(x_range or axes.x_range[:2])
+        self.y_range = tuple(y_range or axes.y_range[:2])
+        self.bins = tuple(bins)
+        self.density_color = color
+        self.line = line  # (m, b): show mean residuals instead of counts
+        super().__init__(self.render_pixels(self.bins), **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        # Stretch the image over the binned rectangle of the axes
+        lower_left = axes.c2p(self.x_range[0], self.y_range[0])
+        upper_right = axes.c2p(self.x_range[1], self.y_range[1])
+        self.stretch_to_fit_width(upper_right[0] - lower_left[0])
+        self.stretch_to_fit_height(upper_right[1] - lower_left[1])
+        self.move_to((lower_left + upper_right) / 2)
+
+    @classmethod
+    def from_npy(cls, axes, path, chunk_rows=CHUNK_ROWS, **kwargs):
+        return cls(axes, source=DensitySource(path=path, chunk_rows=chunk_rows), **kwargs)
+
+    def render_pixels(self, bins):
+        counts, sums = self.source.grid(bins, self.x_range, self.y_range, self.line)
+        if self.line is None:
+            return density_rgba(counts, self.density_color)
+        return residual_rgba(counts, sums)
+
+    def set_bins(self, bins):
+        self.bins = tuple(bins)
+        self.pixel_array = self.render_pixels(self.bins)
+        return self
+
+    # Mean residual of each cell from the line y = m x + b, same cells as this one
+    def residual_overlay(self, m, b):
+        overlay = self.copy()
+        overlay.line = (m, b)
+        return overlay.set_bins(self.bins)
+
+
+def _upsample(pixels, shape):
+    rows = np.arange(shape[0]) * pixels.shape[0] // shape[0]
+    cols = np.arange(shape[1]) * pixels.shape[1] // shape[1]
+    return pixels[np.ix_(rows, cols)]
+
+
+# Cross-fade between two bin resolutions. Both images are brought to a common
+# grid (the least common multiple of the sizes where that stays small), so a
+# coarse cell fades into exactly the fine cells it covers.
+class ChangeResolution(Animation):
+    def __init__(self, density, bins, **kwargs):
+        self.new_bins = tuple(bins)
+        super().__init__(density, **kwargs)
+
+    def begin(self):
+        start, end = self.mobject.pixel_array, self.mobject.render_pixels(self.new_bins)
+        shape = [math.lcm(a, b) for a, b in zip(start.shape[:2], end.shape[:2])]
+        if shape[0] * shape[1] > MAX_BLEND_PIXELS:
+            shape = [max(a, b) for a, b in zip(start.shape[:2], end.shape[:2])]
+        self.start_pixels = _upsample(start, shape).astype(float)
+        self.end_pixels = _upsample(end, shape).astype(float)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        blended = (1 - alpha) * self.start_pixels + alpha * self.end_pixels
+        self.mobject.pixel_array = blended.astype(np.uint8)
+
+    def finish(self):
+        super().finish()
+        self.mobject.set_bins(self.new_bins)
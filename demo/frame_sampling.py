@@ -0,0 +1,381 @@
+# Golden-frame regression check for the lecture scenes.
+#
+# Every scene is rendered at 320x180 by a renderer that rasterizes only a
+# fixed sample of frames: the first frame of each play()/wait(), a few evenly
+# spaced ones in between and the state after the play has finished. Nothing is
+# encoded. Each sample is reduced to a perceptual signature (a gradient hash of
+# the luminance plus a coarse color grid) and compared with the goldens in
+# demo/golden_frames.json within a tolerance, so antialiasing noise passes
+# but a moved square, a different line color or a reflowed table does not.
+#
+#   python demo/frame_sampling.py check                 # all scenes
+#   python demo/frame_sampling.py check Clip2OLSIntuition
+#   python demo/frame_sampling.py check --update        # accept the current picture
+#   python demo/frame_sampling.py check --update --baseline 7daab46
+#
+# A scene without goldens fails the check; --update stores them, and the
+# resulting golden_frames.json is meant to be committed with the change. With
+# --baseline the goldens come from the scene files as they were at that commit
+# (scenes that did not exist yet are sampled from the working tree), so
+# changes meant to keep the picture are checked against the picture from before
+# them. Those goldens carry no scene-inputs digest, and only frames are compared.
+# The check pins SAMPLE_SCENE_ATTRIBUTES, e.g. a small dataset for the
+# 10^6-point clips, so a run over all scenes stays around a minute.
+# Mismatching frames are saved as PNGs under media_dir/golden_diffs.
+# FullRegressionDemo is not sampled on its own, it only replays the clips.
+#
+# `seek` renders a single moment, or a time range, at full quality. Plays that
+# end before it are fast-forwarded (construct runs, every animation jumps to
+# its final state, nothing is rasterized) and rendering stops after it:
+#
+#   python demo/frame_sampling.py seek Clip2OLSIntuition 62.5
+#   python demo/frame_sampling.py seek Clip2OLSIntuition 60 --to 64 -q m
+#   python demo/frame_sampling.py seek Clip2OLSIntuition --timeline
+import argparse
+import json
+import math
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+from manim import config, tempconfig
+from manim.utils.exceptions import EndSceneEarlyException
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from cost_estimate import QUALITIES, load_scene_class, play_location
+from render_farm import REPO_ROOT, SCENE_FILES
+from scene_inputs import scene_inputs_digest
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "golden_frames.json"
+SAMPLED_SCENES = [name for name in SCENE_FILES if name != "FullRegressionDemo"]
+
+SAMPLE_CONFIG = {
+    "pixel_width": 320,
+    "pixel_height": 180,
+    "frame_rate": 15,
+    "write_to_movie": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+    "progress_bar": "none",
+    "preview": False,
+}
+
+# Class attributes set for sampling, so large precomputes stay small
+SAMPLE_SCENE_ATTRIBUTES = {
+    "Clip3GradientDescent": {"n_points": 10_000},
+    "Clip4DensityExample": {"points": 10_000, "data_path": None},
+}
+
+HASH_SIZE = 16  # 16x16 gradient bits
+COLOR_GRID = 4  # 4x4 cells of mean color, 16 levels per channel
+HASH_TOLERANCE = 6  # differing gradient bits
+COLOR_TOLERANCE = 1  # levels per channel and cell
+
+
+def _block_means(image, rows, cols):
+    # Mean over a rows x cols grid of (nearly) equal blocks
+    row_edges = np.linspace(0, image.shape[0], rows + 1).astype(int)
+    col_edges = np.linspace(0, image.shape[1], cols + 1).astype(int)
+    sums = np.add.reduceat(np.add.reduceat(image, row_edges[:-1], axis=0), col_edges[:-1], axis=1)
+    counts = np.outer(np.diff(row_edges), np.diff(col_edges))
+    return sums / counts.reshape(counts.shape + (1,) * (image.ndim - 2))
+
+
+def frame_signature(frame):
+    rgb = frame[..., :3].astype(float)
+    luminance = rgb @ np.array([0.299, 0.587, 0.114])
+    grid = _block_means(luminance, HASH_SIZE, HASH_SIZE + 1)
+    bits = (grid[:, 1:] > grid[:, :-1]).ravel()
+    colors = np.clip(_block_means(rgb, COLOR_GRID, COLOR_GRID) // 16, 0, 15).astype(int)
+    return {
+        "dhash": f"{int(''.join('1' if b else '0' for b in bits), 2):0{bits.size // 4}x}",
+        "colors": "".join(f"{level:x}" for level in colors.ravel()),
+    }
+
+
+def signature_distance(a, b):
+    hash_bits = bin(int(a["dhash"], 16) ^ int(b["dhash"], 16)).count("1")
+    color_levels = max(abs(int(x, 16) - int(y, 16)) for x, y in zip(a["colors"], b["colors"]))
+    return hash_bits, color_levels
+
+
+def signatures_match(a, b):
+    hash_bits, color_levels = signature_distance(a, b)
+    return hash_bits <= HASH_TOLERANCE and color_levels <= COLOR_TOLERANCE
+
+
+class SamplingRenderer(CairoRenderer):
+    sample_play_ends = True
+
+    def __init__(self, samples_per_play=3, **kwargs):
+        super().__init__(**kwargs)
+        self.samples_per_play = samples_per_play
+        self.samples = []  # dicts with play, tag, time, frame
+
+    def sample(self, tag, play=None):
+        play = self.num_plays if play is None else play
+        self.samples.append({"play": play, "tag": tag, "time": round(self.time, 4), "frame": self.get_frame().copy()})
+
+    def play(self, scene, *args, **kwargs):
+        self._frame_index = 0
+        play_index = self.num_plays
+        super().play(scene, *args, **kwargs)
+        if self.sample_play_ends and not self.skip_animations:
+            # State after the animations finished (the next play's start point)
+            self.update_frame(scene)
+            self.sample("end", play=play_index)
+
+    def _sample_indices(self, scene):
+        n = max(1, math.ceil(scene.duration * self.camera.frame_rate))
+        return {0} | {round(n * k / (self.samples_per_play + 1)) for k in range(1, self.samples_per_play + 1)}
+
+    # index is None for a static hold, which is always sampled
+    def wants_frame(self, scene, index, duration):
+        return index is None or index in self._sample_indices(scene)
+
+    def render(self, scene, time, moving_mobjects):
+        if self.skip_animations:
+            return super().render(scene, time, moving_mobjects)
+        # Frames that are not sampled only advance the clock
+        index, self._frame_index = self._frame_index, self._frame_index + 1
+        dt = 1 / self.camera.frame_rate
+        if self.wants_frame(scene, index, dt):
+            self.update_frame(scene, moving_mobjects)
+            self.sample(f"f{index}")
+        self.time += dt
+
+    def freeze_current_frame(self, duration):
+        if self.skip_animations:
+            return super().freeze_current_frame(duration)
+        duration = int(duration * self.camera.frame_rate) / self.camera.frame_rate
+        if self.wants_frame(scene=None, index=None, duration=duration):
+            self.sample("hold")
+        self.time += duration
+
+
+# Renders only what overlaps [t0, t1] (scene time in seconds). Earlier plays are
+# skipped the way `-n` skips them: the animations jump to their end state.
+class SeekRenderer(SamplingRenderer):
+    sample_play_ends = False
+
+    def __init__(self, t0, t1=None, **kwargs):
+        super().__init__(**kwargs)
+        self.t0 = t0
+        self.t1 = t0 if t1 is None else t1
+        self.timeline = []  # (play, start, end, location)
+
+    def sample(self, tag, play=None):
+        super().sample(f"t{self.time:.3f}" if tag != "hold" else f"hold{self.time:.3f}", play)
+
+    def play(self, scene, *args, **kwargs):
+        if "compile_animation_data" not in vars(scene):
+            compile_animation_data = scene.compile_animation_data
+
+            def compile_and_seek(*animations, **play_kwargs):
+                result = compile_animation_data(*animations, **play_kwargs)
+                self._seek(scene)
+                return result
+
+            scene.compile_animation_data = compile_and_seek
+        super().play(scene, *args, **kwargs)
+
+    def _seek(self, scene):
+        start, end = self.time, self.time + scene.duration
+        self.timeline.append((self.num_plays, round(start, 4), round(end, 4), play_location()))
+        if start > self.t1:
+            raise EndSceneEarlyException()
+        if end <= self.t0:
+            self.skip_animations = True
+            # Skipped frames never reach add_frame's clock, so move it by the
+            # frames this play would have drawn: whole frames of a hold, as in
+            # freeze_current_frame, or one per time step of an animation
+            rate = self.camera.frame_rate
+            if scene.is_current_animation_frozen_frame():
+                self.time += int(scene.duration * rate) / rate
+            else:
+                self.time += len(np.arange(0, scene.duration, 1 / rate)) / rate
+
+    def update_frame(self, scene, *args, **kwargs):
+        # Fast-forwarded plays draw nothing, not even their static background
+        if self.skip_animations:
+            return
+        super().update_frame(scene, *args, **kwargs)
+
+    def wants_frame(self, scene, index, duration):
+        # The frame shown at t is the one whose interval [time, time + duration) contains t
+        return self.time + duration > self.t0 and self.time <= self.t1
+
+
+def render_frame_at(scene_name, t, quality="low_quality", overrides=None):
+    samples = render_range(scene_name, t, t, quality, overrides).samples
+    return samples[0]["frame"] if samples else None
+
+
+# The renderer after the run: its samples and its timeline. overrides (e.g.
+# SAMPLE_CONFIG's size and frame rate) apply on top of the quality.
+def render_range(scene_name, t0, t1, quality="low_quality", overrides=None):
+    scene_class = load_scene_class(REPO_ROOT / SCENE_FILES[scene_name], scene_name)
+    settings = {key: SAMPLE_CONFIG[key] for key in ("write_to_movie", "save_last_frame", "disable_caching", "progress_bar", "preview")}
+    with tempconfig({**settings, "quality": quality, **(overrides or {})}):
+        # Built inside tempconfig: the camera takes its size from config
+        renderer = SeekRenderer(t0, t1)
+        scene_class(renderer=renderer).render()
+    return renderer
+
+
+def sample_scene(scene_name, samples_per_play=3, renderer_class=SamplingRenderer, scene_path=None, **renderer_kwargs):
+    scene_class = load_scene_class(scene_path or REPO_ROOT / SCENE_FILES[scene_name], scene_name)
+    if scene_path is not None:
+        # Later imports of this module name (clip4_density_example imports
+        # clip4_real_life_example) must get the working tree's file
+        sys.modules.pop(Path(scene_path).stem, None)
+        sys.path.remove(str(Path(scene_path).resolve().parent))
+    if scene_name in SAMPLE_SCENE_ATTRIBUTES:
+        scene_class = type(scene_name, (scene_class,), dict(SAMPLE_SCENE_ATTRIBUTES[scene_name]))
+    with tempconfig(SAMPLE_CONFIG):
+        renderer = renderer_class(samples_per_play=samples_per_play, **renderer_kwargs)
+        scene = scene_class(renderer=renderer)
+        scene.render()
+    return renderer.samples, scene_inputs_digest(scene)
+
+
+# Goldens map scene -> sampled frames; INPUTS_KEY maps scene -> scene_inputs digest
+INPUTS_KEY = "_inputs"
+
+
+def _sample_key(sample):
+    return f"{sample['play']}:{sample['tag']}"
+
+
+def load_goldens():
+    try:
+        return json.loads(GOLDEN_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+# Scene files as they were at rev, written under directory; scenes whose file
+# did not exist at rev are left out
+def baseline_scene_files(rev, directory):
+    files = {}
+    for name, path in SCENE_FILES.items():
+        shown = subprocess.run(["git", "-C", str(REPO_ROOT), "show", f"{rev}:{path}"], capture_output=True)
+        if shown.returncode == 0:
+            target = Path(directory) / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(shown.stdout)
+            files[name] = target
+    return files
+
+
+def check(scene_names, update=False, baseline=None):
+    with tempfile.TemporaryDirectory() as directory:
+        baseline_files = baseline_scene_files(baseline, directory) if baseline else {}
+        return _check(scene_names, update, baseline_files)
+
+
+def _check(scene_names, update, baseline_files):
+    from PIL import Image
+
+    goldens = load_goldens()
+    failures, changed = {}, False
+    diff_dir = Path(config.media_dir) / "golden_diffs"
+    for name in scene_names:
+        start = time.perf_counter()
+        samples, inputs_digest = sample_scene(name, scene_path=baseline_files.get(name))
+        current = {_sample_key(s): {"time": s["time"], **frame_signature(s["frame"])} for s in samples}
+        if update:
+            goldens[name] = current
+            goldens.setdefault(INPUTS_KEY, {})[name] = inputs_digest
+            changed = True
+            source = "baseline" if name in baseline_files else "working tree"
+            print(f"{name}: stored {len(current)} golden frames from the {source} ({time.perf_counter() - start:.1f}s)")
+            continue
+        if name not in goldens:
+            failures[name] = [f"no goldens in {GOLDEN_PATH.name}; run check --update and commit it"]
+            print(f"{name}: {failures[name][0]}")
+            continue
+        expected = goldens[name]
+        problems = []
+        golden_inputs = goldens.get(INPUTS_KEY, {}).get(name)
+        if golden_inputs is not None and golden_inputs != inputs_digest:
+            problems.append("scene inputs changed since the goldens were stored (data, seeds or fitted values)")
+        if set(current) != set(expected):
+            problems.append(f"sampled frames differ: {len(current)} now, {len(expected)} in goldens")
+        frames = {_sample_key(s): s["frame"] for s in samples}
+        for key in sorted(set(current) & set(expected)):
+            if not signatures_match(current[key], expected[key]):
+                hash_bits, color_levels = signature_distance(current[key], expected[key])
+                problems.append(f"play {key} at t={current[key]['time']}: {hash_bits} hash bits, {color_levels} color levels")
+                diff_dir.mkdir(parents=True, exist_ok=True)
+                Image.fromarray(frames[key]).save(diff_dir / f"{name}_{key.replace(':', '_')}.png")
+        status = "ok" if not problems else f"{len(problems)} mismatches"
+        print(f"{name}: {len(current)} frames, {status} ({time.perf_counter() - start:.1f}s)")
+        for problem in problems:
+            print(f"  {problem}")
+        if problems:
+            failures[name] = problems
+    if changed:
+        GOLDEN_PATH.write_text(json.dumps(goldens, indent=1, sort_keys=True))
+    return failures
+
+
+def seek(scene_name, t0, t1=None, quality="low_quality", timeline=False):
+    from PIL import Image
+
+    start = time.perf_counter()
+    if timeline:
+        t0 = t1 = math.inf
+    renderer = render_range(scene_name, t0, t1, quality)
+    samples = renderer.samples
+    if timeline:
+        for play, play_start, play_end, location in renderer.timeline:
+            print(f"play {play:3d}  {play_start:8.2f}s - {play_end:8.2f}s  {location}")
+        return []
+    out_dir = Path(config.media_dir) / "seek" / scene_name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for sample in samples:
+        path = out_dir / f"{sample['play']:03d}_{sample['tag']}.png"
+        Image.fromarray(sample["frame"]).save(path)
+        paths.append(path)
+    print(f"{len(paths)} frames in {out_dir} ({time.perf_counter() - start:.1f}s)")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sampled and seek-to-time rendering of the lecture scenes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check_parser = commands.add_parser("check", help="compare sampled frames with the stored goldens")
+    check_parser.add_argument("scenes", nargs="*", help=f"default: {' '.join(SAMPLED_SCENES)}")
+    check_parser.add_argument("--update", action="store_true", help="store the current frames as the new goldens")
+    check_parser.add_argument("--baseline", metavar="REV", help="with --update, sample the scene files as of this commit")
+
+    seek_parser = commands.add_parser("seek", help="render the frame at a time, or a time range")
+    seek_parser.add_argument("scene", choices=sorted(SCENE_FILES))
+    seek_parser.add_argument("time", type=float, nargs="?", default=0.0, help="seconds into the scene")
+    seek_parser.add_argument("--to", type=float, help="end of the range, in seconds")
+    seek_parser.add_argument("-q", "--quality", default="l", choices=sorted(QUALITIES))
+    seek_parser.add_argument("--timeline", action="store_true", help="only list when each play starts and ends")
+    args = parser.parse_args()
+
+    if args.command == "seek":
+        seek(args.scene, args.time, args.to, QUALITIES[args.quality], args.timeline)
+        return
+    unknown = [s for s in args.scenes if s not in SCENE_FILES]
+    if unknown:
+        parser.error(f"unknown scenes: {', '.join(unknown)}")
+    if args.baseline and not args.update:
+        parser.error("--baseline only applies with --update")
+    failures = check(args.scenes or SAMPLED_SCENES, update=args.update, baseline=args.baseline)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 from manim import *
+from memory_report import MemoryReportMixin
+from parallel_updaters import ParallelUpdatersMixin
+from asset_prefetch import AssetPrefetcher
+from vfr_holds import VFRHoldsMixin
+from segment_cache import SegmentCacheMixin
 
 # Import all the individual clip classes
 from clip1_linear_review import Clip1LinearReview
@@ -7,7 +12,7 @@ from clip4_real_life_example import Clip4RealLifeExample
 from clip5_conclusion import Clip5Conclusion
 
 # Create a new class that inherits from Scene and runs all clips in sequence
-class FullRegressionDemo(Scene):
+class FullRegressionDemo(MemoryReportMixin, ParallelUpdatersMixin, SegmentCacheMixin, VFRHoldsMixin, Scene):
     def construct(self):
 
 
@@ -18,16 +23,37 @@ class FullRegressionDemo(Scene):
             Clip4RealLifeExample, 
             Clip5Conclusion
         ]
-        
-        for SceneClass in clips:
-            # Create temporary instance and use its construct method 
-            # by binding the construct method to our current scene instance
-            temp_scene = SceneClass()
-            temp_scene.construct = SceneClass.construct.__get__(self, self.__class__)
-            temp_scene.construct()
+
+        # Compile upcoming clips' tex and text in the background
+        prefetcher = AssetPrefetcher(clips).start()
+
+        # finish() also undoes the Text/tex patches, so it runs even if a clip fails
+        try:
+            for SceneClass in clips:
+                prefetcher.enter(SceneClass)
+                # Create temporary instance and use its construct method 
+                # by binding the construct method to our current scene instance
+                temp_scene = SceneClass()
+                # Bring over class-level settings such as Clip4's dataset
+                for name, value in vars(SceneClass).items():
+                    if not name.startswith("__") and not callable(value):
+                        setattr(self, name, value)
+                temp_scene.construct = SceneClass.construct.__get__(self, self.__class__)
+                temp_scene.construct()
+        finally:
+            prefetcher.finish()
 
 # To render: manim -pqm demo/full_regression_demo.py FullRegressionDemo
 
+# To log memory per play and release faded-out mobjects:
+# MANIM_MEMORY_REPORT=1 MANIM_RELEASE_FADED=1 manim -pqh demo/full_regression_demo.py FullRegressionDemo
+
+# To encode holds as single frames with a duration (VFR), CFR only at the final mux:
+# MANIM_VFR=1 MANIM_VFR_CFR=1 manim -pqh demo/full_regression_demo.py FullRegressionDemo
+
+# To reuse rasterized frames across scenes and reruns (python demo/segment_cache.py stats for hit rates):
+# MANIM_SEGMENT_CACHE=1 manim -pqh demo/full_regression_demo.py FullRegressionDemo
+
 # To render with audio: manim -pqh demo/full_regression_demo.py FullRegressionDemo --audio_dir audio
 
 # To render with audio and video: manim -pqh demo/full_regression_demo.py FullRegressionDemo --audio_dir audio --renderer=opengl
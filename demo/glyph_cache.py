@@ -0,0 +1,199 @@
+from manim import *
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import manim
+import manimpango
+import numpy as np
+
+# Persistent cache of vectorized Text outlines.
+#
+# Text(...) runs Pango layout, writes an SVG and parses it back into bezier
+# points every time it is built, even for strings we rendered a second ago.
+# CachedText keys the finished outlines on (text, font, size, styling, t2c...)
+# and keeps them in a memory-bounded LRU that is mirrored to disk, so a string
+# only goes through Pango once across scenes and across runs. Keys include the
+# manim, ManimPango and Pango versions, since any of them can change outlines.
+
+GLYPH_CACHE_VERSION = 1
+RENDER_VERSIONS = (manim.__version__, manimpango.__version__, manimpango.pango_version())
+TRIM_FRACTION = 16  # the disk is trimmed after writing max_disk_bytes / this
+
+
+class GlyphCache:
+    def __init__(self, directory=None, max_bytes=64 * 1024**2, max_disk_bytes=512 * 1024**2):
+        self._directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()  # key -> list of glyph arrays, most recent last
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._written = 0  # bytes saved since the last disk trim
+        self._lock = threading.RLock()  # the asset prefetcher fills it from a worker thread
+
+    @property
+    def directory(self):
+        # Lives under text_dir so anything that shares manim's text cache
+        # (e.g. the render farm workers) shares the outlines too
+        if self._directory is None:
+            self._directory = Path(config.get_dir("text_dir")) / "glyph_outlines"
+        self._directory.mkdir(parents=True, exist_ok=True)
+        return self._directory
+
+    @staticmethod
+    def make_key(text, settings):
+        payload = json.dumps([GLYPH_CACHE_VERSION, RENDER_VERSIONS, text, settings], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        glyphs = self._load(key)
+        if glyphs is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, glyphs)
+        return glyphs
+
+    def put(self, key, glyphs):
+        with self._lock:
+            self._remember(key, glyphs)
+            self._save(key, glyphs)
+
+    def _remember(self, key, glyphs):
+        if key in self.entries:
+            return
+        self.entries[key] = glyphs
+        self.nbytes += _glyphs_nbytes(glyphs)
+        # Evict least recently used entries until we are back under budget
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= _glyphs_nbytes(evicted)
+
+    def _path(self, key):
+        return self.directory / f"{key}.npz"
+
+    def _load(self, key):
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                glyphs = _unpack(data)
+        except (OSError, ValueError, KeyError):
+            path.unlink(missing_ok=True)  # corrupt or from an older layout
+            return None
+        path.touch()  # mtime doubles as the disk LRU clock
+        return glyphs
+
+    def _save(self, key, glyphs):
+        path = self._path(key)
+        # Per process, and not *.npz, so neither another worker nor a trim
+        # touches it before the rename
+        tmp = path.with_name(f"{key}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as file:
+            np.savez(file, **_pack(glyphs))
+        self._written += tmp.stat().st_size
+        tmp.replace(path)
+        if self._written * TRIM_FRACTION >= self.max_disk_bytes:
+            self._trim_disk()
+            self._written = 0
+
+    def _trim_disk(self):
+        files = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # removed by another process's trim
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort(key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            total -= size
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+
+def _glyphs_nbytes(glyphs):
+    return sum(g["points"].nbytes + g["fill_rgbas"].nbytes + g["stroke_rgbas"].nbytes for g in glyphs)
+
+
+# Flatten a list of glyph dicts into a handful of arrays for np.savez
+def _pack(glyphs):
+    packed = {"stroke_width": np.array([g["stroke_width"] for g in glyphs], dtype=float)}
+    for name in ("points", "fill_rgbas", "stroke_rgbas"):
+        arrays = [g[name] for g in glyphs]
+        packed[name] = np.concatenate(arrays) if arrays else np.zeros((0, 3 if name == "points" else 4))
+        packed[name + "_offsets"] = np.cumsum([0] + [len(a) for a in arrays])
+    return packed
+
+
+def _unpack(data):
+    glyphs = []
+    for i, width in enumerate(data["stroke_width"]):
+        glyph = {"stroke_width": float(width)}
+        for name in ("points", "fill_rgbas", "stroke_rgbas"):
+            start, end = data[name + "_offsets"][i : i + 2]
+            glyph[name] = np.array(data[name][start:end])
+        glyphs.append(glyph)
+    return glyphs
+
+
+GLYPH_CACHE = GlyphCache()
+
+
+# Drop-in replacement for Text(...) that reuses cached outlines. The result is a
+# VGroup of plain VMobjects (one per glyph) with the colors from `color`/t2c
+# already baked in, so it can be scaled, positioned and Written like Text.
+class CachedText(VGroup):
+    def __init__(self, text, cache=None, **kwargs):
+        super().__init__()
+        cache = cache if cache is not None else GLYPH_CACHE
+        self.text = text
+        self.original_text = text
+        key = cache.make_key(text, kwargs)
+        glyphs = cache.get(key)
+        if glyphs is None:
+            glyphs = _extract_glyphs(Text(text, **kwargs))
+            cache.put(key, glyphs)
+        for glyph in glyphs:
+            self.add(_build_glyph(glyph))
+
+
+def _extract_glyphs(text_mobject):
+    return [
+        {
+            "points": np.array(mob.points, dtype=float),
+            "fill_rgbas": np.array(mob.fill_rgbas, dtype=float),
+            "stroke_rgbas": np.array(mob.stroke_rgbas, dtype=float),
+            "stroke_width": float(mob.stroke_width),
+        }
+        for mob in text_mobject.family_members_with_points()
+    ]
+
+
+def _build_glyph(glyph):
+    mob = VMobject()
+    mob.points = glyph["points"].copy()
+    mob.fill_rgbas = glyph["fill_rgbas"].copy()
+    mob.stroke_rgbas = glyph["stroke_rgbas"].copy()
+    mob.stroke_width = glyph["stroke_width"]
+    return mob
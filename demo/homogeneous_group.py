@@ -0,0 +1,178 @@
+from manim import *
+import numpy as np
+
+# Array-backed group of identical shapes (scatter dots, residual squares...).
+#
+# A VGroup of n Dots is n Python objects, each with its own attribute dict,
+# color arrays and submobject list. HomogeneousGroup keeps every element's
+# points in shared arrays instead: elements with the same style are stored as
+# one multi-path VMobject (a "run"), normally a single run for the whole group.
+# shift/scale/.animate, color changes and Transform therefore touch one array
+# per run rather than one object per element.
+#
+# The group itself stays an ordinary VMobject: iterating, indexing and len()
+# see its runs, so FadeIn, LaggedStartMap, VGroup(*group) and friends work as
+# usual. Per-element access goes through lightweight views from elements() and
+# element(i). The struct-of-arrays accessors (get_element_points,
+# get_element_centers, get_element_fill_rgbas, ...) return (n, ...) arrays
+# gathered from the runs. Style changes that keep the runs' partition rewrite
+# the runs' colors in place, so references to runs stay valid.
+
+
+class HomogeneousElement:
+    def __init__(self, group, index):
+        self.group = group
+        self.index = index
+
+    def get_points(self):
+        return self.group.get_element_points()[self.index]
+
+    def get_center(self):
+        points = self.get_points()
+        return (points.min(axis=0) + points.max(axis=0)) / 2
+
+    def shift(self, vector):
+        run, start, end = self.group._element_slice(self.index)
+        run.points[start:end] += vector
+        return self
+
+    def move_to(self, point):
+        return self.shift(np.asarray(point) - self.get_center())
+
+    def set_fill(self, color=None, opacity=None):
+        self.group.set_element_style(self.index, fill_color=color, fill_opacity=opacity)
+        return self
+
+    def set_stroke(self, color=None, width=None, opacity=None):
+        self.group.set_element_style(self.index, stroke_color=color, stroke_width=width, stroke_opacity=opacity)
+        return self
+
+    def set_color(self, color):
+        self.group.set_element_style(self.index, fill_color=color, stroke_color=color)
+        return self
+
+    # A standalone copy, e.g. as the target of a Transform
+    def to_mobject(self):
+        mob = VMobject()
+        mob.match_style(self.group.template)
+        mob.points = self.get_points().copy()
+        mob.fill_rgbas = self.group.get_element_fill_rgbas()[self.index][None].copy()
+        mob.stroke_rgbas = self.group.get_element_stroke_rgbas()[self.index][None].copy()
+        mob.stroke_width = self.group.get_element_stroke_widths()[self.index]
+        return mob
+
+
+class HomogeneousGroup(VGroup):
+    def __init__(self, template, positions, **kwargs):
+        super().__init__(**kwargs)
+        self.template = template.copy()
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        shape = template.points - template.get_center()
+        self.points_per_element = len(shape)
+        element_points = positions[:, None, :] + shape[None, :, :]
+        n = len(positions)
+        fill = np.tile(template.get_fill_rgbas()[0], (n, 1))
+        stroke = np.tile(template.get_stroke_rgbas()[0], (n, 1))
+        widths = np.full(n, float(template.get_stroke_width()))
+        self._build_runs(element_points, fill, stroke, widths)
+
+    # Group elements with identical style into one VMobject each
+    def _build_runs(self, element_points, fill, stroke, widths):
+        n = len(element_points)
+        styles, inverse = np.unique(np.hstack([fill, stroke, widths[:, None]]), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        self.element_run = inverse
+        self.element_slot = np.empty(n, dtype=int)
+        runs = []
+        for run_index, style in enumerate(styles):
+            indices = np.flatnonzero(inverse == run_index)
+            run = VMobject()
+            run.match_style(self.template)
+            run.fill_rgbas = style[None, :4].copy()
+            run.stroke_rgbas = style[None, 4:8].copy()
+            run.stroke_width = style[8]
+            run.points = element_points[indices].reshape(-1, 3).copy()
+            run.element_indices = indices
+            self.element_slot[indices] = np.arange(len(indices))
+            runs.append(run)
+        self.submobjects = []
+        self.add(*runs)
+        return self
+
+    def _runs(self):
+        return [run for run in self.submobjects if hasattr(run, "element_indices")]
+
+    def _element_slice(self, index):
+        run = self.submobjects[self.element_run[index]]
+        start = self.element_slot[index] * self.points_per_element
+        return run, start, start + self.points_per_element
+
+    def _gather(self, getter, width):
+        out = np.empty((len(self.element_run), *width))
+        for run in self._runs():
+            out[run.element_indices] = getter(run)
+        return out
+
+    def get_element_points(self):
+        k = self.points_per_element
+
+        def run_points(run):
+            if len(run.points) != len(run.element_indices) * k:
+                raise ValueError("HomogeneousGroup no longer has one shape per element")
+            return run.points.reshape(-1, k, 3)
+
+        return self._gather(run_points, (k, 3))
+
+    def set_element_points(self, element_points):
+        # One fancy-index write per run
+        for run in self._runs():
+            run.points = element_points[run.element_indices].reshape(-1, 3)
+        return self
+
+    def get_element_centers(self):
+        points = self.get_element_points()
+        return (points.min(axis=1) + points.max(axis=1)) / 2
+
+    def get_element_fill_rgbas(self):
+        return self._gather(lambda run: run.get_fill_rgbas()[0], (4,))
+
+    def get_element_stroke_rgbas(self):
+        return self._gather(lambda run: run.get_stroke_rgbas()[0], (4,))
+
+    def get_element_stroke_widths(self):
+        return self._gather(lambda run: run.get_stroke_width(), ())
+
+    def set_element_style(self, indices, fill_color=None, fill_opacity=None, stroke_color=None, stroke_width=None,
+                          stroke_opacity=None):
+        # Runs are only rebuilt when elements move between styles
+        fill, stroke = self.get_element_fill_rgbas(), self.get_element_stroke_rgbas()
+        widths = self.get_element_stroke_widths()
+        if fill_color is not None:
+            fill[indices, :3] = color_to_rgb(fill_color)
+        if fill_opacity is not None:
+            fill[indices, 3] = fill_opacity
+        if stroke_color is not None:
+            stroke[indices, :3] = color_to_rgb(stroke_color)
+        if stroke_width is not None:
+            widths[indices] = stroke_width
+        if stroke_opacity is not None:
+            stroke[indices, 3] = stroke_opacity
+        styles = np.hstack([fill, stroke, widths[:, None]])
+        runs = self._runs()
+        firsts = [run.element_indices[0] for run in runs]
+        same_partition = len(np.unique(styles[firsts], axis=0)) == len(runs) and all(
+            (styles[run.element_indices] == styles[first]).all() for run, first in zip(runs, firsts)
+        )
+        if not same_partition:
+            return self._build_runs(self.get_element_points(), fill, stroke, widths)
+        for run, first in zip(runs, firsts):
+            run.fill_rgbas[:] = fill[first]
+            run.stroke_rgbas[:] = stroke[first]
+            run.stroke_width = widths[first]
+        return self
+
+    def elements(self):
+        return [HomogeneousElement(self, i) for i in range(len(self.element_run))]
+
+    def element(self, index):
+        return HomogeneousElement(self, range(len(self.element_run))[index])
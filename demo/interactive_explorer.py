@@ -0,0 +1,182 @@
+from manim import *
+from manim.mobject.opengl.opengl_point_cloud_mobject import OpenGLPMobject
+import os
+import time
+
+import numpy as np
+
+from clip2_OLS import corners_to_bezier_points
+from numeric_readout import NumericReadout, ReadoutSlot
+from scene_inputs import exact_sum, stream
+
+# Live slope/intercept explorer (OpenGL renderer).
+#
+#   manim -p --renderer=opengl demo/interactive_explorer.py InteractiveExplorer
+#
+#   w / s   slope up / down         a / d   intercept down / up
+#   o       jump to the OLS fit     r       back to the start
+#   drag    left/right moves b, up/down moves m
+#
+# Every parameter change rebuilds the line, all residuals and all squares as
+# three VMobjects whose points come out of a few NumPy expressions, and the
+# readouts swap precompiled digit glyphs; SSR comes from the data's sufficient
+# statistics, so nothing in the loop scales with Python objects or calls TeX.
+# The squares' fill triangulation is the same for every frame and is set
+# directly instead of being recomputed.
+#
+# Latency test, headless with Mesa's software rasterizer (no -p, so no window):
+#
+#   EXPLORER_BENCH=500 EXPLORER_POINTS=10000 LIBGL_ALWAYS_SOFTWARE=1 xvfb-run -a \
+#       manim -qh --renderer=opengl demo/interactive_explorer.py InteractiveExplorer
+#
+# It times parameter update + draw for a random walk over m and b and fails
+# (non-zero exit) if the 95th percentile is over the 16 ms frame budget.
+
+FRAME_BUDGET = 1 / 60
+
+
+def explorer_data(n_points, stream_name="explorer.data"):
+    rng = stream(stream_name)
+    x = rng.uniform(0.3, 6.7, n_points)
+    y = np.clip(0.7 * x + 1.5 + rng.normal(0, 0.8, n_points), 0.1, 6.9)
+    return x, y
+
+
+# SSR(m, b) in O(1) from sums over the data
+class SSRStatistics:
+    def __init__(self, x, y):
+        self.n = len(x)
+        # Correctly rounded sums, not BLAS dot products, so every machine gets the same bits
+        self.sx, self.sy = exact_sum(x), exact_sum(y)
+        self.sxx, self.sxy, self.syy = exact_sum(x * x), exact_sum(x * y), exact_sum(y * y)
+
+    def ssr(self, m, b):
+        return (self.syy - 2 * m * self.sxy - 2 * b * self.sy
+                + m * m * self.sxx + 2 * m * b * self.sx + self.n * b * b)
+
+    def ols(self):
+        m = (self.n * self.sxy - self.sx * self.sy) / (self.n * self.sxx - self.sx ** 2)
+        return m, (self.sy - m * self.sx) / self.n
+
+
+def _points_per_curve(mob):
+    return getattr(mob, "n_points_per_curve", None) or mob.n_points_per_cubic_curve
+
+
+class InteractiveExplorer(Scene):
+    n_points = int(os.environ.get("EXPLORER_POINTS", 10_000))
+    bench_updates = int(os.environ.get("EXPLORER_BENCH", 0))  # > 0: run the latency test and exit
+    m_step, b_step = 0.05, 0.1
+
+    def construct(self):
+        if config.renderer != RendererType.OPENGL:
+            raise ValueError("InteractiveExplorer needs --renderer=opengl")
+        self.x, self.y = explorer_data(self.n_points)
+        self.stats = SSRStatistics(self.x, self.y)
+
+        axes = Axes(
+            x_range=[0, 7, 1], y_range=[0, 7, 1], x_length=7, y_length=5.5,
+            axis_config={"include_tip": False, "stroke_opacity": 0.5},
+        ).to_edge(LEFT, buff=0.6)
+        # Linear axes: c2p is origin + x * x_unit + y * y_unit
+        self.origin = np.array(axes.c2p(0, 0))
+        self.x_unit = np.array(axes.c2p(1, 0)) - self.origin
+        self.y_unit = np.array(axes.c2p(0, 1)) - self.origin
+        self.dot_points = self.c2p(self.x, self.y)
+
+        dots = OpenGLPMobject(stroke_width=3 if self.n_points > 500 else 10)
+        dots.add_points(self.dot_points, color=YELLOW)
+        self.squares = VMobject(fill_color=BLUE, fill_opacity=0.25, stroke_width=0)
+        self.residuals = VMobject(stroke_color=GRAY, stroke_width=1, stroke_opacity=0.6)
+        self.line = VMobject(stroke_color=GREEN, stroke_width=4)
+
+        readouts = VGroup(
+            NumericReadout("m = ", ReadoutSlot()), NumericReadout("b = ", ReadoutSlot()),
+            NumericReadout("SSR = ", ReadoutSlot("{:.1f}", max_chars=12)),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.4).to_edge(RIGHT, buff=2.5)
+        self.m_readout, self.b_readout, self.ssr_readout = readouts
+
+        self.start = (0.2, 4.0)
+        self.set_params(*self.start)
+        self.add(axes, self.squares, self.residuals, dots, self.line, readouts)
+
+        self.set_key_function("w", lambda: self.nudge(dm=self.m_step))
+        self.set_key_function("s", lambda: self.nudge(dm=-self.m_step))
+        self.set_key_function("d", lambda: self.nudge(db=self.b_step))
+        self.set_key_function("a", lambda: self.nudge(db=-self.b_step))
+        self.set_key_function("o", lambda: self.set_params(*self.stats.ols()))
+        self.set_key_function("r", lambda: self.set_params(*self.start))
+
+        if self.bench_updates:
+            self.run_benchmark(self.bench_updates)
+        else:
+            self.interactive_embed()
+
+    def c2p(self, x_vals, y_vals):
+        return self.origin + x_vals[:, None] * self.x_unit + y_vals[:, None] * self.y_unit
+
+    def nudge(self, dm=0.0, db=0.0):
+        self.set_params(self.m + dm, self.b + db)
+
+    def on_mouse_drag(self, point, d_point, buttons, modifiers):
+        self.nudge(dm=d_point[1] * 0.2, db=d_point[0] * 0.5)
+
+    def set_params(self, m, b):
+        self.m, self.b = m, b
+        k = _points_per_curve(self.line)
+        x_ends = np.array([0.0, 7.0])
+        self.line.set_points_as_corners(self.c2p(x_ends, m * x_ends + b))
+
+        y_pred = m * self.x + b
+        line_points = self.c2p(self.x, y_pred)
+        self.residuals.set_points(
+            corners_to_bezier_points(np.stack([line_points, self.dot_points], axis=1), k).reshape(-1, 3)
+        )
+
+        # Side = the residual's length on screen
+        half = np.maximum(0.01, np.abs(self.y - y_pred))[:, None, None] * np.linalg.norm(self.y_unit) / 2
+        centers = self.c2p(self.x, (self.y + y_pred) / 2)
+        offsets = np.array([[1, 1, 0], [-1, 1, 0], [-1, -1, 0], [1, -1, 0], [1, 1, 0]])
+        corners = centers[:, None, :] + half * offsets
+        self.squares.set_points(corners_to_bezier_points(corners, k).reshape(-1, 3))
+        self._set_square_triangulation(k)
+
+        self.m_readout.set_values(m)
+        self.b_readout.set_values(b)
+        self.ssr_readout.set_values(self.stats.ssr(m, b))
+
+    def _set_square_triangulation(self, k):
+        # OpenGL fill: every curve's own triangle plus two triangles per square
+        if not hasattr(self.squares, "needs_new_triangulation"):
+            return
+        if getattr(self, "_square_triangles", None) is None:
+            n_square_points = 4 * k
+            bases = np.arange(self.n_points)[:, None] * n_square_points
+            inner = bases + np.array([0, k, 2 * k, 0, 2 * k, 3 * k])
+            self._square_triangles = np.hstack([np.arange(self.n_points * n_square_points), inner.ravel()])
+        self.squares.triangulation = self._square_triangles
+        self.squares.needs_new_triangulation = False
+
+    def run_benchmark(self, updates):
+        rng = stream("explorer.benchmark")
+        m_ols, b_ols = self.stats.ols()
+        walk = np.cumsum(rng.normal(0, [[0.02, 0.05]], size=(updates, 2)), axis=0) + [m_ols, b_ols]
+        context = getattr(self.renderer, "context", None)
+        timings = []
+        for m, b in walk:
+            start = time.perf_counter()
+            self.set_params(m, b)
+            self.renderer.update_frame(self)
+            if context is not None:
+                context.finish()  # wait for the GPU, not just the command queue
+            timings.append(time.perf_counter() - start)
+        timings = np.array(timings[5:] or timings) * 1000  # first frames compile shaders
+        p50, p95 = np.percentile(timings, [50, 95])
+        logger.info(
+            "explorer: %d points, %d updates, p50 %.2f ms, p95 %.2f ms, max %.2f ms",
+            self.n_points, updates, p50, p95, timings.max(),
+        )
+        self.bench_result = {"p50_ms": p50, "p95_ms": p95, "max_ms": timings.max()}
+        if p95 > FRAME_BUDGET * 1000:
+            raise RuntimeError(f"p95 update {p95:.2f} ms is over the {FRAME_BUDGET * 1000:.1f} ms frame budget")
+
@@ -0,0 +1,342 @@
+from manim import *
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from clip4_real_life_example import nice_range
+from glyph_cache import CachedText
+from homogeneous_group import HomogeneousGroup
+from parallel_updaters import serialize_same_tex
+from scene_inputs import StableStatistics, canonical_hash
+from segment_cache import SegmentCacheMixin
+from step_layout import StepStack
+from vfr_holds import VFRHoldsMixin
+
+# Lecture clips from a declarative spec.
+#
+# A spec is plain data: a heading, datasets and a timeline of entries such as
+# step(header, *lines), scatter(dataset), fit(dataset) and wait(seconds). It
+# can be written with the helpers below or loaded from JSON/YAML with the same
+# keys. Formulas refer to dataset statistics as <<name.field:format>>, e.g.
+# <<study.m:.2f>>; the fields are n, x_mean, y_mean, sxx, sxy, m and b.
+#
+# compile_lecture() resolves the whole timeline before anything is drawn:
+#
+#   * every distinct tex/text string is built once, all of them concurrently,
+#     and each use on screen is a copy of that template;
+#   * steps go through StepStack, so "fade the oldest step, move the rest up"
+#     is a layout change and never rebuilds tex;
+#   * waits are frozen-frame holds (nothing in a lecture has updaters), which
+#     VFR rendering encodes as single frames;
+#   * each section gets a digest of its resolved content and everything before
+#     it, so changing one section shows exactly which ones must re-render;
+#     with MANIM_SEGMENT_CACHE=1 the unchanged ones replay from the cache.
+#
+#   manim -pqh demo/lecture_spec.py OLSRecapLecture
+#   LECTURE_SPEC=my_lecture.yaml manim -pqh demo/lecture_spec.py SpecLecture
+#   python demo/lecture_spec.py plan my_lecture.yaml
+
+PLACEHOLDER = re.compile(r"<<\s*(\w+)\.(\w+)(?::([^>]*))?\s*>>")
+STEP_HEADER_SCALE, STEP_LINE_SCALE = 0.55, 0.5
+MAX_STEP_BLOCKS = 2  # older steps fade out and the rest move up
+
+
+# ---- Spec helpers; each returns the plain dict a YAML spec would contain ----
+
+def lecture(name, heading=None, datasets=None, timeline=()):
+    return {"name": name, "heading": heading, "datasets": datasets or {}, "timeline": list(timeline)}
+
+
+def dataset(x, y):
+    return {"x": list(x), "y": list(y)}
+
+
+def title(text, hold=1.0):
+    return {"title": text, "hold": hold}
+
+
+def step(header, *lines, hold=1.0):
+    return {"step": header, "lines": list(lines), "hold": hold}
+
+
+def formula(tex, hold=1.0):
+    return {"formula": tex, "hold": hold}
+
+
+def scatter(name, hold=1.0):
+    return {"scatter": name, "hold": hold}
+
+
+def fit(name, hold=1.0):
+    return {"fit": name, "hold": hold}
+
+
+def wait(seconds):
+    return {"wait": seconds}
+
+
+def section(name):
+    return {"section": name}
+
+
+def clear():
+    return {"clear": True}
+
+
+def load_spec(path):
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{path}: YAML specs need PyYAML (pip install pyyaml)") from None
+        return yaml.safe_load(path.read_text())
+    if path.suffix == ".json":
+        return json.loads(path.read_text())
+    raise ValueError(f"Unsupported spec format: {path}")
+
+
+# ---- Compilation ----
+
+class DatasetStats:
+    def __init__(self, x, y):
+        self.x, self.y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        stats = StableStatistics(self.x, self.y)
+        self.n, self.x_mean, self.y_mean = stats.n, stats.x_mean, stats.y_mean
+        self.sxx, self.sxy = stats.sxx_centered, stats.sxy_centered
+        self.m, self.b = stats.ols()
+
+
+class LecturePlan:
+    def __init__(self, spec):
+        self.name = spec["name"]
+        self.heading = spec.get("heading")
+        self.datasets = {name: DatasetStats(d["x"], d["y"]) for name, d in spec.get("datasets", {}).items()}
+        self.ops = []  # (kind, entry) with every string resolved
+        self.assets = {}  # (factory, string, scale) -> template mobject, built in prepare()
+        self.asset_uses = {}
+        self.sections = []  # {"name", "digest", "ops", "hold"}
+        self._resolve(spec.get("timeline", []))
+
+    def _fill(self, text):
+        def value(match):
+            name, field, fmt = match.groups()
+            if name not in self.datasets:
+                raise ValueError(f"{self.name}: unknown dataset '{name}' in {text!r}")
+            return format(getattr(self.datasets[name], field), fmt or "")
+        return PLACEHOLDER.sub(value, text)
+
+    def _asset(self, factory, text, scale):
+        key = (factory, self._fill(text), scale)
+        self.asset_uses[key] = self.asset_uses.get(key, 0) + 1
+        self.assets.setdefault(key, None)
+        return key
+
+    def _resolve(self, timeline):
+        if self.heading:
+            self.ops.append(("heading", {"key": self._asset("text", self.heading, 0.9)}))
+        for entry in timeline:
+            if "section" in entry:
+                self.ops.append(("section", {"name": entry["section"]}))
+            elif "title" in entry:
+                self.ops.append(("title", {"key": self._asset("text", entry["title"], 1.1), "hold": entry.get("hold", 1.0)}))
+            elif "step" in entry:
+                self.ops.append(("step", {
+                    "header": self._asset("text", entry["step"], STEP_HEADER_SCALE),
+                    "lines": [self._asset("tex", line, STEP_LINE_SCALE) for line in entry.get("lines", [])],
+                    "hold": entry.get("hold", 1.0),
+                }))
+            elif "formula" in entry:
+                self.ops.append(("formula", {"key": self._asset("tex", entry["formula"], 0.7), "hold": entry.get("hold", 1.0)}))
+            elif "scatter" in entry or "fit" in entry:
+                kind = "scatter" if "scatter" in entry else "fit"
+                if entry[kind] not in self.datasets:
+                    raise ValueError(f"{self.name}: unknown dataset '{entry[kind]}'")
+                self.ops.append((kind, {"dataset": entry[kind], "hold": entry.get("hold", 1.0)}))
+            elif "wait" in entry:
+                self.ops.append(("wait", {"hold": entry["wait"]}))
+            elif "clear" in entry:
+                self.ops.append(("clear", {}))
+            else:
+                raise ValueError(f"{self.name}: unknown timeline entry {entry!r}")
+        self._mark_sections()
+
+    # A section's digest covers its own ops and everything before it, since the
+    # screen it starts from depends on all of that
+    def _mark_sections(self):
+        if not self.ops or self.ops[0][0] != "section":
+            self.ops.insert(0, ("section", {"name": "intro"}))
+        running = [self.name, {name: [d.x, d.y] for name, d in self.datasets.items()}]
+        for kind, entry in self.ops:
+            running.append([kind, sorted((k, repr(v)) for k, v in entry.items())])
+            if kind == "section":
+                self.sections.append({"name": entry["name"], "digest": None, "ops": 0, "hold": 0.0})
+                entry["index"] = len(self.sections) - 1
+            else:
+                current = self.sections[-1]
+                current["ops"] += 1
+                current["hold"] += entry.get("hold", 0.0)
+            self.sections[-1]["digest"] = canonical_hash(running)[:12]
+
+    # Builds every distinct tex/text template once, concurrently
+    def prepare(self, workers=None):
+        serialize_same_tex()
+        missing = [key for key, mob in self.assets.items() if mob is None]
+
+        def build(key):
+            factory, text, scale = key
+            return MathTex(text).scale(scale) if factory == "tex" else CachedText(text).scale(scale)
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            for key, mob in zip(missing, pool.map(build, missing)):
+                self.assets[key] = mob
+        return self
+
+    def mobject(self, key):
+        return self.assets[key].copy()
+
+    def describe(self):
+        reused = sum(count - 1 for count in self.asset_uses.values())
+        lines = [
+            f"{self.name}: {len(self.ops)} ops, {len(self.assets)} distinct tex/text assets ({reused} reuses)",
+        ]
+        for sec in self.sections:
+            lines.append(f"  section {sec['name']:<20} {sec['digest']}  {sec['ops']:>3} ops, {sec['hold']:.1f} s held")
+        return "\n".join(lines)
+
+
+class LectureScene(SegmentCacheMixin, VFRHoldsMixin, Scene):
+    plan = None
+
+    def construct(self):
+        plan = self.plan.prepare()
+        logger.info("%s", plan.describe())
+        self.steps = None
+        self.step_anchor = None
+        self.plots = {}  # dataset -> axes
+        for kind, entry in plan.ops:
+            getattr(self, f"run_{kind}")(plan, entry)
+
+    def hold(self, seconds):
+        if seconds > 0:
+            self.wait(seconds, frozen_frame=True)
+
+    def run_section(self, plan, entry):
+        sec = plan.sections[entry["index"]]
+        self.next_section(f"{sec['name']}-{sec['digest']}")
+
+    def run_heading(self, plan, entry):
+        self.heading = plan.mobject(entry["key"]).to_edge(UP)
+        self.play(Write(self.heading))
+
+    def run_title(self, plan, entry):
+        mob = plan.mobject(entry["key"])
+        self.play(Write(mob))
+        self.hold(entry["hold"])
+        self.play(FadeOut(mob))
+
+    def run_step(self, plan, entry):
+        if self.steps is None:
+            self.step_anchor = VectorizedPoint(LEFT * 6.3 + UP * 2.6)
+            self.steps = StepStack(self.step_anchor)
+        if len(self.steps.blocks) >= MAX_STEP_BLOCKS:
+            self.play(*self.steps.pop(), run_time=1.5)
+        header = self.steps.push(plan.mobject(entry["header"]))
+        self.play(Write(header))
+        for key in entry["lines"]:
+            line = self.steps.add_line(plan.mobject(key))
+            self.play(Write(line), run_time=1.5)
+        self.hold(entry["hold"])
+
+    def run_formula(self, plan, entry):
+        mob = plan.mobject(entry["key"]).to_edge(DOWN, buff=0.6)
+        self.play(Write(mob))
+        self.hold(entry["hold"])
+
+    def run_scatter(self, plan, entry):
+        data = plan.datasets[entry["dataset"]]
+        axes = Axes(
+            x_range=nice_range(data.x), y_range=nice_range(data.y), x_length=5.5, y_length=4,
+            axis_config={"include_numbers": True, "include_tip": False, "font_size": 20},
+        ).to_edge(RIGHT, buff=0.5).shift(DOWN * 0.3)
+        dots = HomogeneousGroup(Dot(color=YELLOW), [axes.c2p(x, y) for x, y in zip(data.x, data.y)])
+        self.plots[entry["dataset"]] = axes
+        self.play(Create(axes), FadeIn(dots), run_time=1.5)
+        self.hold(entry["hold"])
+
+    def run_fit(self, plan, entry):
+        data = plan.datasets[entry["dataset"]]
+        axes = self.plots[entry["dataset"]]
+        line = axes.plot(lambda x: data.m * x + data.b, color=GREEN)
+        self.play(Create(line))
+        self.hold(entry["hold"])
+
+    def run_wait(self, plan, entry):
+        self.hold(entry["hold"])
+
+    def run_clear(self, plan, entry):
+        if self.mobjects:
+            self.play(FadeOut(Group(*self.mobjects)))
+        self.steps = None
+        self.plots = {}
+
+
+def compile_lecture(spec, class_name=None):
+    plan = LecturePlan(spec)
+    return type(class_name or f"{plan.name}Lecture", (LectureScene,), {"plan": plan})
+
+
+# ---- Example: the by-hand OLS calculation as a spec ----
+
+OLS_RECAP = lecture(
+    "OLSRecap",
+    heading="Recap: Fitting a Line by Hand",
+    datasets={"study": dataset([2, 5, 1, 7, 3, 4, 6], [60, 85, 60, 88, 75, 72, 80])},
+    timeline=[
+        section("data"),
+        scatter("study", hold=1.5),
+        section("calculation"),
+        step(
+            "Step 1: Calculate means",
+            r"\bar{x} = <<study.x_mean:.2f>>",
+            r"\bar{y} = <<study.y_mean:.2f>>",
+        ),
+        step(
+            "Step 2: Numerator and denominator",
+            r"\sum (x_i - \bar{x})(y_i - \bar{y}) = <<study.sxy:.2f>>",
+            r"\sum (x_i - \bar{x})^2 = <<study.sxx:.2f>>",
+        ),
+        step(
+            "Step 3: Slope and intercept",
+            r"\hat{m} = \frac{<<study.sxy:.2f>>}{<<study.sxx:.2f>>} = <<study.m:.2f>>",
+            r"\hat{b} = \bar{y} - \hat{m} \cdot \bar{x} = <<study.b:.2f>>",
+            hold=1.5,
+        ),
+        section("result"),
+        fit("study"),
+        formula(r"\hat{y} = <<study.m:.2f>>x + <<study.b:.2f>>", hold=2),
+        clear(),
+    ],
+)
+
+OLSRecapLecture = compile_lecture(OLS_RECAP, "OLSRecapLecture")
+
+if os.environ.get("LECTURE_SPEC"):
+    SpecLecture = compile_lecture(load_spec(os.environ["LECTURE_SPEC"]), "SpecLecture")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the render plan compiled from a lecture spec")
+    parser.add_argument("command", choices=["plan"])
+    parser.add_argument("spec", help=".yaml/.yml or .json spec")
+    args = parser.parse_args()
+    print(LecturePlan(load_spec(args.spec)).describe())
+
+
+if __name__ == "__main__":
+    main()
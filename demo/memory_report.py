@@ -0,0 +1,242 @@
+from manim import *
+import ast
+import gc
+import inspect
+import os
+import resource
+import sys
+import textwrap
+import weakref
+
+import numpy as np
+
+# Memory accounting for long constructs.
+#
+# MemoryReportMixin logs one line per play()/wait(): live mobjects, bytes held
+# in point arrays, bytes held by manim's in-memory SVG cache and RSS.
+#
+# With release_faded_mobjects on, mobjects that left the scene and can no longer
+# be reached from the running construct give up their point data. "Reachable"
+# means referenced by a local variable of construct that is still used at or
+# after the current line (a small liveness pass over construct's source), or
+# by something such a variable holds. Whatever the construct will still touch is
+# left alone; the rest (old step blocks, dropped labels...) stops growing RSS.
+#
+# Both switches default to the MANIM_MEMORY_REPORT / MANIM_RELEASE_FADED
+# environment variables so they can be flipped without editing the scenes.
+
+_LIVE_MOBJECTS = weakref.WeakSet()
+
+
+# Count every mobject ever built, including the deep copies made by animations
+def _track_mobjects():
+    if getattr(Mobject.__init__, "_tracked", False):
+        return
+    original_init, original_copy = Mobject.__init__, Mobject.copy
+
+    def __init__(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        _LIVE_MOBJECTS.add(self)
+
+    def copy(self, *args, **kwargs):
+        result = original_copy(self, *args, **kwargs)
+        _LIVE_MOBJECTS.update(result.get_family())
+        return result
+
+    __init__._tracked = True
+    Mobject.__init__, Mobject.copy = __init__, copy
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _points_nbytes(mobjects):
+    return sum(getattr(mob, "points", np.zeros(0)).nbytes for mob in mobjects)
+
+
+def svg_cache_nbytes():
+    try:
+        from manim.mobject.svg.svg_mobject import SVG_HASH_TO_MOB_MAP
+    except ImportError:  # older manim without the in-memory SVG cache
+        return 0
+    return sum(_points_nbytes(mob.get_family()) for mob in SVG_HASH_TO_MOB_MAP.values())
+
+
+def current_rss():
+    # Linux: resident pages from /proc; elsewhere fall back to the peak
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Names of construct's locals that are still read at or after each line.
+# Loops are treated as a whole: everything read in a loop is live inside it.
+class _Liveness:
+    def __init__(self, code):
+        source = textwrap.dedent(inspect.getsource(code))
+        tree = ast.parse(source)
+        offset = code.co_firstlineno - 1
+        self.loads = []  # (line, name)
+        self.loops = []  # (first line, last line, names read in the loop)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                self.loads.append((node.lineno + offset, node.id))
+            elif isinstance(node, (ast.For, ast.While)):
+                names = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+                self.loops.append((node.lineno + offset, node.end_lineno + offset, names))
+
+    def live_names(self, line):
+        names = {name for lineno, name in self.loads if lineno >= line}
+        for first, last, loop_names in self.loops:
+            if first <= line <= last:
+                names |= loop_names
+        return names
+
+
+_LIVENESS = {}
+
+
+def _construct_frame():
+    frame = inspect.currentframe()
+    while frame is not None:
+        if frame.f_code.co_name == "construct":
+            return frame
+        frame = frame.f_back
+    return None
+
+
+def _closure_values(function):
+    values = []
+    for cell in getattr(function, "__closure__", None) or ():
+        try:
+            values.append(cell.cell_contents)
+        except ValueError:  # cell not filled yet
+            pass
+    return values
+
+
+# Mobjects reachable from the given roots through containers and attributes
+def _reachable_mobjects(roots):
+    found, seen = set(), set()
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, Mobject):
+            family = obj.get_family()
+            found.update(id(mob) for mob in family)
+            for mob in family:
+                for attr in ("target", "saved_state"):
+                    if getattr(mob, attr, None) is not None:
+                        stack.append(getattr(mob, attr))
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif inspect.isfunction(obj):
+            # always_redraw(lambda: ...) keeps its mobjects in closures
+            stack.extend(_closure_values(obj))
+        elif hasattr(obj, "__dict__") and not isinstance(obj, (type, Scene)) and not callable(obj):
+            stack.extend(vars(obj).values())
+    return found
+
+
+# Members still reachable (ids in keep) are left alone, even in a gone family
+def release_mobject(mob, keep=frozenset()):
+    for member in mob.get_family():
+        if id(member) in keep:
+            continue
+        member.points = np.zeros((0, 3))
+        member.clear_updaters()
+        for attr in ("target", "saved_state"):
+            if getattr(member, attr, None) is not None:
+                setattr(member, attr, None)
+
+
+class MemoryReportMixin:
+    memory_report = _env_flag("MANIM_MEMORY_REPORT")
+    release_faded_mobjects = _env_flag("MANIM_RELEASE_FADED")
+
+    def setup(self):
+        super().setup()
+        if self.memory_report:
+            _track_mobjects()
+        self.memory_reports = []
+        self._seen_on_screen = {}  # id -> mobject that has been in the scene
+
+    def play(self, *args, **kwargs):
+        super().play(*args, **kwargs)
+        if not (self.memory_report or self.release_faded_mobjects):
+            return
+        released = self._release_faded() if self.release_faded_mobjects else 0
+        if self.memory_report:
+            self._record(released)
+
+    def _release_faded(self):
+        on_screen = {id(mob): mob for mob in self.get_mobject_family_members()}
+        self._seen_on_screen.update(on_screen)
+        gone = [mob for key, mob in self._seen_on_screen.items() if key not in on_screen]
+        if not gone:
+            return 0
+
+        frame = _construct_frame()
+        if frame is None:
+            return 0
+        code = frame.f_code
+        if code not in _LIVENESS:
+            try:
+                _LIVENESS[code] = _Liveness(code)
+            except (OSError, SyntaxError):
+                return 0  # no source to analyse, keep everything
+        live = _LIVENESS[code].live_names(frame.f_lineno)
+        roots = [value for name, value in frame.f_locals.items() if name in live and name != "self"]
+        # Anything the scene keeps on itself, apart from this bookkeeping
+        roots.extend(value for name, value in vars(self).items() if name not in ("_seen_on_screen", "memory_reports"))
+        # Updaters of what is on screen may read mobjects that are not on screen
+        for mob in on_screen.values():
+            for updater in mob.get_updaters():
+                roots.extend(_closure_values(updater))
+        keep = _reachable_mobjects(roots) | set(on_screen)
+        del frame
+
+        released = 0
+        for mob in gone:
+            if id(mob) not in keep:
+                release_mobject(mob, keep)
+                del self._seen_on_screen[id(mob)]
+                released += 1
+        if released:
+            gc.collect()
+        return released
+
+    def _record(self, released):
+        live = list(_LIVE_MOBJECTS)
+        report = {
+            "play": self.renderer.num_plays,
+            "time": round(self.renderer.time, 3),
+            "live_mobjects": len(live),
+            "on_screen": len(self.get_mobject_family_members()),
+            "point_bytes": _points_nbytes(live),
+            "svg_cache_bytes": svg_cache_nbytes(),
+            "rss_bytes": current_rss(),
+            "released": released,
+        }
+        self.memory_reports.append(report)
+        logger.info(
+            "play %(play)d: %(live_mobjects)d mobjects (%(on_screen)d on screen), "
+            "points %(point_bytes)d B, svg cache %(svg_cache_bytes)d B, rss %(rss_bytes)d B, "
+            "released %(released)d",
+            report,
+        )
+
+    def tear_down(self):
+        super().tear_down()
+        if self.memory_reports:
+            peak = max(self.memory_reports, key=lambda r: r["rss_bytes"])
+            logger.info("peak rss %d B at play %d", peak["rss_bytes"], peak["play"])
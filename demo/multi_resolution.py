@@ -0,0 +1,273 @@
+# Every output resolution from one run of a scene.
+#
+# Rendering a clip at -ql, -qm and -qh runs its construct, updaters and LaTeX
+# three times. Here the scene runs once, in this process, under a renderer
+# that draws nothing: at each frame it collects the state of the mobjects on
+# screen (points, colors, stroke widths, image pixels) and sends what changed
+# since the last frame to one worker process per resolution. Each worker keeps
+# a flat copy of the scene, rasterizes it with manim's own Camera at its size
+# and pipes the frames into its own ffmpeg, so all outputs are drawn and
+# encoded in parallel and the run takes about as long as the largest output.
+#
+# The scene is stepped at the highest frame rate asked for; each output keeps
+# every k-th frame of a play, which is the frame its own -q run would draw.
+# Holds are sent once and repeated by the workers.
+#
+#   python demo/multi_resolution.py Clip2OLSIntuition            # 480p15, 720p30, 1080p60
+#   python demo/multi_resolution.py Clip5Conclusion -q m h k
+#
+# Outputs go where manim puts them (media_dir/videos/<file>/<height>p<rate>/).
+# Scenes need the default 2D camera; 3D and moving-camera scenes are refused.
+import argparse
+import multiprocessing
+import pickle
+import queue
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+from manim import Camera, ImageMobject, VMobject, config, logger, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.family import extract_mobject_family_members
+
+from cost_estimate import QUALITIES, load_scene_class
+from render_farm import REPO_ROOT, SCENE_FILES
+
+DEFAULT_QUALITIES = ["l", "m", "h"]
+QUEUE_FRAMES = 32  # frames a worker may fall behind before the scene waits for it
+
+# What manim's cairo camera reads from each kind of mobject
+VMOBJECT_STATE = (
+    "points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width",
+    "background_stroke_width", "sheen_factor", "sheen_direction", "joint_type", "cap_style",
+)
+IMAGE_STATE = ("points", "pixel_array", "resampling_algorithm")
+
+MASTER_CONFIG = {
+    "quality": "low_quality",  # the master's camera is never drawn into
+    "write_to_movie": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+    "progress_bar": "none",
+    "preview": False,
+}
+
+
+def _state(mob, attrs):
+    return {attr: np.copy(value) if isinstance(value, np.ndarray) else value
+            for attr in attrs if (value := getattr(mob, attr, None)) is not None}
+
+
+def _same_state(a, b):
+    return a.keys() == b.keys() and all(
+        np.shape(a[k]) == np.shape(b[k]) and np.array_equal(np.asarray(a[k]), np.asarray(b[k])) for k in a
+    )
+
+
+# Flattens the scene into tracks and reports what changed since the last call
+class SceneStateStream:
+    def __init__(self):
+        self.tracks = {}  # id(mob) -> [index, mob, last state sent]
+        self.order = None
+        self.skipped = set()
+
+    def snapshot(self, mobjects, use_z_index):
+        order, changes = [], {}
+        for mob in extract_mobject_family_members(mobjects, use_z_index=use_z_index, only_those_with_points=True):
+            if isinstance(mob, VMobject):
+                kind, attrs = "vector", VMOBJECT_STATE
+            elif isinstance(mob, ImageMobject):
+                kind, attrs = "image", IMAGE_STATE
+            else:
+                if type(mob).__name__ not in self.skipped:
+                    self.skipped.add(type(mob).__name__)
+                    logger.warning("Multi-resolution output skips %s mobjects", type(mob).__name__)
+                continue
+            track = self.tracks.get(id(mob))
+            if track is None:
+                track = self.tracks[id(mob)] = [len(self.tracks), mob, None]  # mob keeps its id from being reused
+            state = _state(mob, attrs)
+            if track[2] is None or not _same_state(state, track[2]):
+                changes[track[0]] = (kind, state)
+                track[2] = state
+            order.append(track[0])
+        if order == self.order:
+            order = None  # unchanged, not sent again
+        else:
+            self.order = order
+        return order, changes
+
+
+class ResolutionWorker:
+    def __init__(self, quality, rate, max_rate, scene_name, scene_file, results):
+        self.quality, self.rate = quality, rate
+        self.inbox = multiprocessing.Queue(QUEUE_FRAMES)
+        self.process = multiprocessing.Process(
+            target=run_worker,
+            args=(quality, rate, max_rate // rate, scene_name, scene_file, self.inbox, results),
+            daemon=True,
+        )
+        self.process.start()
+
+    def send(self, payload):
+        while True:
+            try:
+                self.inbox.put(payload, timeout=1)
+                return
+            except queue.Full:
+                if not self.process.is_alive():
+                    raise RuntimeError(f"{self.quality} worker exited (code {self.process.exitcode})")
+
+
+def _build(kind, state):
+    mob = ImageMobject(state["pixel_array"]) if kind == "image" else VMobject()
+    return _apply(mob, state)
+
+
+def _apply(mob, state):
+    for attr, value in state.items():
+        setattr(mob, attr, value)
+    return mob
+
+
+def open_encoder(path, width, height, rate):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(rate), "-i", "-",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-movflags", "+faststart", str(path),
+    ]
+    return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+
+# Worker process: rebuilds the flat scene from the changes and draws its frames
+def run_worker(quality, rate, step, scene_name, scene_file, inbox, results):
+    start = time.perf_counter()
+    with tempconfig({"quality": quality, "frame_rate": rate}):
+        camera = Camera()
+        path = (Path(config.media_dir) / "videos" / Path(scene_file).stem
+                / f"{camera.pixel_height}p{rate}" / f"{scene_name}.mp4")
+        encoder = open_encoder(path, camera.pixel_width, camera.pixel_height, rate)
+        mobjects, order, frames = {}, [], 0
+        while (message := pickle.loads(inbox.get())) is not None:
+            index, new_order, changes, hold = message
+            for track, (kind, state) in changes.items():
+                mobjects[track] = _apply(mobjects[track], state) if track in mobjects else _build(kind, state)
+            if new_order is not None:
+                order = new_order
+            if hold is None and index % step:
+                continue
+            camera.reset()
+            camera.capture_mobjects([mobjects[track] for track in order])
+            frame = camera.pixel_array.tobytes()
+            repeats = 1 if hold is None else max(int(hold * rate), 1)
+            for _ in range(repeats):
+                encoder.stdin.write(frame)
+            frames += repeats
+        encoder.stdin.close()
+        if encoder.wait():
+            raise RuntimeError(f"ffmpeg failed for {path}")
+    results.put((quality, str(path), frames, time.perf_counter() - start))
+
+
+# Runs the scene at the highest frame rate and hands every frame's changes to the workers
+class FanOutRenderer(CairoRenderer):
+    def __init__(self, workers, **kwargs):
+        super().__init__(**kwargs)
+        self.workers = workers
+        self.stream = SceneStateStream()
+        self.step = min(self.camera.frame_rate // worker.rate for worker in workers)
+        self.scene = None
+
+    def send(self, scene, index, hold=None):
+        order, changes = self.stream.snapshot(scene.mobjects, self.camera.use_z_index)
+        payload = pickle.dumps((index, order, changes, hold), pickle.HIGHEST_PROTOCOL)
+        for worker in self.workers:
+            worker.send(payload)
+
+    def play(self, scene, *args, **kwargs):
+        self.scene = scene
+        super().play(scene, *args, **kwargs)
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+
+    def render(self, scene, time, moving_mobjects):
+        index = round(time * self.camera.frame_rate)
+        if index % self.step == 0:  # frames no output keeps are not even collected
+            self.send(scene, index)
+        self.time += 1 / self.camera.frame_rate
+
+    def freeze_current_frame(self, duration):
+        if self.skip_animations:
+            return super().freeze_current_frame(duration)
+        self.send(self.scene, 0, hold=duration)
+        self.time += int(duration * self.camera.frame_rate) / self.camera.frame_rate
+
+    def finish(self):
+        for worker in self.workers:
+            worker.send(pickle.dumps(None))
+
+
+def render_resolutions(scene_name, qualities=DEFAULT_QUALITIES, rate=None):
+    scene_file = SCENE_FILES[scene_name]
+    outputs = []
+    for q in qualities:
+        with tempconfig({"quality": QUALITIES[q]}):
+            outputs.append((QUALITIES[q], rate or config.frame_rate))
+    max_rate = max(r for _, r in outputs)
+    uneven = [f"{quality} at {r} fps" for quality, r in outputs if max_rate % r]
+    if uneven:
+        raise ValueError(f"frame rates must divide {max_rate}: {', '.join(uneven)}")
+
+    scene_class = load_scene_class(REPO_ROOT / scene_file, scene_name)
+    results = multiprocessing.Queue()
+    workers = [ResolutionWorker(quality, r, max_rate, scene_name, scene_file, results) for quality, r in outputs]
+    start = time.perf_counter()
+    try:
+        with tempconfig({**MASTER_CONFIG, "frame_rate": max_rate}):
+            renderer = FanOutRenderer(workers)
+            scene = scene_class(renderer=renderer)
+            if scene.camera_class is not Camera:
+                raise ValueError(f"{scene_name} uses {scene.camera_class.__name__}; only the default camera can be fanned out")
+            scene.render()
+            renderer.finish()
+        scene_seconds = time.perf_counter() - start
+        finished = []
+        for worker in workers:
+            while True:
+                try:
+                    finished.append(results.get(timeout=1))
+                    break
+                except queue.Empty:
+                    if not any(w.process.is_alive() for w in workers):
+                        raise RuntimeError("a resolution worker exited without finishing")
+    finally:
+        for worker in workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+    print(f"{scene_name}: scene ran once in {scene_seconds:.1f}s, all outputs in {time.perf_counter() - start:.1f}s")
+    for quality, path, frames, seconds in sorted(finished, key=lambda r: r[3]):
+        print(f"  {quality:<18} {frames:>6} frames {seconds:>7.1f}s  {path}")
+    return [path for _, path, _, _ in finished]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a scene at several resolutions from one run")
+    parser.add_argument("scene", choices=sorted(SCENE_FILES))
+    parser.add_argument("-q", "--qualities", nargs="+", default=DEFAULT_QUALITIES, choices=sorted(QUALITIES))
+    parser.add_argument("--rate", type=int, help="one frame rate for every output (default: each quality's own)")
+    args = parser.parse_args()
+    render_resolutions(args.scene, args.qualities, args.rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from manim import *
+import numpy as np
+
+# Formulas with changing numbers, without a TeX run per value.
+#
+# always_redraw(lambda: MathTex(f"b = {b.get_value():.1f}")) compiles (or at
+# best looks up and re-parses) a new formula on every frame a digit changes.
+# NumericReadout compiles the formula once, with a placeholder such as "0.00"
+# where each number goes, and a glyph atlas of "-0123456789." once per process.
+# set_values() then only copies digit outlines into a few preallocated slots
+# and slides the static parts after a number that got wider or narrower.
+#
+#   b_label = NumericReadout(r"b = \text{y-intercept} = ", ReadoutSlot("{:.1f}"))
+#   b_label.add_updater(lambda label: label.set_values(b.get_value()))
+#
+# The readout can be scaled and moved like any VGroup afterwards.
+
+
+class ReadoutSlot:
+    def __init__(self, fmt="{:.2f}", max_chars=None):
+        self.fmt = fmt
+        self.placeholder = fmt.format(0)
+        self.max_chars = max_chars or len(self.placeholder) + 4
+
+
+_ATLAS = {}
+
+
+# Glyph outlines relative to (left edge, baseline) and the advance of each
+# character, measured from how TeX sets them next to each other.
+def glyph_atlas():
+    if "glyphs" not in _ATLAS:
+        chars = ["-", *"0123456789", ".", "0"]
+        atlas = MathTex(*chars)
+        baseline = atlas[2].get_bottom()[1]  # "1" sits on the baseline
+        glyphs, advances = {}, {}
+        for i, (char, part) in enumerate(zip(chars[:-1], atlas[:-1])):
+            points = np.concatenate([m.points for m in part.family_members_with_points()])
+            glyphs[char] = points - [part.get_left()[0], baseline, 0]
+            advances[char] = atlas[i + 1].get_left()[0] - part.get_left()[0]
+        _ATLAS.update(glyphs=glyphs, advances=advances)
+    return _ATLAS["glyphs"], _ATLAS["advances"]
+
+
+class NumericReadout(VGroup):
+    def __init__(self, *parts, **kwargs):
+        super().__init__()
+        self.slots_spec = [part for part in parts if isinstance(part, ReadoutSlot)]
+        tex_parts = [part.placeholder if isinstance(part, ReadoutSlot) else part for part in parts]
+        template = MathTex(*tex_parts, **kwargs)
+        glyphs, advances = glyph_atlas()
+        # Match the atlas to the template's size via the first placeholder
+        i, slot = next((i, part) for i, part in enumerate(parts) if isinstance(part, ReadoutSlot))
+        placeholder_points = np.concatenate([glyphs[c] for c in slot.placeholder])
+        low, high = placeholder_points[:, 1].min(), placeholder_points[:, 1].max()
+        self.glyph_scale = template[i].height / (high - low)
+        baseline = template[i].get_bottom()[1] - low * self.glyph_scale
+
+        # Invisible reference segment from (left, baseline): maps the readout's
+        # own coordinates to the scene after any scale/shift
+        origin = np.array([template.get_left()[0], baseline, 0])
+        self.reference = VMobject(stroke_opacity=0, fill_opacity=0)
+        self.reference.set_points_as_corners([origin, origin + RIGHT * min(0.1, template.width)])
+        self._reference_length = min(0.1, template.width)
+        self.add(self.reference)
+
+        # (kind, mobject or slots, left in local units, placeholder advance)
+        self.segments = []
+        for part, tex in zip(parts, template):
+            left = tex.get_left()[0] - origin[0]
+            if isinstance(part, ReadoutSlot):
+                color = tex.family_members_with_points()[0].get_fill_color()
+                slots = [VMobject(fill_color=color, fill_opacity=1, stroke_width=0) for _ in range(part.max_chars)]
+                self.add(*slots)
+                width = sum(advances[c] for c in part.placeholder) * self.glyph_scale
+                self.segments.append(["number", slots, left, width, part])
+            else:
+                self.add(tex)
+                self.segments.append(["static", tex, left, 0.0, 0.0])  # last: shift applied so far
+        self.texts = None
+        self.set_values(*[0] * len(self.slots_spec))
+
+    def _frame(self):
+        start, end = self.reference.points[0], self.reference.points[-1]
+        return start, np.linalg.norm(end - start) / self._reference_length
+
+    def set_values(self, *values):
+        texts = [slot.fmt.format(value) for slot, value in zip(self.slots_spec, values)]
+        if texts == self.texts:
+            return self
+        glyphs, advances = glyph_atlas()
+        origin, unit = self._frame()
+        texts_iter = iter(texts)
+        shift = 0.0  # how far everything right of the last number moved, local units
+        for segment in self.segments:
+            kind, target, left = segment[0], segment[1], segment[2]
+            if kind == "static":
+                if shift != segment[4]:
+                    target.shift(RIGHT * (shift - segment[4]) * unit)
+                    segment[4] = shift
+                continue
+            text = next(texts_iter)
+            if len(text) > len(target) or any(c not in glyphs for c in text):
+                raise ValueError(f"NumericReadout cannot show {text!r}")
+            x = left + shift
+            for i, slot in enumerate(target):
+                if i < len(text):
+                    slot.set_points((glyphs[text[i]] * self.glyph_scale + [x, 0, 0]) * unit + origin)
+                    x += advances[text[i]] * self.glyph_scale
+                else:
+                    slot.set_points(np.zeros((0, 3)))
+            shift += (x - left - shift) - segment[3]
+        self.texts = texts
+        return self
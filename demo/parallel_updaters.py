@@ -0,0 +1,183 @@
+from manim import *
+import inspect
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Runs a frame's independent updaters at the same time.
+#
+# Scene.update_mobjects calls every mobject's updaters one after another. In
+# Clip1's sweeps each always_redraw label rebuilds a MathTex per frame, and a
+# new string means a latex + dvisvgm run; the labels wait for each other's
+# subprocesses although none of them reads another.
+#
+# ParallelUpdatersMixin builds a dependency graph instead: an updater reads the
+# mobjects its closures, default arguments and globals reach (trackers, axes,
+# other redrawn mobjects) and writes the mobject it is attached to. Updaters are
+# run level by level in dependency order, and all updaters of one level go to a
+# thread pool. Threads waiting on a LaTeX subprocess release the GIL, so a frame
+# in which several labels change costs about as much as the slowest label.
+#
+# That model cannot see every read, nor a write to some other mobject, so only
+# mobjects marked with parallel_safe() take part: the mark promises that their
+# updaters write nothing outside their own family. Every other mobject's
+# updaters run on this thread, in scene order, between the parallel batches.
+#
+#   label = parallel_safe(always_redraw(lambda: MathTex(f"m = {m.get_value():.2f}")))
+
+
+def _closure_values(function):
+    values = []
+    for cell in getattr(function, "__closure__", None) or ():
+        try:
+            values.append(cell.cell_contents)
+        except ValueError:  # cell not filled yet
+            pass
+    return values
+
+
+# Globals a function's code (and the lambdas defined in it) refers to
+def _global_values(function):
+    names, codes = set(), [function.__code__]
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes.extend(const for const in code.co_consts if inspect.iscode(const))
+    scope = function.__globals__
+    return [scope[name] for name in names if name in scope and not inspect.ismodule(scope[name])]
+
+
+def parallel_safe(mob):
+    mob.parallel_updaters = True
+    return mob
+
+
+# Mobjects an updater can read, through closures, default arguments, globals,
+# bound methods (and their object's attributes) and containers
+def updater_reads(updater):
+    found, seen = {}, set()
+    stack = [updater]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, Mobject):
+            found[id(obj)] = obj
+        elif inspect.ismethod(obj):
+            stack.append(obj.__func__)
+            owner = obj.__self__
+            stack.extend([owner] if isinstance(owner, Mobject) or not hasattr(owner, "__dict__") else vars(owner).values())
+        elif inspect.isfunction(obj):
+            stack.extend(_closure_values(obj))
+            stack.extend(obj.__defaults__ or ())
+            stack.extend((obj.__kwdefaults__ or {}).values())
+            stack.extend(_global_values(obj))
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+    return list(found.values())
+
+
+# Scene mobjects with updaters, grouped into levels; each level only reads
+# what earlier levels (or no updater at all) write.
+def updater_levels(mobjects):
+    mobjects = [mob for mob in mobjects if mob.get_family_updaters()]
+    writer_of = {}
+    for index, mob in enumerate(mobjects):
+        for member in mob.get_family():
+            writer_of[id(member)] = index
+
+    depends_on = []
+    for index, mob in enumerate(mobjects):
+        needs = set()
+        for updater in mob.get_family_updaters():
+            for read in updater_reads(updater):
+                for member in read.get_family():
+                    writer = writer_of.get(id(member))
+                    if writer is not None and writer != index:
+                        needs.add(writer)
+        depends_on.append(needs)
+
+    levels, done = [], set()
+    remaining = list(range(len(mobjects)))
+    while remaining:
+        ready = [i for i in remaining if depends_on[i] <= done]
+        if not ready:
+            # A cycle: keep the scene order for what is left
+            ready = remaining[:1]
+        levels.append([mobjects[i] for i in ready])
+        done.update(ready)
+        remaining = [i for i in remaining if i not in done]
+    return levels
+
+
+# Two threads compiling the same expression would write the same .tex/.svg
+# files; let one compile and the other find the result in the cache.
+_TEX_LOCKS = defaultdict(threading.Lock)
+_TEX_LOCKS_GUARD = threading.Lock()
+
+
+def serialize_same_tex():
+    from manim.mobject.text import tex_mobject
+
+    original = getattr(tex_mobject, "tex_to_svg_file", None)
+    if original is None or getattr(original, "_keyed", False):
+        return
+
+    def tex_to_svg_file(expression, *args, **kwargs):
+        with _TEX_LOCKS_GUARD:
+            lock = _TEX_LOCKS[expression]
+        with lock:
+            return original(expression, *args, **kwargs)
+
+    tex_to_svg_file._keyed = True
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+
+class ParallelUpdatersMixin:
+    updater_workers = os.cpu_count() or 1
+
+    def setup(self):
+        super().setup()
+        serialize_same_tex()
+        self._updater_pool = ThreadPoolExecutor(max_workers=self.updater_workers)
+        self._updater_levels_key = None
+
+    # Scene order cut into steps: a marked run becomes its levels, any other
+    # mobject with updaters is a level of its own
+    def _get_updater_levels(self):
+        # Rebuilt only when mobjects or updaters are added or removed
+        key = tuple(
+            (id(mob), getattr(mob, "parallel_updaters", False), tuple(id(u) for u in mob.get_family_updaters()))
+            for mob in self.mobjects
+        )
+        if key != self._updater_levels_key:
+            levels, batch = [], []
+            for mob in self.mobjects:
+                if not mob.get_family_updaters():
+                    continue
+                if getattr(mob, "parallel_updaters", False):
+                    batch.append(mob)
+                    continue
+                levels += updater_levels(batch) + [[mob]]
+                batch = []
+            self._updater_levels = levels + updater_levels(batch)
+            self._updater_levels_key = key
+        return self._updater_levels
+
+    def update_mobjects(self, dt):
+        for level in self._get_updater_levels():
+            if len(level) == 1 or self.updater_workers < 2:
+                for mob in level:
+                    mob.update(dt)
+                continue
+            futures = [self._updater_pool.submit(mob.update, dt) for mob in level]
+            for future in futures:
+                future.result()
+
+    def tear_down(self):
+        super().tear_down()
+        self._updater_pool.shutdown()
@@ -0,0 +1,347 @@
+# Render farm coordinator for the lecture scenes.
+#
+# The coordinator shards scenes into tasks (scene + quality + animation range),
+# drops them into a filesystem queue and lets worker processes claim them.
+# A task is claimed by atomically renaming its file from pending/ to running/,
+# so the same spool directory works for local workers and, once it lives on a
+# shared mount, for workers on other machines running `render_farm.py worker`.
+#
+# Spool layout:
+#   pending/<task>.json   waiting to be claimed
+#   running/<task>.json   claimed by a worker (mtime is the heartbeat)
+#   done/<task>.json      finished, "output" points at the rendered chunk
+#   failed/<task>.json    gave up after max_attempts
+#   media/<task>/         per-task media_dir so workers never clobber each other
+#   cache/                content-addressed asset cache shared by all workers
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from multiprocessing import Process
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Scene class -> file that defines it (relative to the repo root)
+SCENE_FILES = {
+    "Clip1LinearReview": "demo/clip1_linear_review.py",
+    "Clip2OLSIntuition": "demo/clip2_OLS.py",
+    "Clip3GradientDescent": "demo/clip3_gradient_descent.py",
+    "Clip4RealLifeExample": "demo/clip4_real_life_example.py",
+    "Clip4DensityExample": "demo/clip4_density_example.py",
+    "Clip5Conclusion": "demo/clip5_conclusion.py",
+    "FullRegressionDemo": "demo/full_regression_demo.py",
+    "ConvexBallIllustration": "convex_ball.py",
+    "MatrixOLSProjection": "ols_projection.py",
+}
+
+QUALITY_FLAGS = {"l": "-ql", "m": "-qm", "h": "-qh", "p": "-qp", "k": "-qk"}
+
+QUEUE_DIRS = ("pending", "running", "done", "failed")
+
+HEARTBEAT_INTERVAL = 5.0  # seconds between heartbeats of a busy worker
+STALE_AFTER = 60.0  # a running task without heartbeat for this long is requeued
+
+
+def init_spool(spool):
+    spool = Path(spool)
+    for name in QUEUE_DIRS + ("media", "cache"):
+        (spool / name).mkdir(parents=True, exist_ok=True)
+    write_shared_config(spool)
+    return spool
+
+
+# All workers point manim's tex/text dirs at the same cache. Manim names those
+# files after a hash of their content, so the directories are content-addressed
+# and a formula compiled by one worker is a cache hit for every other worker.
+def write_shared_config(spool):
+    cache = (Path(spool) / "cache").resolve()
+    cfg = Path(spool) / "farm.cfg"
+    cfg.write_text(
+        "[CLI]\n"
+        f"tex_dir = {cache / 'Tex'}\n"
+        f"text_dir = {cache / 'texts'}\n"
+        "progress_bar = none\n"
+    )
+    return cfg
+
+
+def make_task(scene, quality="h", section=None, max_attempts=3):
+    if scene not in SCENE_FILES:
+        raise ValueError(f"Unknown scene '{scene}', expected one of {sorted(SCENE_FILES)}")
+    if quality not in QUALITY_FLAGS:
+        raise ValueError(f"Unknown quality '{quality}', expected one of {sorted(QUALITY_FLAGS)}")
+    return {
+        "id": f"{scene}-{quality}-{uuid.uuid4().hex[:8]}",
+        "scene": scene,
+        "file": SCENE_FILES[scene],
+        "quality": quality,
+        # [start, end) animation numbers, passed to manim as -n start,end
+        "section": list(section) if section else None,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "error": None,
+        "output": None,
+    }
+
+
+# Split a scene into tasks of `chunk` animations each. Without a known number of
+# animations the scene is rendered as a single task.
+def shard(scene, quality="h", num_animations=None, chunk=None, max_attempts=3):
+    if not num_animations or not chunk:
+        return [make_task(scene, quality, None, max_attempts)]
+    return [
+        make_task(scene, quality, (start, min(start + chunk, num_animations)), max_attempts)
+        for start in range(0, num_animations, chunk)
+    ]
+
+
+def _write_json(path, data):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def submit(spool, tasks):
+    spool = init_spool(spool)
+    for index, task in enumerate(tasks):
+        task["order"] = index
+        _write_json(spool / "pending" / f"{task['id']}.json", task)
+    return [task["id"] for task in tasks]
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return math.inf  # claimed by another worker while we listed
+
+
+def claim(spool):
+    # Oldest pending task first; rename is atomic, so losing a race just means
+    # another worker got there first and we try the next one.
+    pending = sorted((Path(spool) / "pending").glob("*.json"), key=_mtime)
+    for path in pending:
+        target = Path(spool) / "running" / path.name
+        try:
+            os.rename(path, target)
+        except (FileNotFoundError, OSError):
+            continue
+        return target
+    return None
+
+
+def build_command(task, spool):
+    media_dir = (Path(spool) / "media" / task["id"]).resolve()
+    cmd = [
+        sys.executable, "-m", "manim", "render",
+        QUALITY_FLAGS[task["quality"]],
+        "--config_file", str((Path(spool) / "farm.cfg").resolve()),
+        "--media_dir", str(media_dir),
+    ]
+    if task["section"]:
+        # manim's -n end is inclusive
+        cmd += ["-n", f"{task['section'][0]},{task['section'][1] - 1}"]
+    cmd += [str(REPO_ROOT / task["file"]), task["scene"]]
+    return cmd, media_dir
+
+
+def find_output(media_dir, scene):
+    # The chunk movie, not the partial movie files it was stitched from
+    for suffix in (".mp4", ".mov", ".png"):
+        for path in Path(media_dir).rglob(f"{scene}*{suffix}"):
+            if "partial_movie_files" not in path.parts:
+                return path
+    return None
+
+
+def run_task(task, spool):
+    cmd, media_dir = build_command(task, spool)
+    running = Path(spool) / "running" / f"{task['id']}.json"
+    media_dir.mkdir(parents=True, exist_ok=True)
+    log_path = media_dir / "manim.log"
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(cmd, cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT)
+        # Touch the task file while manim runs so the coordinator knows we are alive
+        while True:
+            running.touch()
+            try:
+                process.wait(timeout=HEARTBEAT_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                continue
+    if process.returncode != 0:
+        raise RuntimeError(f"manim exited with {process.returncode}:\n{log_path.read_text()[-2000:]}")
+    output = find_output(media_dir, task["scene"])
+    if output is None:
+        raise RuntimeError(f"manim finished but no output was found in {media_dir}")
+    return output
+
+
+def finish(spool, path, task, error=None, output=None):
+    task["attempts"] += 1
+    if error is None:
+        task["output"] = str(output)
+        task["error"] = None
+        destination = "done"
+    else:
+        task["error"] = error
+        destination = "failed" if task["attempts"] >= task["max_attempts"] else "pending"
+    _write_json(path, task)
+    os.replace(path, Path(spool) / destination / path.name)
+
+
+def worker_loop(spool, idle_exit=None):
+    spool = Path(spool)
+    idle_since = time.monotonic()
+    while True:
+        path = claim(spool)
+        if path is None:
+            if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                return
+            time.sleep(0.5)
+            continue
+        task = json.loads(path.read_text())
+        try:
+            output = run_task(task, spool)
+        except Exception as error:  # keep the worker alive, the task is retried
+            finish(spool, path, task, error=str(error))
+        else:
+            finish(spool, path, task, output=output)
+        idle_since = time.monotonic()
+
+
+# Tasks whose worker died (no heartbeat) go back to the pending queue
+def requeue_stale(spool, stale_after=STALE_AFTER):
+    now = time.time()
+    for path in (Path(spool) / "running").glob("*.json"):
+        try:
+            if now - path.stat().st_mtime > stale_after:
+                task = json.loads(path.read_text())
+                finish(spool, path, task, error="worker stopped sending heartbeats")
+        except FileNotFoundError:
+            continue  # finished while we were looking
+
+
+def queue_counts(spool):
+    return {name: len(list((Path(spool) / name).glob("*.json"))) for name in QUEUE_DIRS}
+
+
+def collect(spool, task_ids):
+    done = {}
+    for task_id in task_ids:
+        path = Path(spool) / "done" / f"{task_id}.json"
+        if path.exists():
+            task = json.loads(path.read_text())
+            done[task_id] = task
+    return done
+
+
+# Stitch the chunks of one scene back together, in section order
+def concat_outputs(outputs, destination):
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if len(outputs) == 1:
+        destination.write_bytes(Path(outputs[0]).read_bytes())
+        return destination
+    list_file = destination.with_suffix(".txt")
+    list_file.write_text("".join(f"file '{Path(p).resolve()}'\n" for p in outputs))
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+         "-i", str(list_file), "-c", "copy", str(destination)],
+        check=True,
+    )
+    list_file.unlink()
+    return destination
+
+
+def run_local(spool, tasks, workers=None, output_dir=None, poll=1.0):
+    spool = init_spool(spool)
+    task_ids = submit(spool, tasks)
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    pool = [Process(target=worker_loop, args=(str(spool),), daemon=True) for _ in range(workers)]
+    for process in pool:
+        process.start()
+    try:
+        while True:
+            requeue_stale(spool)
+            counts = queue_counts(spool)
+            finished = len(collect(spool, task_ids))
+            failed = [t for t in task_ids if (spool / "failed" / f"{t}.json").exists()]
+            if finished + len(failed) == len(task_ids):
+                break
+            # Restart workers that crashed so the pool keeps its size
+            for i, process in enumerate(pool):
+                if not process.is_alive():
+                    pool[i] = Process(target=worker_loop, args=(str(spool),), daemon=True)
+                    pool[i].start()
+            print(f"pending={counts['pending']} running={counts['running']} done={counts['done']} failed={counts['failed']}")
+            time.sleep(poll)
+    finally:
+        for process in pool:
+            process.terminate()
+
+    results = collect(spool, task_ids)
+    movies = {}
+    output_dir = Path(output_dir or spool / "output")
+    by_scene = {}
+    for task in sorted(results.values(), key=lambda t: t["order"]):
+        by_scene.setdefault((task["scene"], task["quality"]), []).append(task["output"])
+    for (scene, quality), outputs in by_scene.items():
+        suffix = Path(outputs[0]).suffix
+        movies[(scene, quality)] = concat_outputs(outputs, output_dir / f"{scene}_{quality}{suffix}")
+    return movies, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render lecture scenes on a pool of workers")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="shard scenes and render them with a local worker pool")
+    run.add_argument("scenes", nargs="+", choices=sorted(SCENE_FILES))
+    run.add_argument("--quality", "-q", default="h", choices=sorted(QUALITY_FLAGS))
+    run.add_argument("--animations", type=int, help="number of animations per scene (enables sharding)")
+    run.add_argument("--chunk", type=int, help="animations per task")
+    run.add_argument("--workers", type=int)
+    run.add_argument("--retries", type=int, default=3)
+    run.add_argument("--spool", default="media/farm")
+    run.add_argument("--output", help="where to put the stitched movies")
+
+    worker = sub.add_parser("worker", help="claim and render tasks from an existing spool")
+    worker.add_argument("--spool", default="media/farm")
+    worker.add_argument("--idle-exit", type=float, help="exit after this many idle seconds")
+
+    status = sub.add_parser("status", help="show queue sizes")
+    status.add_argument("--spool", default="media/farm")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        tasks = []
+        for scene in args.scenes:
+            tasks += shard(scene, args.quality, args.animations, args.chunk, args.retries)
+        movies, failed = run_local(args.spool, tasks, args.workers, args.output)
+        for (scene, quality), path in movies.items():
+            print(f"{scene} ({quality}): {path}")
+        for task_id in failed:
+            print(f"FAILED: {task_id}")
+        sys.exit(1 if failed else 0)
+    elif args.command == "worker":
+        init_spool(args.spool)
+        worker_loop(args.spool, args.idle_exit)
+    else:
+        print(queue_counts(args.spool))
+
+
+if __name__ == "__main__":
+    main()
+
+# To render the lecture on 4 local workers:
+#   python demo/render_farm.py run Clip1LinearReview Clip2OLSIntuition Clip4RealLifeExample Clip5Conclusion --workers 4
+# To shard one clip into 10-animation chunks:
+#   python demo/render_farm.py run Clip4RealLifeExample --animations 80 --chunk 10
+# Extra machines join by running a worker against the same (shared) spool:
+#   python demo/render_farm.py worker --spool /mnt/shared/farm
@@ -0,0 +1,156 @@
+import hashlib
+import math
+
+import numpy as np
+
+# Reproducible scene inputs.
+#
+# Content-addressed caches (tex, segments, golden frames) only hit when a scene
+# builds bit-identical numbers. Two things get in the way: the global
+# np.random state, which any import or earlier scene can advance, and
+# reductions such as np.mean, np.polyfit and BLAS dot products, whose last bits
+# depend on summation order, SIMD width and thread count.
+#
+# So every random draw comes from a named stream: a PCG64 generator seeded from
+# ROOT_SEED and a hash of the stream's name, independent of every other stream
+# and of what ran before. Sums over data go through math.fsum, which is
+# correctly rounded and so gives the same float on every machine.
+# canonical_hash() gives datasets and statistics a digest that only depends on
+# their values, for caches to key on.
+#
+#   inputs = SceneInputs("clip2")
+#   noise = inputs.rng("noise").normal(0, 0.8, size=8)
+#   x = inputs.add("x", np.array([1, 1.5, 2.5]))
+#   inputs.digest()
+#
+# A scene keeps its SceneInputs as self.scene_inputs. The segment cache puts its
+# digest into every segment key and the golden-frame check stores it with the
+# goldens, so a changed dataset is reported as such rather than as a drawing
+# change. Tex and glyph caches are keyed on the exact strings, which already
+# follow from these values.
+#
+# NumPy only promises the same Generator output within a version; inputs are
+# hashed by value, so a different stream after an upgrade changes the digest
+# rather than producing a false cache hit.
+
+ROOT_SEED = 0
+
+
+def _name_key(name):
+    digest = hashlib.sha256(name.encode()).digest()
+    return tuple(int.from_bytes(digest[i : i + 4], "little") for i in range(0, 16, 4))
+
+
+def stream(name, root_seed=ROOT_SEED):
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(root_seed, spawn_key=_name_key(name))))
+
+
+def _canonical(value, digest):
+    if isinstance(value, (np.ndarray, np.generic)):
+        array = np.ascontiguousarray(value)
+        if array.dtype.kind == "f":
+            array = np.where(np.isnan(array), np.nan, array + 0.0)  # one NaN, no -0.0
+        array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+        digest.update(f"a{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    elif value is None:
+        digest.update(b"n")
+    elif isinstance(value, bool):
+        digest.update(b"b1" if value else b"b0")
+    elif isinstance(value, int):
+        digest.update(f"i{value};".encode())
+    elif isinstance(value, float):
+        digest.update(f"f{'nan' if math.isnan(value) else (value + 0.0).hex()};".encode())
+    elif isinstance(value, str):
+        encoded = value.encode()
+        digest.update(f"s{len(encoded)}:".encode() + encoded)
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"l{len(value)}:".encode())
+        for item in value:
+            _canonical(item, digest)
+    elif isinstance(value, dict):
+        digest.update(f"d{len(value)}:".encode())
+        for key in sorted(value, key=canonical_hash):
+            _canonical(key, digest)
+            _canonical(value[key], digest)
+    else:
+        raise TypeError(f"canonical_hash cannot hash {type(value).__name__}")
+
+
+# Same digest for the same values on any machine, run or Python process
+def canonical_hash(value):
+    digest = hashlib.sha256()
+    _canonical(value, digest)
+    return digest.hexdigest()
+
+
+def exact_sum(values):
+    return math.fsum(np.asarray(values, dtype=float).ravel().tolist())
+
+
+# Sums and the least-squares line, correctly rounded instead of BLAS-ordered
+class StableStatistics:
+    def __init__(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.n = len(x)
+        self.sx, self.sy = exact_sum(x), exact_sum(y)
+        self.x_mean, self.y_mean = self.sx / self.n, self.sy / self.n
+        dx, dy = x - self.x_mean, y - self.y_mean
+        self.sxx_centered = exact_sum(dx * dx)
+        self.sxy_centered = exact_sum(dx * dy)
+
+    # The same sums over data read a chunk at a time, such as a memmapped .npy:
+    # one pass for the means, one for the centered sums. Each chunk is summed
+    # exactly, so results depend on the chunk size but not on the machine.
+    @classmethod
+    def from_chunks(cls, chunks):
+        stats = cls.__new__(cls)
+        n, sx, sy = 0, [], []
+        for x, y in chunks():
+            n += len(x)
+            sx.append(exact_sum(x))
+            sy.append(exact_sum(y))
+        stats.n, stats.sx, stats.sy = n, math.fsum(sx), math.fsum(sy)
+        stats.x_mean, stats.y_mean = stats.sx / n, stats.sy / n
+        sxx, sxy = [], []
+        for x, y in chunks():
+            dx, dy = x - stats.x_mean, y - stats.y_mean
+            sxx.append(exact_sum(dx * dx))
+            sxy.append(exact_sum(dx * dy))
+        stats.sxx_centered, stats.sxy_centered = math.fsum(sxx), math.fsum(sxy)
+        return stats
+
+    def ols(self):
+        m = self.sxy_centered / self.sxx_centered
+        return m, self.y_mean - m * self.x_mean
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in ("n", "sx", "sy", "sxx_centered", "sxy_centered")}
+
+
+class SceneInputs:
+    def __init__(self, scope, root_seed=ROOT_SEED):
+        self.scope = scope
+        self.root_seed = root_seed
+        self.values = {}
+        self._digest = None
+
+    def rng(self, name):
+        return stream(f"{self.scope}.{name}", self.root_seed)
+
+    # Registers a dataset or derived value under the digest and returns it
+    def add(self, name, value):
+        self.values[name] = value
+        self._digest = None
+        return value
+
+    def digest(self):
+        if self._digest is None:
+            self._digest = canonical_hash([self.scope, self.values])
+        return self._digest
+
+
+def scene_inputs_digest(scene):
+    inputs = getattr(scene, "scene_inputs", None)
+    return inputs.digest() if inputs is not None else None
@@ -0,0 +1,325 @@
+from manim import *
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.hashing import get_hash_from_play_call
+
+from scene_inputs import scene_inputs_digest
+from vfr_holds import VFRHoldsMixin, VFRRenderer
+
+# Persistent cache of rasterized frames, shared by every scene.
+#
+# manim skips a play whose partial movie already exists in the scene's own
+# partial movie directory. Anything else, such as the same animations inside
+# FullRegressionDemo, a render with caching disabled or a VFR render, rasterizes
+# every frame again. With MANIM_SEGMENT_CACHE=1 the frames each play hands to
+# the encoder are also stored under media_dir/segment_cache. The key is
+# manim's hash of the play call plus the resolution, frame rate and background.
+# Scenes that register their data in self.scene_inputs also get its digest
+# in the key. When the same play comes up again, its frames are memory-mapped from that file
+# and piped to the encoder; the animation still runs, so the scene state is the
+# same afterwards, but nothing is drawn. VFR and CFR renders hand holds to the
+# encoder differently, so they keep separate segments; a replay that still
+# goes out of step with its play falls back to drawing the rest of it.
+#
+# Frames are stored raw (one np.memmap per segment), or zlib-compressed per
+# frame with MANIM_SEGMENT_CACHE_COMPRESS=1, which is much smaller for flat
+# slides but costs an inflate per frame. Least recently used segments are
+# evicted beyond MANIM_SEGMENT_CACHE_GB.
+#
+#   MANIM_SEGMENT_CACHE=1 manim -pqh demo/clip2_OLS.py Clip2OLSIntuition
+#   python demo/segment_cache.py stats
+
+DEFAULT_MAX_GB = 10
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def default_root():
+    return Path(config.media_dir) / "segment_cache"
+
+
+def segment_key(scene, camera, vfr=False):
+    play_hash = get_hash_from_play_call(scene, camera, scene.animations, scene.mobjects)
+    settings = (camera.pixel_width, camera.pixel_height, camera.frame_rate, str(camera.background_color), vfr,
+                scene_inputs_digest(scene))
+    return hashlib.sha256(f"{play_hash}{settings}".encode()).hexdigest()[:32]
+
+
+class SegmentCache:
+    def __init__(self, root=None, max_bytes=None, compress=None):
+        self.root = Path(root or default_root())
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+        if max_bytes is None:
+            max_bytes = float(os.environ.get("MANIM_SEGMENT_CACHE_GB", DEFAULT_MAX_GB)) * 1e9
+        self.max_bytes = max_bytes
+        self.compress = _env_flag("MANIM_SEGMENT_CACHE_COMPRESS") if compress is None else compress
+        self.index = self._load_index()
+        self._touched = {}  # key -> entry, written back by save()
+        self._counts = {}  # scene -> [hits, misses] since the last save()
+
+    def _load_index(self):
+        try:
+            return json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {"segments": {}, "scenes": {}}
+
+    def _data_path(self, key):
+        return self.root / f"{key}.frames"
+
+    def lookup(self, key, scene_name):
+        entry = self.index["segments"].get(key)
+        hit = entry is not None and self._data_path(key).exists()
+        self._counts.setdefault(scene_name, [0, 0])[0 if hit else 1] += 1
+        if not hit:
+            return None
+        entry["last_used"] = time.time()
+        self._touched[key] = entry
+        return SegmentReplay(self._data_path(key), entry)
+
+    def record(self, key, scene_name):
+        return SegmentRecording(self, key, scene_name)
+
+    def _store(self, key, entry):
+        self.index["segments"][key] = entry
+        self._touched[key] = entry
+
+    # Merges with whatever other processes wrote since we loaded, then evicts
+    def save(self):
+        index = self._load_index()
+        index["segments"].update(self._touched)
+        for scene_name, (hits, misses) in self._counts.items():
+            counts = index["scenes"].setdefault(scene_name, {"hits": 0, "misses": 0})
+            counts["hits"] += hits
+            counts["misses"] += misses
+        self._evict(index)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, indent=1))
+        os.replace(tmp, self.index_path)
+        self.index, self._touched, self._counts = index, {}, {}
+
+    def _evict(self, index):
+        segments = index["segments"]
+        total = sum(entry["bytes"] for entry in segments.values())
+        for key in sorted(segments, key=lambda k: segments[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= segments.pop(key)["bytes"]
+            self._data_path(key).unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.root.glob("*.frames"):
+            path.unlink()
+        self.index_path.unlink(missing_ok=True)
+        self.index = self._load_index()
+
+
+# One add_frame call: where its frame is in the data file and how often it repeats
+class SegmentRecording:
+    def __init__(self, cache, key, scene_name):
+        self.cache, self.key, self.scene_name = cache, key, scene_name
+        self.path = cache.root / f"{key}.{os.getpid()}.partial"  # concurrent renders of a play each write their own
+        self.file = open(self.path, "wb")
+        self.calls = []  # [offset, length, num_frames]
+        self.shape = None
+
+    def frame(self, frame, num_frames):
+        data = np.ascontiguousarray(frame)
+        self.shape = list(data.shape)
+        raw = data.tobytes()
+        if self.cache.compress:
+            raw = zlib.compress(raw, 1)
+        self.calls.append([self.file.tell(), len(raw), num_frames])
+        self.file.write(raw)
+        return frame
+
+    def finish(self):
+        self.file.close()
+        if not self.calls:
+            self.path.unlink(missing_ok=True)
+            return
+        data_path = self.cache._data_path(self.key)
+        os.replace(self.path, data_path)
+        self.cache._store(self.key, {
+            "scene": self.scene_name,
+            "shape": self.shape,
+            "compressed": self.cache.compress,
+            "calls": self.calls,
+            "bytes": data_path.stat().st_size,
+            "last_used": time.time(),
+        })
+
+    def abort(self):
+        self.file.close()
+        self.path.unlink(missing_ok=True)
+
+
+class SegmentReplay:
+    def __init__(self, path, entry):
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        self.shape = tuple(entry["shape"])
+        self.compressed = entry["compressed"]
+        self.calls = entry["calls"]
+        self.position = 0
+
+    @property
+    def exhausted(self):
+        return self.position >= len(self.calls)
+
+    def matches(self, num_frames):
+        return not self.exhausted and self.calls[self.position][2] == num_frames
+
+    def frame(self, frame, num_frames):
+        offset, length, _ = self.calls[self.position]
+        self.position += 1
+        block = self.data[offset : offset + length]
+        if self.compressed:
+            return np.frombuffer(zlib.decompress(block), dtype=np.uint8).reshape(self.shape)
+        return block.reshape(self.shape)
+
+    def finish(self):
+        if not self.exhausted:
+            logger.warning("Segment replay used %d of %d frames", self.position, len(self.calls))
+
+    def abort(self):
+        pass
+
+
+# Renderer mixin. The key is taken right after a play's animations are
+# compiled; the lookup waits for the first frame, by which time manim has
+# decided whether to skip the play or take its partial movie from its own cache.
+class SegmentCaching:
+    def __init__(self, *args, segment_cache=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.segment_cache = segment_cache or SegmentCache()
+        self.segment = None
+        self.scene = None
+        self._pending = None  # (key, scene name) of the current play
+
+    def play(self, scene, *args, **kwargs):
+        compile_animation_data = scene.compile_animation_data
+        self.scene = scene
+
+        def compile_and_key(*a, **k):
+            compile_animation_data(*a, **k)
+            if not self.skip_animations:
+                key = segment_key(scene, self.camera, vfr=isinstance(self, VFRRenderer))
+                self._pending = (key, type(scene).__name__)
+
+        scene.compile_animation_data = compile_and_key
+        try:
+            super().play(scene, *args, **kwargs)
+            if self.segment is not None:
+                self.segment.finish()
+        except BaseException:
+            if self.segment is not None:
+                self.segment.abort()
+            raise
+        finally:
+            del scene.compile_animation_data
+            self.segment = self._pending = None
+
+    def _current_segment(self):
+        if self._pending is not None and not self.skip_animations:
+            key, scene_name = self._pending
+            self._pending = None
+            self.segment = self.segment_cache.lookup(key, scene_name)
+            if self.segment is not None:
+                logger.info("Animation %d: frames from the segment cache (%s)", self.num_plays, key)
+            else:
+                self.segment = self.segment_cache.record(key, scene_name)
+        return self.segment
+
+    def update_frame(self, *args, **kwargs):
+        segment = self._current_segment()
+        if isinstance(segment, SegmentReplay) and not segment.exhausted:
+            return  # the frame comes from the cache, nothing to draw
+        super().update_frame(*args, **kwargs)
+
+    def add_frame(self, frame, num_frames=1):
+        segment = self._current_segment()
+        if isinstance(segment, SegmentReplay) and not segment.matches(num_frames):
+            frame = self._stop_replay(segment)
+        elif segment is not None and not self.skip_animations:
+            frame = segment.frame(frame, num_frames)
+        super().add_frame(frame, num_frames)
+
+    # The cached frames no longer fit this play: draw this frame, and the rest
+    # of the play, as if there had been no cache hit
+    def _stop_replay(self, segment):
+        logger.warning("Segment replay out of step after %d frames, drawing the rest", segment.position)
+        self.segment = None
+        static_image, self.static_image = self.static_image, None
+        super().update_frame(self.scene)
+        self.static_image = static_image
+        return self.get_frame()
+
+    def scene_finished(self, scene):
+        super().scene_finished(scene)
+        self.segment_cache.save()
+
+
+class SegmentCacheRenderer(SegmentCaching, CairoRenderer):
+    pass
+
+
+class SegmentCacheVFRRenderer(SegmentCaching, VFRRenderer):
+    pass
+
+
+# Put before VFRHoldsMixin in the bases; combines with it when both are on
+class SegmentCacheMixin:
+    use_segment_cache = _env_flag("MANIM_SEGMENT_CACHE")
+
+    def __init__(self, renderer=None, **kwargs):
+        if renderer is None and self.use_segment_cache and config.renderer == RendererType.CAIRO:
+            if isinstance(self, VFRHoldsMixin) and self.uses_vfr():
+                renderer = SegmentCacheVFRRenderer()
+            else:
+                renderer = SegmentCacheRenderer()
+        super().__init__(renderer=renderer, **kwargs)
+
+
+def print_stats(cache):
+    segments = cache.index["segments"]
+    per_scene = {}
+    for entry in segments.values():
+        count, size = per_scene.get(entry["scene"], (0, 0))
+        per_scene[entry["scene"]] = (count + 1, size + entry["bytes"])
+    total = sum(entry["bytes"] for entry in segments.values())
+    print(f"{cache.root}: {len(segments)} segments, {total / 1e6:.1f} MB of {cache.max_bytes / 1e6:.0f} MB")
+    print(f"{'scene':<28} {'hits':>7} {'misses':>7} {'hit rate':>9} {'segments':>9} {'MB':>9}")
+    for scene_name in sorted(set(cache.index["scenes"]) | set(per_scene)):
+        counts = cache.index["scenes"].get(scene_name, {"hits": 0, "misses": 0})
+        lookups = counts["hits"] + counts["misses"]
+        rate = f"{counts['hits'] / lookups:.0%}" if lookups else "-"
+        count, size = per_scene.get(scene_name, (0, 0))
+        print(f"{scene_name:<28} {counts['hits']:>7} {counts['misses']:>7} {rate:>9} {count:>9} {size / 1e6:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the rasterized segment cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--root", help=f"cache directory (default: {default_root()})")
+    args = parser.parse_args()
+    cache = SegmentCache(args.root)
+    if args.command == "stats":
+        print_stats(cache)
+    else:
+        cache.clear()
+        print(f"cleared {cache.root}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
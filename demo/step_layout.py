@@ -0,0 +1,113 @@
+from manim import *
+
+# Stack layout for step-by-step derivations.
+#
+# A StepStack hangs blocks of "header + lines" below an anchor mobject (e.g. a
+# "Step-by-step OLS Calculation:" title). Positions are always computed from the
+# anchor, so when the oldest block is popped the remaining blocks are re-laid
+# out and animated to their new spots. The mobjects that are already on screen
+# are moved; no tex is rebuilt just to change where it sits.
+
+
+class StepStack:
+    def __init__(self, anchor, header_buff=0.3, block_buff=0.4, join_buff=0.1):
+        self.anchor = anchor
+        self.header_buff = header_buff  # anchor -> first header
+        self.block_buff = block_buff  # bottom of a block -> next header
+        self.join_buff = join_buff  # gap between lines joined into one row
+        # Each block: {"header": mob, "rows": [[mobs, buff, aligned], ...]}
+        self.blocks = []
+
+    # Start a new block; the header is positioned below the current bottom block
+    def push(self, header):
+        self.blocks.append({"header": header, "rows": []})
+        self._place_header(len(self.blocks) - 1, _self)
+        return header
+
+    # Add a line under the last line of the newest block. aligned=False centers
+    # it under the previous line instead of left-aligning it.
+    def add_line(self, line, buff=0.2, aligned=True):
+        block = self.blocks[-1]
+        previous = _row_group(block["rows"][-1][0], _self) if block["rows"] else block["header"]
+        line.next_to(previous, DOWN, buff=buff)
+        if aligned:
+            line.align_to(previous, LEFT)
+        block["rows"].append([[line], buff, aligned])
+        return line
+
+    # Put `second` on the same row as `first` (to its right). The move happens
+    # on the next pop/reflow, together with the rest of the layout change.
+    def join_lines(self, first, second):
+        first_row = self._find_row(first)
+        second_row = self._find_row(second)
+        first_row[0].extend(second_row[0])
+        for block in self.blocks:
+            if second_row in block["rows"]:
+                block["rows"].remove(second_row)
+
+    # Remove the oldest block and shift everything else up into place.
+    # Returns the animations for a single self.play(...).
+    def pop(self):
+        removed = self.blocks.pop(0)
+        return [FadeOut(_block_group(removed, _self))] + self.reflow()
+
+    # Animate every block to where the layout says it should be
+    def reflow(self):
+        mobjects = [mob for block in self.blocks for mob in _block_mobjects(block)]
+        for mob in mobjects:
+            mob.generate_target()
+        for index in range(len(self.blocks)):
+            self._place_header(index, _target)
+            self._place_rows(index, _target)
+        return [MoveToTarget(mob) for mob in mobjects]
+
+    def get_group(self):
+        return VGroup(*[_block_group(block, _self) for block in self.blocks])
+
+    def _place_header(self, index, get):
+        header = get(self.blocks[index]["header"])
+        if index == 0:
+            header.next_to(self.anchor, DOWN, buff=self.header_buff).align_to(self.anchor, LEFT)
+        else:
+            previous = self.blocks[index - 1]
+            header.next_to(_block_group(previous, get), DOWN, buff=self.block_buff)
+            header.align_to(get(previous["header"]), LEFT)
+
+    def _place_rows(self, index, get):
+        block = self.blocks[index]
+        previous = get(block["header"])
+        for mobs, buff, aligned in block["rows"]:
+            for left, right in zip(mobs, mobs[1:]):
+                get(right).next_to(get(left), RIGHT, buff=self.join_buff)
+            row = _row_group(mobs, get)
+            row.next_to(previous, DOWN, buff=buff)
+            if aligned:
+                row.align_to(previous, LEFT)
+            previous = row
+
+    def _find_row(self, mob):
+        for block in self.blocks:
+            for row in block["rows"]:
+                if mob in row[0]:
+                    return row
+        raise ValueError("Mobject is not a line of this StepStack")
+
+
+def _self(mob):
+    return mob
+
+
+def _target(mob):
+    return mob.target
+
+
+def _row_group(mobs, get):
+    return VGroup(*[get(mob) for mob in mobs])
+
+
+def _block_mobjects(block):
+    return [block["header"]] + [mob for mobs, _, _ in block["rows"] for mob in mobs]
+
+
+def _block_group(block, get):
+    return VGroup(*[get(mob) for mob in _block_mobjects(block)])
@@ -0,0 +1,377 @@
+# Vector timelines for browser playback instead of video.
+#
+# TimelineRenderer runs a scene's construct as usual but rasterizes and
+# encodes nothing. At every frame it records the point arrays and styles of
+# the VMobjects on screen: a mobject's points are stored once when it first
+# appears, and after that a keyframe only carries the mobjects that changed,
+# as deltas. Keyframes are taken at a low rate (--rate, default 15/s) and the
+# players interpolate between them at display rate; holds are one keyframe.
+#
+#   python demo/timeline_export.py export Clip5Conclusion         # media_dir/timelines/Clip5Conclusion.mtl
+#   python demo/timeline_export.py frame Clip5Conclusion.mtl 12.5 -o check.png
+#   python demo/timeline_export.py info Clip5Conclusion.mtl
+#
+# demo/timeline_player.js plays the file on a <canvas>; TimelinePlayer below is
+# the reference implementation it follows.
+#
+# File layout (little-endian): b"MTL1", u32 header length, JSON header, then
+# one zlib stream of keyframes. A keyframe is
+#
+#   f32 time, u8 flags (HOLD: no interpolation to the next keyframe,
+#   ORDER: draw order follows), [u32 n, u32 track ids...], u32 n changes,
+#   and per change: u32 track, u8 kind, then
+#     FULL:  u32 n points, i16 x/y pairs (quantized to 1/scale frame units)
+#     DELTA: i16 x/y pairs, added to the track's previous quantized points
+#     STYLE: u8 fill rgba, u8 stroke rgba, u16 stroke width * 100
+#
+# Only VMobjects are exported (text, tex, shapes, axes, graphs); images and
+# point clouds are skipped with a warning. Points are taken in 2D.
+import argparse
+import bisect
+import json
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+from manim import VMobject, color_to_rgb, config, logger, rgb_to_hex, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.family import extract_mobject_family_members
+
+from cost_estimate import load_scene_class
+from render_farm import REPO_ROOT, SCENE_FILES
+
+MAGIC = b"MTL1"
+QUANT_SCALE = 2048  # steps per frame unit: +-16 units at 1/2048 precision
+KEYFRAME_RATE = 15
+STROKE_UNIT = 0.01  # frame units per unit of stroke_width, as in manim's cairo camera
+
+FLAG_HOLD, FLAG_ORDER = 1, 2
+CHANGE_FULL, CHANGE_DELTA, CHANGE_STYLE = 1, 2, 4
+
+EXPORT_CONFIG = {
+    "quality": "low_quality",  # the camera's pixels are never drawn into
+    "write_to_movie": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+    "progress_bar": "none",
+    "preview": False,
+}
+
+
+def quantize(points):
+    return np.clip(np.round(points[:, :2] * QUANT_SCALE), -32767, 32767).astype(np.int32)
+
+
+def style_bytes(mob):
+    fill = np.round(mob.get_fill_rgbas()[0] * 255)
+    stroke = np.round(mob.get_stroke_rgbas()[0] * 255)
+    width = min(round(mob.get_stroke_width() * 100), 65535)
+    return bytes(np.concatenate([fill, stroke]).astype(np.uint8)) + struct.pack("<H", width)
+
+
+# One exported mobject; remembers what the players already have for it
+class TimelineTrack:
+    def __init__(self, index, mob):
+        self.index = index
+        self.mob = mob  # keeps id(mob) from being reused while we map it
+        self.points = None
+        self.style = None
+
+    def change(self):
+        points, style = quantize(self.mob.points), style_bytes(self.mob)
+        kind, payload = 0, []
+        if self.points is None or self.points.shape != points.shape:
+            kind |= CHANGE_FULL
+            payload += [struct.pack("<I", len(points)), points.astype("<i2").tobytes()]
+        else:
+            delta = points - self.points
+            if delta.any():
+                if np.abs(delta).max() <= 32767:
+                    kind |= CHANGE_DELTA
+                    payload.append(delta.astype("<i2").tobytes())
+                else:
+                    kind |= CHANGE_FULL
+                    payload += [struct.pack("<I", len(points)), points.astype("<i2").tobytes()]
+        if style != self.style:
+            kind |= CHANGE_STYLE
+            payload.append(style)
+        self.points, self.style = points, style
+        if not kind:
+            return None
+        return struct.pack("<IB", self.index, kind) + b"".join(payload)
+
+
+class TimelineWriter:
+    def __init__(self):
+        self.chunks = []
+        self.keyframes = 0
+        self.order = None
+
+    def keyframe(self, t, flags, order, changes):
+        if order != self.order:
+            flags |= FLAG_ORDER
+        parts = [struct.pack("<fB", t, flags)]
+        if flags & FLAG_ORDER:
+            parts.append(struct.pack(f"<I{len(order)}I", len(order), *order))
+            self.order = order
+        parts.append(struct.pack("<I", len(changes)))
+        self.chunks.append(b"".join(parts + changes))
+        self.keyframes += 1
+
+    def write(self, path, header):
+        header = json.dumps({**header, "keyframes": self.keyframes}).encode()
+        body = zlib.compress(b"".join(self.chunks), 9)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(MAGIC + struct.pack("<I", len(header)) + header + body)
+        return path
+
+
+# Takes a keyframe wherever the cairo renderer would draw a frame, and draws none
+class TimelineRenderer(CairoRenderer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = TimelineWriter()
+        self.tracks = {}  # id(mob) -> TimelineTrack
+        self.skipped = set()
+        self.scene = None
+
+    def snapshot(self, scene, flags=0):
+        members = extract_mobject_family_members(
+            scene.mobjects, use_z_index=self.camera.use_z_index, only_those_with_points=True
+        )
+        order, changes = [], []
+        for mob in members:
+            if not isinstance(mob, VMobject):
+                if type(mob).__name__ not in self.skipped:
+                    self.skipped.add(type(mob).__name__)
+                    logger.warning("Timeline export skips %s mobjects", type(mob).__name__)
+                continue
+            track = self.tracks.get(id(mob))
+            if track is None:
+                track = self.tracks[id(mob)] = TimelineTrack(len(self.tracks), mob)
+            order.append(track.index)
+            change = track.change()
+            if change is not None:
+                changes.append(change)
+        self.writer.keyframe(self.time, flags, order, changes)
+
+    def play(self, scene, *args, **kwargs):
+        self.scene = scene
+        super().play(scene, *args, **kwargs)
+        if not self.skip_animations:
+            self.snapshot(scene)  # end state, which the last frame only approaches
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+
+    def render(self, scene, time, moving_mobjects):
+        self.snapshot(scene)
+        self.time += 1 / self.camera.frame_rate
+
+    def freeze_current_frame(self, duration):
+        if self.skip_animations:
+            return super().freeze_current_frame(duration)
+        self.snapshot(self.scene, FLAG_HOLD)
+        self.time += int(duration * self.camera.frame_rate) / self.camera.frame_rate
+
+    def header(self, scene):
+        return {
+            "version": 1,
+            "scene": type(scene).__name__,
+            "frame_width": config.frame_width,
+            "frame_height": config.frame_height,
+            "background": rgb_to_hex(color_to_rgb(config.background_color)),
+            "scale": QUANT_SCALE,
+            "keyframe_rate": self.camera.frame_rate,
+            "duration": self.time,
+            "tracks": len(self.tracks),
+        }
+
+
+def export_timeline(scene_name, path=None, rate=KEYFRAME_RATE, quality="high_quality"):
+    scene_class = load_scene_class(REPO_ROOT / SCENE_FILES[scene_name], scene_name)
+    with tempconfig({**EXPORT_CONFIG, "frame_rate": rate}):
+        renderer = TimelineRenderer()
+        scene = scene_class(renderer=renderer)
+        scene.render()
+    # Pixel size is only the players' default canvas size
+    with tempconfig({"quality": quality}):
+        header = {**renderer.header(scene), "pixel_width": config.pixel_width, "pixel_height": config.pixel_height}
+        path = path or Path(config.media_dir) / "timelines" / f"{scene_name}.mtl"
+    return renderer.writer.write(path, header)
+
+
+def read_timeline(path):
+    data = Path(path).read_bytes()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path}: not a timeline file")
+    (length,) = struct.unpack_from("<I", data, 4)
+    return json.loads(data[8 : 8 + length]), zlib.decompress(data[8 + length :])
+
+
+def _decode_style(body, offset):
+    rgba = np.frombuffer(body, np.uint8, 8, offset) / 255
+    (width,) = struct.unpack_from("<H", body, offset + 8)
+    return rgba[:4], rgba[4:], width / 100
+
+
+class TimelinePlayer:
+    def __init__(self, path):
+        self.header, body = read_timeline(path)
+        self.times, self.holds, self.states = [], [], []  # state: (order, {track: (points, style)})
+        order, tracks, offset = [], {}, 0
+        while offset < len(body):
+            t, flags = struct.unpack_from("<fB", body, offset)
+            offset += 5
+            if flags & FLAG_ORDER:
+                (n,) = struct.unpack_from("<I", body, offset)
+                order = np.frombuffer(body, "<u4", n, offset + 4).tolist()
+                offset += 4 + 4 * n
+            (n_changes,) = struct.unpack_from("<I", body, offset)
+            offset += 4
+            tracks = dict(tracks)
+            for _ in range(n_changes):
+                track, kind = struct.unpack_from("<IB", body, offset)
+                offset += 5
+                points, style = tracks.get(track, (None, None))
+                if kind & CHANGE_FULL:
+                    (n,) = struct.unpack_from("<I", body, offset)
+                    points = np.frombuffer(body, "<i2", 2 * n, offset + 4).reshape(-1, 2).astype(np.int32)
+                    offset += 4 + 4 * n
+                elif kind & CHANGE_DELTA:
+                    points = points + np.frombuffer(body, "<i2", points.size, offset).reshape(-1, 2)
+                    offset += 2 * points.size
+                if kind & CHANGE_STYLE:
+                    style = _decode_style(body, offset)
+                    offset += 10
+                tracks[track] = (points, style)
+            self.times.append(t)
+            self.holds.append(bool(flags & FLAG_HOLD))
+            self.states.append((order, tracks))
+
+    @property
+    def duration(self):
+        return self.header["duration"]
+
+    # Shapes on screen at time t: (points, fill rgba, stroke rgba, stroke width) in draw order
+    def state_at(self, t):
+        k = max(bisect.bisect_right(self.times, t) - 1, 0)
+        order, tracks = self.states[k]
+        following = None
+        if k + 1 < len(self.states) and not self.holds[k]:
+            following = self.states[k + 1][1]
+            alpha = min(max((t - self.times[k]) / (self.times[k + 1] - self.times[k]), 0.0), 1.0)
+        shapes = []
+        for track in order:
+            (points, (fill, stroke, width)) = tracks[track]
+            target = following.get(track) if following is not None else None
+            starts, closes = _subpaths(points)
+            points = points.astype(float)
+            if target is not None and target[0] is not tracks[track][0] and target[0].shape == points.shape:
+                target_fill, target_stroke, target_width = target[1]
+                points = points + alpha * (target[0] - points)
+                fill = fill + alpha * (target_fill - fill)
+                stroke = stroke + alpha * (target_stroke - stroke)
+                width = width + alpha * (target_width - width)
+            shapes.append((points / QUANT_SCALE, starts, closes, fill, stroke, width))
+        return shapes
+
+    def render(self, t, width=None, height=None):
+        import cairo
+
+        width = width or self.header["pixel_width"]
+        height = height or self.header["pixel_height"]
+        frame_width, frame_height = self.header["frame_width"], self.header["frame_height"]
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        ctx = cairo.Context(surface)
+        ctx.scale(width / frame_width, -height / frame_height)
+        ctx.translate(frame_width / 2, -frame_height / 2)
+        ctx.set_source_rgb(*color_to_rgb(self.header["background"]))
+        ctx.paint()
+        for points, starts, closes, fill, stroke, stroke_width in self.state_at(t):
+            ctx.new_path()
+            for i in range(0, len(points) - 3, 4):
+                if starts[i // 4]:
+                    ctx.move_to(*points[i])
+                ctx.curve_to(*points[i + 1], *points[i + 2], *points[i + 3])
+                if closes[i // 4]:
+                    ctx.close_path()  # as manim's camera does, so the first corner gets a joint
+            if fill[3] > 0:
+                ctx.set_source_rgba(*fill)
+                ctx.fill_preserve()
+            if stroke_width > 0 and stroke[3] > 0:
+                ctx.set_source_rgba(*stroke)
+                ctx.set_line_width(stroke_width * STROKE_UNIT)
+                ctx.stroke_preserve()
+        surface.flush()
+        pixels = np.ndarray((height, width, 4), np.uint8, surface.get_data())
+        return pixels[..., [2, 1, 0, 3]].copy()  # BGRA -> RGBA
+
+
+# Curve i starts a new subpath when its first anchor is not the last one's end,
+# and closes its subpath when it is the last one and ends where the subpath began
+def _subpaths(points):
+    curves = points[: len(points) // 4 * 4].reshape(-1, 4, 2)
+    starts = np.ones(len(curves), dtype=bool)
+    starts[1:] = (curves[1:, 0] != curves[:-1, 3]).any(axis=1)
+    first = np.maximum.accumulate(np.where(starts, np.arange(len(curves)), 0))
+    last = np.ones(len(curves), dtype=bool)
+    last[:-1] = starts[1:]
+    closes = last & (curves[:, 3] == curves[first, 0]).all(axis=1)
+    return starts, closes
+
+
+def print_info(path):
+    header, body = read_timeline(path)
+    size = Path(path).stat().st_size
+    print(f"{path}: {header['scene']}, {header['duration']:.1f} s, {header['keyframes']} keyframes at "
+          f"{header['keyframe_rate']}/s, {header['tracks']} tracks")
+    print(f"{size / 1e3:.1f} kB ({len(body) / 1e3:.1f} kB uncompressed), {size / max(header['duration'], 1e-9) / 1e3:.1f} kB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export lecture scenes as vector timelines and inspect them")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="run a scene and write its timeline")
+    export_parser.add_argument("scenes", nargs="+", choices=sorted(SCENE_FILES))
+    export_parser.add_argument("-o", "--output", help="output file (one scene only)")
+    export_parser.add_argument("--rate", type=int, default=KEYFRAME_RATE, help="keyframes per second")
+
+    frame_parser = commands.add_parser("frame", help="draw one moment of a timeline with the reference player")
+    frame_parser.add_argument("timeline")
+    frame_parser.add_argument("time", type=float)
+    frame_parser.add_argument("-o", "--output", default="timeline_frame.png")
+
+    info_parser = commands.add_parser("info", help="print a timeline's size and contents")
+    info_parser.add_argument("timeline")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        if args.output and len(args.scenes) > 1:
+            parser.error("--output needs a single scene")
+        for name in args.scenes:
+            start = time.perf_counter()
+            path = export_timeline(name, args.output, args.rate)
+            print(f"{name}: exported in {time.perf_counter() - start:.1f}s")
+            print_info(path)
+    elif args.command == "frame":
+        from PIL import Image
+
+        Image.fromarray(TimelinePlayer(args.timeline).render(args.time)).save(args.output)
+        print(f"wrote {args.output}")
+    else:
+        print_info(args.timeline)
+
+
+if __name__ == "__main__":
+    main()
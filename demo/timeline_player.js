@@ -0,0 +1,173 @@
+// Canvas player for the vector timelines written by demo/timeline_export.py.
+// The file format is described there; TimelinePlayer in that module is the
+// reference this follows.
+//
+//   <canvas id="clip" width="1280" height="720"></canvas>
+//   <script src="timeline_player.js"></script>
+//   <script>
+//     TimelinePlayer.load(document.getElementById("clip"), "Clip5Conclusion.mtl").then((player) => player.play());
+//   </script>
+
+const FLAG_HOLD = 1, FLAG_ORDER = 2;
+const CHANGE_FULL = 1, CHANGE_DELTA = 2, CHANGE_STYLE = 4;
+const STROKE_UNIT = 0.01;
+
+class TimelinePlayer {
+  static async load(canvas, url) {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`${url}: ${response.status}`);
+    return TimelinePlayer.fromBuffer(canvas, await response.arrayBuffer());
+  }
+
+  static async fromBuffer(canvas, buffer) {
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== "MTL1") throw new Error("not a timeline file");
+    const headerLength = new DataView(buffer).getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+    // zlib stream, which DecompressionStream calls "deflate"
+    const stream = new Blob([new Uint8Array(buffer, 8 + headerLength)]).stream().pipeThrough(new DecompressionStream("deflate"));
+    return new TimelinePlayer(canvas, header, await new Response(stream).arrayBuffer());
+  }
+
+  constructor(canvas, header, body) {
+    this.canvas = canvas;
+    this.ctx = canvas.getContext("2d");
+    this.header = header;
+    this.keyframes = [];  // {time, hold, order, tracks}; unchanged tracks share their entry
+    this.time = 0;
+    this.playing = false;
+
+    const view = new DataView(body);
+    let offset = 0, order = [], tracks = new Map();
+    while (offset < body.byteLength) {
+      const time = view.getFloat32(offset, true), flags = view.getUint8(offset + 4);
+      offset += 5;
+      if (flags & FLAG_ORDER) {
+        const n = view.getUint32(offset, true);
+        offset += 4;
+        order = [];
+        for (let i = 0; i < n; i++, offset += 4) order.push(view.getUint32(offset, true));
+      }
+      const changes = view.getUint32(offset, true);
+      offset += 4;
+      tracks = new Map(tracks);
+      for (let c = 0; c < changes; c++) {
+        const id = view.getUint32(offset, true), kind = view.getUint8(offset + 4);
+        offset += 5;
+        let { points, style } = tracks.get(id) || {};
+        if (kind & CHANGE_FULL) {
+          const n = view.getUint32(offset, true);
+          offset += 4;
+          points = new Int32Array(2 * n);
+          for (let i = 0; i < points.length; i++, offset += 2) points[i] = view.getInt16(offset, true);
+        } else if (kind & CHANGE_DELTA) {
+          const previous = points;
+          points = new Int32Array(previous.length);
+          for (let i = 0; i < points.length; i++, offset += 2) points[i] = previous[i] + view.getInt16(offset, true);
+        }
+        if (kind & CHANGE_STYLE) {
+          const byte = (i) => view.getUint8(offset + i) / 255;
+          style = {
+            fill: [byte(0), byte(1), byte(2), byte(3)],
+            stroke: [byte(4), byte(5), byte(6), byte(7)],
+            width: view.getUint16(offset + 8, true) / 100,
+          };
+          offset += 10;
+        }
+        tracks.set(id, { points, style });
+      }
+      this.keyframes.push({ time, hold: (flags & FLAG_HOLD) !== 0, order, tracks });
+    }
+  }
+
+  get duration() {
+    return this.header.duration;
+  }
+
+  // Last keyframe at or before t
+  keyframeIndex(t) {
+    let low = 0, high = this.keyframes.length - 1;
+    while (low < high) {
+      const mid = (low + high + 1) >> 1;
+      if (this.keyframes[mid].time <= t) low = mid;
+      else high = mid - 1;
+    }
+    return low;
+  }
+
+  drawAt(t) {
+    const { frame_width: frameWidth, frame_height: frameHeight } = this.header;
+    const ctx = this.ctx, width = this.canvas.width, height = this.canvas.height;
+    ctx.setTransform(width / frameWidth, 0, 0, -height / frameHeight, width / 2, height / 2);
+    ctx.fillStyle = this.header.background;
+    ctx.fillRect(-frameWidth / 2, -frameHeight / 2, frameWidth, frameHeight);
+
+    const k = this.keyframeIndex(t);
+    const from = this.keyframes[k], to = this.keyframes[k + 1];
+    const alpha = !to || from.hold ? 0 : Math.min(Math.max((t - from.time) / (to.time - from.time), 0), 1);
+    for (const id of from.order) {
+      const start = from.tracks.get(id), end = to && to.tracks.get(id);
+      const moves = alpha > 0 && end && end !== start && end.points.length === start.points.length;
+      this.drawShape(start, moves ? end : start, moves ? alpha : 0);
+    }
+  }
+
+  drawShape(start, end, alpha) {
+    const ctx = this.ctx, scale = this.header.scale;
+    const p = start.points, q = end.points;
+    const at = (i) => (p[i] + (q[i] - p[i]) * alpha) / scale;
+    ctx.beginPath();
+    // Cubic curves of four points; a curve starts a subpath unless it begins where the last one ended.
+    // A subpath that ends where it began is closed, as manim's camera does, so its first corner gets a joint.
+    let first = 0;
+    for (let i = 0; i + 7 < p.length; i += 8) {
+      if (i === 0 || p[i] !== p[i - 2] || p[i + 1] !== p[i - 1]) {
+        ctx.moveTo(at(i), at(i + 1));
+        first = i;
+      }
+      ctx.bezierCurveTo(at(i + 2), at(i + 3), at(i + 4), at(i + 5), at(i + 6), at(i + 7));
+      const last = i + 15 >= p.length || p[i + 8] !== p[i + 6] || p[i + 9] !== p[i + 7];
+      if (last && p[i + 6] === p[first] && p[i + 7] === p[first + 1]) ctx.closePath();
+    }
+    const mix = (a, b) => a.map((value, i) => value + (b[i] - value) * alpha);
+    const rgba = ([r, g, b, a]) => `rgba(${r * 255}, ${g * 255}, ${b * 255}, ${a})`;
+    const fill = mix(start.style.fill, end.style.fill);
+    const stroke = mix(start.style.stroke, end.style.stroke);
+    const strokeWidth = start.style.width + (end.style.width - start.style.width) * alpha;
+    if (fill[3] > 0) {
+      ctx.fillStyle = rgba(fill);
+      ctx.fill();
+    }
+    if (strokeWidth > 0 && stroke[3] > 0) {
+      ctx.strokeStyle = rgba(stroke);
+      ctx.lineWidth = strokeWidth * STROKE_UNIT;
+      ctx.stroke();
+    }
+  }
+
+  seek(t) {
+    this.time = Math.min(Math.max(t, 0), this.duration);
+    this.startedAt = performance.now() - this.time * 1000;
+    this.drawAt(this.time);
+  }
+
+  play() {
+    if (this.playing) return;
+    this.playing = true;
+    this.startedAt = performance.now() - this.time * 1000;
+    const tick = (now) => {
+      if (!this.playing) return;
+      this.time = Math.min((now - this.startedAt) / 1000, this.duration);
+      this.drawAt(this.time);
+      if (this.time < this.duration) requestAnimationFrame(tick);
+      else this.playing = false;
+    };
+    requestAnimationFrame(tick);
+  }
+
+  pause() {
+    this.playing = false;
+  }
+}
+
+if (typeof module !== "undefined") module.exports = { TimelinePlayer };
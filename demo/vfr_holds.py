@@ -0,0 +1,135 @@
+from manim import *
+import os
+import subprocess
+from pathlib import Path
+
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+# Variable frame rate output for hold-heavy clips.
+#
+# A wait() with nothing moving is rendered by manim as one frame pushed to the
+# encoder duration * fps times: 180 identical frames for a 3 s hold at 60 fps.
+# In VFR mode such a hold becomes a partial movie of a single frame, plus a
+# ".hold" sidecar with the hold's duration. When the partial movies are
+# combined, the concat list gives every hold its duration, so the frame simply
+# stays on screen. The result is a VFR file; with MANIM_VFR_CFR=1 (for players
+# and platforms that insist on constant frame rate) the frames are duplicated
+# once, by the encoder, at this final mux.
+#
+# Holds take the same time as before (the scene clock still advances by whole
+# frames), so audio and later animations line up with the CFR render.
+#
+#   MANIM_VFR=1 manim -pqh demo/clip5_conclusion.py Clip5Conclusion
+
+VFR_SUFFIX = "_vfr"  # VFR partial movies must not be reused by a CFR render
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _hold_path(partial_movie_file):
+    return Path(partial_movie_file).with_suffix(".hold")
+
+
+def read_hold(partial_movie_file):
+    try:
+        return float(_hold_path(partial_movie_file).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class VFRFileWriter(SceneFileWriter):
+    cfr_output = _env_flag("MANIM_VFR_CFR")
+
+    def add_partial_movie_file(self, hash_animation):
+        if hash_animation is not None:
+            hash_animation = f"{hash_animation}{VFR_SUFFIX}"
+        super().add_partial_movie_file(hash_animation)
+
+    # A partial movie that is about to be (re)written is not a hold until
+    # mark_hold says so: uncached names repeat across runs, and a stale
+    # sidecar would cut a real animation down to one frame
+    def open_partial_movie_stream(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        _hold_path(file_path).unlink(missing_ok=True)
+        super().open_partial_movie_stream(file_path=file_path)
+
+    def is_already_cached(self, hash_invocation):
+        return super().is_already_cached(f"{hash_invocation}{VFR_SUFFIX}")
+
+    def mark_hold(self, duration):
+        _hold_path(self.partial_movie_files[-1]).write_text(repr(duration))
+
+    def combine_to_movie(self):
+        partial_movie_files = [f for f in self.partial_movie_files if f is not None]
+        holds = [read_hold(f) for f in partial_movie_files]
+        if all(hold is None for hold in holds):
+            return super().combine_to_movie()
+
+        movie_file_path = Path(self.movie_file_path)
+        list_file = Path(self.partial_movie_directory) / "partial_movie_file_list_vfr.txt"
+        lines = []
+        for path, hold in zip(partial_movie_files, holds):
+            lines.append(f"file 'file:{Path(path).resolve().as_posix()}'")
+            if hold is not None:
+                lines.append(f"duration {hold}")
+        if holds[-1] is not None:
+            # The last frame needs a successor to be shown for its full duration
+            lines.append(f"file 'file:{Path(partial_movie_files[-1]).resolve().as_posix()}'")
+        list_file.write_text("\n".join(lines) + "\n")
+
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(list_file)]
+        if self.includes_sound:
+            sound_file_path = movie_file_path.with_suffix(".wav")
+            self.audio_segment.export(sound_file_path, format="wav")
+            command += ["-i", str(sound_file_path), "-c:a", "aac", "-shortest"]
+        if self.cfr_output:
+            command += ["-r", str(config.frame_rate), "-fps_mode", "cfr",
+                        "-c:v", "libx264", "-pix_fmt", "yuv420p"]
+        else:
+            command += ["-c:v", "copy"]
+        command += ["-movflags", "+faststart", str(movie_file_path)]
+        subprocess.run(command, check=True)
+        if self.includes_sound:
+            sound_file_path.unlink(missing_ok=True)
+
+        saved = sum(round(hold * config.frame_rate) - 1 for hold in holds if hold is not None)
+        logger.info("VFR: %d held frames not encoded", saved)
+        self.print_file_ready_message(movie_file_path)
+
+
+class VFRRenderer(CairoRenderer):
+    def __init__(self, file_writer_class=VFRFileWriter, **kwargs):
+        super().__init__(file_writer_class=file_writer_class, **kwargs)
+
+    def freeze_current_frame(self, duration):
+        dt = 1 / self.camera.frame_rate
+        num_frames = int(duration / dt)
+        if self.skip_animations or num_frames < 2:
+            return super().freeze_current_frame(duration)
+        # One frame in the partial movie, the clock advances by all of them
+        self.add_frame(self.get_frame())
+        self.time += (num_frames - 1) * dt
+        self.file_writer.mark_hold(num_frames * dt)
+
+
+class VFRHoldsMixin:
+    vfr_holds = _env_flag("MANIM_VFR")
+
+    # Cairo renderer, opaque movie output (not gif)
+    @classmethod
+    def uses_vfr(cls):
+        return (
+            cls.vfr_holds
+            and config.renderer == RendererType.CAIRO
+            and config.format != "gif"
+            and not config.transparent
+        )
+
+    def __init__(self, renderer=None, **kwargs):
+        if renderer is None and self.uses_vfr():
+            renderer = VFRRenderer()
+        super().__init__(renderer=renderer, **kwargs)
@@ -0,0 +1,81 @@
+from manim import *
+import numpy as np
+
+# Vectorized painter's algorithm for the Cairo ThreeDCamera.
+#
+# ThreeDCamera sorts the mobjects it draws with a Python key function that
+# computes every face's bounding-box center on its own. Here the points of all
+# faces live in one vertex buffer per camera with an offsets index, the
+# centers come out of a single reduceat pass, depths are one matrix product and
+# the draw order is one argsort.
+#
+# The buffer is kept between frames: each face's points become a view of its
+# slot, so shifts and rotations done in place already update the buffer, and
+# only faces whose points were replaced are copied back in. It is reallocated
+# only when the set of faces or their point counts change. Mobjects with
+# submobjects or a z_index_group still take the per-mobject reference point,
+# and drawing is still Cairo's, one VMobject at a time.
+
+
+class BatchedThreeDCamera(ThreeDCamera):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._vertices = np.empty((0, 3))
+        self._offsets = np.empty(0, dtype=int)
+        self._layout = None  # (ids, point counts) of the faces in _vertices
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        # Skip ThreeDCamera's own sort, keep the family extraction of Camera
+        mobjects = Camera.get_mobjects_to_display(self, *args, **kwargs)
+        if len(mobjects) < 2:
+            return mobjects
+        order = np.argsort(self.get_depths(mobjects), kind="stable")
+        return [mobjects[i] for i in order]
+
+    def get_depths(self, mobjects):
+        rot_matrix = self.get_rotation_matrix()
+        depths = np.full(len(mobjects), np.inf)  # unshaded mobjects draw last, in order
+
+        batched, fallback = [], []
+        for index, mob in enumerate(mobjects):
+            if not getattr(mob, "shade_in_3d", False):
+                continue
+            # Faces of a surface are leaves with their own points; anything with a
+            # z_index_group or submobjects needs the general reference point
+            if mob.submobjects or getattr(mob, "z_index_group", None) is not None or len(mob.points) == 0:
+                fallback.append(index)
+            else:
+                batched.append(index)
+
+        if batched:
+            vertices, offsets = self.vertex_buffer([mobjects[i] for i in batched])
+            centers = (np.minimum.reduceat(vertices, offsets) + np.maximum.reduceat(vertices, offsets)) / 2
+            depths[batched] = centers @ rot_matrix[2]
+        for index in fallback:
+            depths[index] = np.dot(mobjects[index].get_z_index_reference_point(), rot_matrix[2])
+        return depths
+
+    # The (n, 3) vertex buffer for these mobjects plus the start offset of each
+    def vertex_buffer(self, mobjects):
+        lengths = np.fromiter((len(mob.points) for mob in mobjects), dtype=int, count=len(mobjects))
+        layout = ([id(mob) for mob in mobjects], lengths.tobytes())
+        if layout != self._layout:
+            self._vertices = np.empty((lengths.sum(), 3))
+            self._offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(int)
+            self._layout = layout
+        vertices = self._vertices
+        address = vertices.__array_interface__["data"][0]
+        row_bytes = vertices.strides[0]
+        for mob, start, length in zip(mobjects, self._offsets, lengths):
+            points = mob.points
+            if points.base is vertices and points.__array_interface__["data"][0] == address + start * row_bytes:
+                continue  # already its slot, changed in place if at all
+            slot = vertices[start : start + length]
+            slot[:] = points
+            mob.points = slot
+        return vertices, self._offsets
+
+
+class BatchedThreeDScene(ThreeDScene):
+    def __init__(self, camera_class=BatchedThreeDCamera, **kwargs):
+        super().__init__(camera_class=camera_class, **kwargs)
@@ -0,0 +1,140 @@
+from manim import *
+import math
+import os
+from collections import OrderedDict
+
+import numpy as np
+from manim.utils.iterables import tuplify
+
+# Level of detail for the 3-D primitives in convex_ball.py.
+#
+# Tessellation is picked from how big the shape is on screen: the number of
+# segments around a circle is its projected circumference in pixels divided by
+# how many pixels one segment may cover. Drafts allow much longer segments
+# than final renders. manim.cfg renders at -qh, so a plain -s is final; drafts
+# are asked for with MANIM_LOD_DRAFT=1, or by a still at an explicitly lower
+# quality (-sql, -sqm).
+#
+#   MANIM_LOD_DRAFT=1 manim -s convex_ball.py ConvexBallIllustration
+
+FINAL_PX_PER_SEGMENT = 8
+DRAFT_PX_PER_SEGMENT = 24
+MIN_SEGMENTS = 6
+
+MESH_CACHE_SIZE = 32  # distinct (shape, resolution) meshes kept around
+
+
+def is_draft():
+    if os.environ.get("MANIM_LOD_DRAFT", "").lower() in ("1", "true", "yes"):
+        return True
+    # A quick still: -s at a quality below the final high-quality pixel height
+    return config.save_last_frame and config.pixel_height < 1080
+
+
+def pixels_per_unit(zoom=1.0):
+    return zoom * config.pixel_height / config.frame_height
+
+
+def lod_segments(radius, max_segments, zoom=1.0, draft=None):
+    draft = is_draft() if draft is None else draft
+    px_per_segment = DRAFT_PX_PER_SEGMENT if draft else FINAL_PX_PER_SEGMENT
+    circumference_px = TAU * radius * pixels_per_unit(zoom)
+    segments = math.ceil(circumference_px / px_per_segment)
+    return int(np.clip(segments, MIN_SEGMENTS, max_segments))
+
+
+# (around, pole-to-pole) resolution for a sphere, never finer than `base`
+def lod_sphere_resolution(radius, base=(24, 24), zoom=1.0, draft=None):
+    around = lod_segments(radius, max(base), zoom, draft)
+    scale = around / max(base)
+    return tuple(max(MIN_SEGMENTS // 2, math.ceil(n * scale)) for n in base)
+
+
+# Meshes keyed by (shape, resolution, ranges). Values are the bezier points of
+# every face, shape (faces, 16, 3), plus the (u, v) cell of each face.
+_MESH_CACHE = OrderedDict()
+
+
+def _face_mesh(mob, u_res, v_res):
+    key = (type(mob).__name__, float(mob.radius), u_res, v_res, tuple(mob.u_range), tuple(mob.v_range))
+    if key in _MESH_CACHE:
+        _MESH_CACHE.move_to_end(key)
+        return _MESH_CACHE[key]
+    u_values = np.linspace(*mob.u_range, u_res + 1)
+    v_values = np.linspace(*mob.v_range, v_res + 1)
+    grid = np.stack(np.meshgrid(u_values, v_values, indexing="ij"), axis=-1)  # (u_res + 1, v_res + 1, 2)
+    # Corners u1v1, u2v1, u2v2, u1v2, u1v1 of every face, as Surface uses
+    corners = np.stack(
+        [grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:], grid[:-1, :-1]],
+        axis=2,
+    )  # (u_res, v_res, 5, 2)
+    # Straight cubic segments between consecutive corners in uv space
+    # (set_points_as_corners), then every point, handles included, goes
+    # through func as Surface's apply_function does
+    starts, ends = corners[:, :, :-1, None, :], corners[:, :, 1:, None, :]
+    alphas = np.linspace(0, 1, 4)[None, None, None, :, None]
+    uv = (starts + alphas * (ends - starts)).reshape(u_res * v_res, 16, 2)
+    # func() is written with np.cos/np.sin, so one call maps the whole mesh
+    points = np.moveaxis(np.asarray(mob.func(uv[..., 0], uv[..., 1]), dtype=float), 0, -1)
+    mesh = (points, u_values, v_values)
+    _MESH_CACHE[key] = mesh
+    if len(_MESH_CACHE) > MESH_CACHE_SIZE:
+        _MESH_CACHE.popitem(last=False)
+    return mesh
+
+
+# Replaces Surface's face-by-face construction (and its per-point
+# apply_function) with a cached, vectorized mesh. Cairo renderer only; with
+# OpenGL the parent class is used unchanged.
+class _CachedMeshMixin:
+    def _setup_in_uv_space(self):
+        if config.renderer != RendererType.CAIRO:
+            return super()._setup_in_uv_space()
+        res = tuplify(self.resolution)
+        u_res, v_res = (res[0], res[0]) if len(res) == 1 else res
+        points, u_values, v_values = _face_mesh(self, u_res, v_res)
+        points = points.copy()
+
+        faces = VGroup()
+        for index in range(len(points)):
+            i, j = divmod(index, v_res)
+            face = ThreeDVMobject()
+            face.points = points[index]
+            face.u_index, face.v_index = i, j
+            face.u1, face.u2 = u_values[i : i + 2]
+            face.v1, face.v2 = v_values[j : j + 2]
+            faces.add(face)
+        faces.set_fill(color=self.fill_color, opacity=self.fill_opacity)
+        faces.set_stroke(color=self.stroke_color, width=self.stroke_width, opacity=self.stroke_opacity)
+        self.add(*faces)
+        if self.checkerboard_colors:
+            self.set_fill_by_checkerboard(*self.checkerboard_colors)
+        self._points_already_mapped = True
+
+    def apply_function(self, function, **kwargs):
+        # Surface.__init__ maps the uv grid through func right after setup;
+        # our faces already hold the mapped points.
+        if getattr(self, "_points_already_mapped", False):
+            self._points_already_mapped = False
+            return self
+        return super().apply_function(function, **kwargs)
+
+
+class LODSphere(_CachedMeshMixin, Sphere):
+    def __init__(self, radius=1, resolution=(24, 24), zoom=1.0, **kwargs):
+        super().__init__(radius=radius, resolution=lod_sphere_resolution(radius, resolution, zoom), **kwargs)
+
+
+class LODDot3D(_CachedMeshMixin, Dot3D):
+    def __init__(self, point=ORIGIN, radius=DEFAULT_DOT_RADIUS, resolution=(8, 8), zoom=1.0, **kwargs):
+        super().__init__(point=point, radius=radius, resolution=lod_sphere_resolution(radius, resolution, zoom), **kwargs)
+
+
+# Line3D/Arrow3D are cylinders and cones; only their tessellation is chosen here
+def LODLine3D(start, end, thickness=0.02, resolution=24, zoom=1.0, **kwargs):
+    return Line3D(start, end, thickness=thickness, resolution=lod_segments(thickness, resolution, zoom), **kwargs)
+
+
+def LODArrow3D(start, end, thickness=0.02, base_radius=0.08, resolution=24, zoom=1.0, **kwargs):
+    segments = lod_segments(max(thickness, base_radius), resolution, zoom)
+    return Arrow3D(start, end, thickness=thickness, base_radius=base_radius, resolution=segments, **kwargs)
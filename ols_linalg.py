@@ -0,0 +1,199 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Matrix-form OLS, beta = (X^T X)^-1 X^T y, for ols_projection.py and for
+# datasets far bigger than its three observations.
+#
+# Tall X (n >= p) is solved through one Gram product and the Cholesky factor of
+# the small p x p matrix; when X^T X is too ill-conditioned for that (Cholesky
+# squares the condition number of X) it goes through QR of X instead. Wide X
+# (p > n) has no unique solution and gets the minimum-norm one,
+# X^T (X X^T)^-1 y, through the Cholesky factor of the n x n matrix.
+# Rank-deficient X, tall or wide, gets the minimum-norm least-squares solution
+# from the pseudoinverse. All of it works on stacks of problems, X of shape
+# (..., n, p), with numpy.linalg's batched routines, so many small fits are
+# one call.
+#
+# GramAccumulator builds X^T X and X^T y a chunk of rows at a time, e.g. from
+# .npy files opened as memmaps, for data that does not fit in memory.
+# FactorizationCache keeps the factors per design matrix, so fitting the same
+# X to another y skips the factorization. numpy has no triangular solve, so
+# the cache holds the inverses of the triangular factors, and a refit is
+# matrix products only.
+
+CHOLESKY_MAX_COND = 1e10  # of X^T X; beyond it about half the digits are gone
+RANK_MAX_COND = 1e12  # of X (R of its QR); beyond it X is taken as rank-deficient
+FACTOR_CACHE_SIZE = 16  # design matrices whose factors are kept
+CHUNK_BYTES = 64 << 20  # rows per GramAccumulator chunk: about this much float64
+
+
+def design_matrix(x, intercept=True):
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    if intercept:
+        x = np.concatenate([np.ones((*x.shape[:-1], 1)), x], axis=-1)
+    return x
+
+
+def _transpose(a):
+    return np.swapaxes(a, -1, -2)
+
+
+# X^T X; for a single matrix numpy hands X.T @ X to BLAS syrk
+def gram_matrix(X):
+    return X.T @ X if X.ndim == 2 else _transpose(X) @ X
+
+
+# Solves (L L^T) z = b for a (batched) lower Cholesky factor L
+def cholesky_solve(L, b):
+    return np.linalg.solve(_transpose(L), np.linalg.solve(L, b))
+
+
+# Same, from the inverse of L that _factor keeps: two matrix products
+def _cholesky_apply(L_inv, b):
+    return _transpose(L_inv) @ (L_inv @ b)
+
+
+# Inverse of the Cholesky factor of gram, or None when gram is too
+# ill-conditioned or not positive definite
+def _inverse_cholesky(gram):
+    if np.all(np.linalg.cond(gram) < CHOLESKY_MAX_COND):
+        try:
+            return np.linalg.inv(np.linalg.cholesky(gram))
+        except np.linalg.LinAlgError:
+            pass
+    return None
+
+
+def _factor(X, method):
+    n, p = X.shape[-2:]
+    if method == "auto":
+        method = "cholesky" if n >= p else "wide"
+    if method == "cholesky":
+        L_inv = _inverse_cholesky(gram_matrix(X))
+        if L_inv is not None:
+            return "cholesky", L_inv
+        method = "qr"
+    if method == "qr":
+        Q, R = np.linalg.qr(X)
+        if np.all(np.linalg.cond(R) < RANK_MAX_COND):
+            return "qr", (Q, np.linalg.inv(R))
+        method = "pinv"
+    if method == "wide":
+        L_inv = _inverse_cholesky(X @ _transpose(X))
+        if L_inv is not None:
+            return "wide", L_inv
+        method = "pinv"
+    if method == "pinv":
+        return "pinv", np.linalg.pinv(X, rcond=1 / RANK_MAX_COND)
+    raise ValueError(f"Unknown method '{method}', expected auto, cholesky, qr, wide or pinv")
+
+
+def _solve_factored(factor, X, y):
+    kind, value = factor
+    if kind == "cholesky":
+        return _cholesky_apply(value, _transpose(X) @ y)
+    if kind == "qr":
+        Q, R_inv = value
+        return R_inv @ (_transpose(Q) @ y)
+    if kind == "pinv":
+        return value @ y
+    return _transpose(X) @ _cholesky_apply(value, y)
+
+
+class FactorizationCache:
+    def __init__(self, max_size=FACTOR_CACHE_SIZE):
+        self.max_size = max_size
+        self._factors = OrderedDict()
+        self.hits = self.misses = 0
+
+    # Content hash: one pass over X, cheaper than the O(n p^2) factorization
+    @staticmethod
+    def key(X, method):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((X.shape, X.dtype.str, method)).encode())
+        digest.update(np.ascontiguousarray(X).data)
+        return digest.hexdigest()
+
+    def factor(self, X, method="auto"):
+        key = self.key(X, method)
+        if key in self._factors:
+            self.hits += 1
+            self._factors.move_to_end(key)
+            return self._factors[key]
+        self.misses += 1
+        factor = self._factors[key] = _factor(X, method)
+        while len(self._factors) > self.max_size:
+            self._factors.popitem(last=False)
+        return factor
+
+    def clear(self):
+        self._factors.clear()
+
+
+default_cache = FactorizationCache()
+
+
+# beta for X (..., n, p) and y (..., n) or several responses (..., n, k).
+# method: "auto", "cholesky" (falls back to "qr"), "qr" or "wide" (both fall
+# back to "pinv" for rank-deficient X), or "pinv"; cache=None skips caching.
+def fit(X, y, method="auto", cache=default_cache):
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    vector = y.ndim == X.ndim - 1
+    if vector:
+        y = y[..., None]
+    factor = cache.factor(X, method) if cache is not None else _factor(X, method)
+    beta = _solve_factored(factor, X, y)
+    return beta[..., 0] if vector else beta
+
+
+class GramAccumulator:
+    def __init__(self):
+        self.xtx = self.xty = None
+        self.yty = 0.0
+        self.n = 0
+
+    def add(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if self.xtx is None:
+            self.xtx = np.zeros((X.shape[1], X.shape[1]))
+            self.xty = np.zeros(X.shape[1])
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.yty += y @ y
+        self.n += len(X)
+        return self
+
+    def solve(self):
+        if self.xtx is None:
+            raise ValueError("GramAccumulator has no rows")
+        if np.linalg.cond(self.xtx) >= CHOLESKY_MAX_COND:
+            raise np.linalg.LinAlgError(
+                "X^T X is too ill-conditioned to solve from the Gram matrix; fit the rows with fit(..., method='qr')"
+            )
+        return cholesky_solve(np.linalg.cholesky(self.xtx), self.xty)
+
+    # Residual sum of squares at beta, without another pass over the data
+    def rss(self, beta):
+        return self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta
+
+    @classmethod
+    def from_arrays(cls, X, y, chunk_rows=None, intercept=True):
+        chunk_rows = chunk_rows or max(1, CHUNK_BYTES // (8 * (X.shape[1] if X.ndim > 1 else 1)))
+        accumulator = cls()
+        for start in range(0, len(X), chunk_rows):
+            chunk = X[start : start + chunk_rows]
+            accumulator.add(design_matrix(chunk, intercept), y[start : start + chunk_rows])
+        return accumulator
+
+    # Rows of .npy files that may not fit in memory; the OS pages them in per chunk
+    @classmethod
+    def from_npy(cls, x_path, y_path, chunk_rows=None, intercept=True):
+        X = np.load(x_path, mmap_mode="r")
+        y = np.load(y_path, mmap_mode="r")
+        return cls.from_arrays(X, y, chunk_rows, intercept)
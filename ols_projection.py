@@ -0,0 +1,89 @@
+from manim import *
+import numpy as np
+from convex_ball import CAMERA_ORIENTATION, make_3d_axes
+from depth_sort import BatchedThreeDScene
+from mesh_lod import LODDot3D, LODLine3D, LODArrow3D
+from ols_linalg import design_matrix, fit
+
+# OLS as a projection. With three observations, y and the columns of X
+# (the ones vector and x) are vectors in R^3; X beta ranges over the plane the
+# columns span, and the fitted values X beta_hat are the point of that plane
+# closest to y, so the residual y - X beta_hat stands perpendicular to it.
+
+class MatrixOLSProjection(BatchedThreeDScene):
+    x = [-1.0, 0.5, 2.0]
+    y = [0.3, 2.4, 1.2]
+
+    def construct(self):
+        axes = make_3d_axes()
+        axes_labels = axes.get_axis_labels()
+        self.set_camera_orientation(**CAMERA_ORIENTATION)
+
+        X = design_matrix(self.x)
+        y = np.array(self.y)
+        beta = fit(X, y)
+        y_hat = X @ beta
+
+        formula = MathTex(r"\hat{\beta} = (X^\top X)^{-1} X^\top \mathbf{y}").scale(0.7).to_corner(UL)
+        values = MathTex(
+            r"\hat{\beta} = (" + f"{beta[0]:.2f}" + r",\ " + f"{beta[1]:.2f}" + r")"
+        ).scale(0.6).next_to(formula, DOWN, aligned_edge=LEFT)
+        normal_eq = MathTex(r"X^\top (\mathbf{y} - X\hat{\beta}) = \mathbf{0}").scale(0.6).to_corner(DL)
+        self.add_fixed_in_frame_mobjects(formula, values, normal_eq)
+        self.remove(formula, values, normal_eq)
+
+        # Column space: a square around the origin in an orthonormal basis of it
+        basis = np.linalg.qr(X)[0].T
+        plane = Polygon(*[axes.c2p(*(2.5 * (s * basis[0] + t * basis[1])))
+                          for s, t in [(1, 1), (-1, 1), (-1, -1), (1, -1)]])
+        plane.set_fill(BLUE, opacity=0.2).set_stroke(BLUE, width=1, opacity=0.5)
+        plane_label = MathTex(r"\text{col}(X)", color=BLUE).scale(0.7).move_to(axes.c2p(*(2.2 * basis[0] + 2.2 * basis[1])))
+
+        def arrow(end, color):
+            return LODArrow3D(start=axes.c2p(0, 0, 0), end=axes.c2p(*end), color=color,
+                              thickness=0.01, base_radius=0.04, height=0.15)
+
+        columns = VGroup(arrow(X[:, 0], TEAL), arrow(X[:, 1], TEAL))
+        column_labels = [
+            MathTex(r"\mathbf{1}", color=TEAL).scale(0.7).next_to(columns[0].get_end(), OUT * 0.5),
+            MathTex(r"\mathbf{x}", color=TEAL).scale(0.7).next_to(columns[1].get_end(), OUT * 0.5),
+        ]
+        y_arrow = arrow(y, YELLOW)
+        y_label = MathTex(r"\mathbf{y}", color=YELLOW).scale(0.7).next_to(y_arrow.get_end(), OUT * 0.5)
+        y_hat_arrow = arrow(y_hat, GREEN)
+        y_hat_label = MathTex(r"X\hat{\beta}", color=GREEN).scale(0.7).next_to(y_hat_arrow.get_end(), IN * 0.5 + RIGHT * 0.3)
+        y_hat_dot = LODDot3D(axes.c2p(*y_hat), color=GREEN, radius=0.06)
+        residual = LODLine3D(axes.c2p(*y_hat), axes.c2p(*y), color=RED, thickness=0.012)
+
+        # Right-angle mark between the residual and the plane, at X beta_hat
+        along = -y_hat / np.linalg.norm(y_hat) * 0.25
+        up = (y - y_hat) / np.linalg.norm(y - y_hat) * 0.25
+        right_angle = VMobject(stroke_color=WHITE, stroke_width=2).set_points_as_corners(
+            [axes.c2p(*(y_hat + along)), axes.c2p(*(y_hat + along + up)), axes.c2p(*(y_hat + up))]
+        )
+
+        self.play(Create(axes), Write(axes_labels))
+        self.play(FadeIn(columns), *[FadeIn(label) for label in column_labels])
+        self.add_fixed_orientation_mobjects(*column_labels)
+        self.play(FadeIn(plane), FadeIn(plane_label))
+        self.add_fixed_orientation_mobjects(plane_label)
+        self.wait(0.5)
+
+        self.play(FadeIn(y_arrow), FadeIn(y_label))
+        self.add_fixed_orientation_mobjects(y_label)
+        self.play(Write(formula))
+        self.wait(0.5)
+
+        # Drop y onto the plane
+        self.play(TransformFromCopy(y_arrow, y_hat_arrow), FadeIn(y_hat_dot), run_time=1.5)
+        self.play(Create(residual), Create(right_angle), FadeIn(y_hat_label), Write(values))
+        self.add_fixed_orientation_mobjects(y_hat_label)
+        self.play(Write(normal_eq))
+
+        self.begin_ambient_camera_rotation(rate=0.15)
+        self.wait(6)
+        self.stop_ambient_camera_rotation()
+        self.wait(1)
+
+# To render: manim -pqm ols_projection.py MatrixOLSProjection
+# Quick still: manim -s ols_projection.py MatrixOLSProjection
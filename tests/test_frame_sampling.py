@@ -0,0 +1,39 @@
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("manim")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "demo"))
+
+from frame_sampling import SAMPLE_CONFIG, render_frame_at, render_range, sample_scene, signatures_match, frame_signature
+
+SCENE = "Clip2OLSIntuition"
+SAMPLE_SIZE = {key: SAMPLE_CONFIG[key] for key in ("pixel_width", "pixel_height", "frame_rate")}
+
+
+def _play_index(source_line):
+    source = Path(__file__).resolve().parent.parent / "demo" / "clip2_OLS.py"
+    line = next(number for number, text in enumerate(source.read_text().splitlines(), 1) if source_line in text)
+    timeline = render_range(SCENE, math.inf, math.inf, overrides=SAMPLE_SIZE).timeline
+    return next((play, start, end) for play, start, end, location in timeline if location == f"clip2_OLS:{line}")
+
+
+# Seeking fast-forwards every earlier play, so the frame in the middle of a
+# late play only comes out right if skipped plays still move the clock
+def test_seek_matches_full_sampling_in_line_color_play():
+    play, start, end = _play_index("line_color_tracker.animate.set_value(0)")
+    assert start > 0
+
+    samples, _ = sample_scene(SCENE)
+    middle = [s for s in samples if s["play"] == play and s["tag"].startswith("f") and s["tag"] != "f0"]
+    assert middle, "no sampled frames inside the play"
+    sample = middle[len(middle) // 2]
+    assert start < sample["time"] < end
+
+    dt = 1 / SAMPLE_CONFIG["frame_rate"]
+    frame = render_frame_at(SCENE, sample["time"] + dt / 2, overrides=SAMPLE_SIZE)
+    assert frame is not None
+    assert signatures_match(frame_signature(frame), frame_signature(sample["frame"]))